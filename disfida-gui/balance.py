@@ -0,0 +1,200 @@
+# balance.py
+# Win rates for every ordered character pairing under chosen policies.
+# Each matchup is played in batches spread over a process pool and stops as
+# soon as the Wilson intervals on the P1 win, tie and P2 win rates are all
+# narrow enough.
+import argparse
+import json
+import math
+import os
+import queue
+import random
+import time
+from multiprocessing import Pool
+import card_game_logic
+from card_game_logic import create_face_cards, game_rng
+from simulation import POLICIES, play_game, empty_totals, add_result, merge_totals
+
+Z_SCORES = {0.9: 1.6449, 0.95: 1.9600, 0.99: 2.5758}
+OUTCOMES = ("p1", "tie", "p2")
+# Which player an exact HP tie at the turn limit goes to under each resolution
+TIEBREAK_WINNER = {"hp_winner_player2_tie": "p2", "hp_winner_player1_tie": "p1", "hp_winner_draw": None}
+
+def characters():
+    return [(card.rank, card.suit) for card in create_face_cards()]
+
+def matchups():
+    chars = characters()
+    return [(a, b) for a in chars for b in chars if a != b]
+
+def label(character):
+    return f"{character[0]} of {character[1]}"
+
+def wilson(successes, n, z=1.96):
+    # (low, high) score interval; stays sensible near 0% and 100%
+    if n == 0:
+        return 0.0, 1.0
+    p = successes / n
+    denom = 1 + z * z / n
+    center = (p + z * z / (2 * n)) / denom
+    half = z * math.sqrt(p * (1 - p) / n + z * z / (4 * n * n)) / denom
+    return max(0.0, center - half), min(1.0, center + half)
+
+def run_batch(args):
+    matchup, index, policy_p1, policy_p2, start, n_games, seed = args
+    totals = empty_totals()
+    # Game k of a matchup is the same whichever batch or worker plays it
+    for k in range(start, start + n_games):
+        add_result(totals, play_game(POLICIES[policy_p1], POLICIES[policy_p2],
+                                     game_rng(seed, index, k), characters=matchup))
+    return matchup, totals
+
+class Matchup:
+    __slots__ = ("characters", "index", "totals", "batches", "done")
+
+    def __init__(self, characters, index):
+        self.characters = characters
+        self.index = index
+        self.totals = empty_totals()
+        self.batches = 0
+        self.done = False
+
+    def interval(self, z, outcome="p1"):
+        return wilson(self.totals[outcome], self.totals["games"], z)
+
+    def converged(self, z, half_width, min_games, max_games):
+        games = self.totals["games"]
+        if games >= max_games:
+            return True
+        if games < min_games:
+            return False
+        for outcome in OUTCOMES:
+            low, high = self.interval(z, outcome)
+            if (high - low) / 2 > half_width:
+                return False
+        return True
+
+def balance_matrix(policy_p1="random", policy_p2="random", half_width=0.02, confidence=0.95,
+                   batch_size=200, min_games=400, max_games=20000, seed=None, processes=None):
+    if seed is None:
+        seed = random.randrange(2 ** 32)
+    z = Z_SCORES[confidence]
+    processes = processes or os.cpu_count() or 1
+    states = {m: Matchup(m, i) for i, m in enumerate(matchups())}
+
+    def job(matchup):
+        state = states[matchup]
+        start = state.batches * batch_size
+        state.batches += 1
+        return (matchup, state.index, policy_p1, policy_p2, start, batch_size, seed)
+
+    def record(matchup, totals):
+        # Returns the next job for this matchup, or None once it has converged
+        state = states[matchup]
+        merge_totals(state.totals, totals)
+        state.done = state.converged(z, half_width, min_games, max_games)
+        return None if state.done else job(matchup)
+
+    start = time.perf_counter()
+    if processes == 1:
+        for matchup in states:
+            args = job(matchup)
+            while args is not None:
+                args = record(*run_batch(args))
+    else:
+        finished = queue.Queue()
+        with Pool(processes) as pool:
+            # Keep every pool worker busy; converged matchups drop out
+            in_flight = 0
+            for matchup in states:
+                pool.apply_async(run_batch, (job(matchup),), callback=finished.put,
+                                 error_callback=finished.put)
+                in_flight += 1
+            while in_flight:
+                result = finished.get()
+                in_flight -= 1
+                if isinstance(result, BaseException):
+                    raise result
+                args = record(*result)
+                if args is not None:
+                    pool.apply_async(run_batch, (args,), callback=finished.put,
+                                     error_callback=finished.put)
+                    in_flight += 1
+    elapsed = time.perf_counter() - start
+    return {
+        "seed": seed,
+        "policies": (policy_p1, policy_p2),
+        "confidence": confidence,
+        "resolution": card_game_logic.RULES.resolution,
+        "elapsed": elapsed,
+        "matchups": [summarize(state, z) for state in states.values()],
+    }
+
+def summarize(state, z):
+    totals = state.totals
+    games = max(totals["games"], 1)
+    tiebreak = totals["tiebreak"] / games
+    favored = TIEBREAK_WINNER[card_game_logic.RULES.resolution]
+    split = None
+    if favored == "p2":
+        split = totals["p1"] / games + 0.5 * tiebreak
+    elif favored == "p1":
+        split = totals["p1"] / games - 0.5 * tiebreak
+    return {
+        "p1_character": label(state.characters[0]),
+        "p2_character": label(state.characters[1]),
+        "games": totals["games"],
+        "p1": totals["p1"] / games,
+        "p1_ci": state.interval(z, "p1"),
+        "tie": totals["tie"] / games,
+        "tie_ci": state.interval(z, "tie"),
+        "p2": totals["p2"] / games,
+        "p2_ci": state.interval(z, "p2"),
+        # Share of games the exact-tie rule handed to the player it favors
+        "tiebreak": tiebreak,
+        # Player 1 win rate if exact ties at the limit were split instead
+        # (None when the rules already make them draws)
+        "p1_split_ties": split,
+    }
+
+def format_report(report):
+    favored = TIEBREAK_WINNER[report.get("resolution", "hp_winner_player2_tie")]
+    tb_label = f"{favored.upper()} tb" if favored else "tb"
+    lines = [f"{'Player 1':<20} {'Player 2':<20} {'games':>6} {'P1 win':>7} "
+             f"{'CI':>15} {'tie':>6} {'P2 win':>7} {tb_label:>6} {'P1 split':>8}"]
+    for row in report["matchups"]:
+        low, high = row["p1_ci"]
+        split = "-" if row["p1_split_ties"] is None else f"{100 * row['p1_split_ties']:.1f}%"
+        lines.append(f"{row['p1_character']:<20} {row['p2_character']:<20} {row['games']:>6} "
+                     f"{100 * row['p1']:>6.1f}% {f'[{100 * low:.1f}, {100 * high:.1f}]':>15} "
+                     f"{100 * row['tie']:>5.1f}% {100 * row['p2']:>6.1f}% "
+                     f"{100 * row['tiebreak']:>5.1f}% {split:>8}")
+    games = sum(row["games"] for row in report["matchups"])
+    lines.append(f"{len(report['matchups'])} matchups, {games} games, "
+                 f"{int(100 * report['confidence'])}% intervals, seed {report['seed']}, "
+                 f"{report['elapsed']:.1f}s")
+    return "\n".join(lines)
+
+def main():
+    parser = argparse.ArgumentParser(description="Character matchup balance matrix")
+    parser.add_argument("--p1", choices=sorted(POLICIES), default="random")
+    parser.add_argument("--p2", choices=sorted(POLICIES), default="random")
+    parser.add_argument("--half-width", type=float, default=0.02,
+                        help="stop a matchup once its P1 win, tie and P2 win intervals are this narrow")
+    parser.add_argument("--confidence", type=float, choices=sorted(Z_SCORES), default=0.95)
+    parser.add_argument("--batch-size", type=int, default=200)
+    parser.add_argument("--min-games", type=int, default=400)
+    parser.add_argument("--max-games", type=int, default=20000)
+    parser.add_argument("--seed", type=int, default=None)
+    parser.add_argument("--processes", type=int, default=None)
+    parser.add_argument("--json", metavar="PATH", help="also write the report as JSON")
+    args = parser.parse_args()
+    report = balance_matrix(args.p1, args.p2, args.half_width, args.confidence, args.batch_size,
+                            args.min_games, args.max_games, args.seed, args.processes)
+    print(format_report(report))
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(report, f, indent=2)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,259 @@
+# benchmark.py
+# Timings for the engine hot spots, full random-policy games for every
+# character pairing, sprite loading and GUI redraws. Results can be saved as
+# a JSON baseline and later compared against one; any benchmark slower than
+# the baseline by more than --threshold is reported and fails the run.
+# GUI benchmarks need a display (use xvfb-run on headless machines).
+import argparse
+import json
+import os
+import platform
+import random
+import shutil
+import sys
+import tempfile
+import time
+import timeit
+from card_game_logic import (Character, Player, draw_cards, validate_combo, remove_shields_for_attack,
+                             resolve_turn, init_game, game_rng)
+from compact import CARDS, NUMERIC_CARDS
+from events import NULL_LOG
+from greedy_bot import GreedyBot
+from outcome_cache import OutcomeCache
+from search_state import snapshot, restore
+from simulation import play_game, play_pre_shield, play_turn, random_policy
+
+SUIT_IDS = {"Denari": 0, "Coppe": 10, "Spade": 20, "Bastoni": 30}
+# Slowdown against the baseline that counts as a regression
+DEFAULT_THRESHOLD = 0.15
+
+def cards(*names):
+    # cards("5 Denari", "A Coppe") -> shared card objects
+    out = []
+    for name in names:
+        rank, suit = name.split()
+        out.append(CARDS[SUIT_IDS[suit] + ["A", "2", "3", "4", "5", "6", "7"].index(rank)])
+    return out
+
+def table(character, hand, opponent=("Re", "Denari"), shields=()):
+    # Player and opponent with fixed hands/shields; stacks hold the rest of the deck
+    hand, shields = cards(*hand), cards(*shields)
+    used = {c.id for c in hand} | {c.id for c in shields}
+    rest = [CARDS[cid] for cid in NUMERIC_CARDS if cid not in used]
+    player = Player("Player 1", Character(*character), rest[:12])
+    other = Player("Player 2", Character(*opponent), rest[12:24])
+    player.hand.reset(hand)
+    other.shields.reset(shields)
+    return player, other
+
+# name: (character, hand, opponent shields, input, Bastoni choice)
+TURNS = {
+    "skip": (("Re", "Denari"), ("2 Spade",), (), "0", None),
+    "shield": (("Fante", "Denari"), ("5 Denari",), (), "1", None),
+    "heal": (("Fante", "Coppe"), ("6 Coppe",), (), "1", None),
+    "attack": (("Cavallo", "Spade"), ("7 Spade",), (), "1", None),
+    "attack_vs_shields": (("Cavallo", "Spade"), ("A Spade",), ("2 Denari", "3 Denari", "6 Denari"), "1", None),
+    "combo": (("Cavallo", "Spade"), ("3 Spade", "4 Spade", "5 Spade", "2 Coppe"), ("4 Denari",), "1,2,3,4", None),
+    "blood_price": (("Re", "Spade"), ("6 Coppe",), ("4 Denari",), "1s", None),
+    "charity": (("Fante", "Coppe"), ("6 Spade",), (), "1s", None),
+    "bastoni_shield": (("Re", "Bastoni"), ("5 Bastoni",), (), "1s", "shield"),
+    "invalid_combo": (("Re", "Denari"), ("2 Spade", "3 Coppe"), (), "1,2", None),
+}
+
+def engine_benchmarks():
+    # (name, function, calls per function run, options)
+    player, _ = table(("Fante", "Denari"), ())
+    def draw():
+        draw_cards(player, 4)
+        player.stack.extend(player.hand)
+        player.hand.clear()
+    yield "draw_cards", draw, 1, {}
+
+    combo_player, _ = table(("Cavallo", "Spade"), ("3 Spade", "4 Spade", "5 Coppe", "2 Denari", "6 Spade"))
+    combos = [[(0, False)], [(0, False), (1, False)], [(0, False), (1, False), (2, False)],
+              [(2, False), (0, False)], [(0, False), (4, False), (1, False), (3, False)],
+              [(3, False), (2, False)]]
+    def combo_check():
+        for actions in combos:
+            validate_combo(actions, combo_player)
+    yield "validate_combo", combo_check, len(combos), {}
+
+    _, defender = table(("Cavallo", "Spade"), (), shields=("2 Denari", "3 Denari", "5 Denari", "7 Denari"))
+    shields, stack_len = list(defender.shields), len(defender.stack)
+    def absorb():
+        defender.shields.reset(shields)
+        defender.stack.truncate(stack_len)
+        remove_shields_for_attack(defender, 9, NULL_LOG)
+    yield "remove_shields_for_attack", absorb, 1, {}
+
+    # resolve_turn restores the position first; state_restore is that cost alone
+    p, o = table(("Re", "Denari"), ("2 Spade",))
+    snap = snapshot(p, o)
+    yield "state_restore", lambda: restore(snap, p, o), 1, {}
+    for kind, (character, hand, opp_shields, inp, choice) in TURNS.items():
+        p, o = table(character, hand, shields=opp_shields)
+        snap = snapshot(p, o)
+        def turn(p=p, o=o, snap=snap, inp=inp, choice=choice):
+            restore(snap, p, o)
+            if choice:
+                p.hand[0]._temp_bastoni_choice = choice
+            resolve_turn(p, o, inp, NULL_LOG)
+        yield f"resolve_turn.{kind}", turn, 1, {}
+
+    rng = random.Random(0)
+    yield "init_game", lambda: init_game(None, rng), 1, {}
+
+    # One greedy move over every legal action, recomputing each outcome vs a warm cache
+    p, o = table(("Cavallo", "Spade"), ("3 Spade", "4 Spade", "5 Coppe", "2 Denari", "6 Spade"),
+                 shields=("2 Denari", "4 Denari"))
+    for name, cache in (("uncached", OutcomeCache(0)), ("cached", OutcomeCache())):
+        bot = GreedyBot(cache)
+        yield f"greedy_turn.{name}", lambda bot=bot: bot(p, o, "turn", None), 1, {}
+
+def game_benchmarks(games):
+    from balance import matchups
+    for index, matchup in enumerate(matchups()):
+        def run(index=index, matchup=matchup):
+            for k in range(games):
+                play_game(random_policy, random_policy, game_rng(0, index, k), characters=matchup)
+        (f1, s1), (f2, s2) = matchup
+        yield f"game.{f1}_{s1}.vs.{f2}_{s2}", run, games, {"number": 1, "repeat": 3}
+
+def image_benchmarks():
+    from card_image_manager import CardImageManager
+    tmp = tempfile.mkdtemp(prefix="disfida-bench-")
+    path = os.path.join(tmp, "sprites.cache")
+    def cold():
+        if os.path.exists(path):
+            os.remove(path)
+        CardImageManager(cache_path=path)
+    yield "images.load_cold", cold, 1, {"number": 1, "repeat": 2}
+    yield "images.load_warm", lambda: CardImageManager(cache_path=path), 1, {}
+    shutil.rmtree(tmp, ignore_errors=True)
+
+def gui_benchmarks():
+    import tkinter as tk
+    try:
+        root = tk.Tk()
+    except tk.TclError:
+        print("Skipping GUI benchmarks: no display (run under xvfb-run)", file=sys.stderr)
+        return
+    root.withdraw()
+    from card_game_gui import CardGameGUI
+    gui = CardGameGUI(root)
+    gui.phase = "main"
+    p1, p2 = gui.player1, gui.player2
+    rng = random.Random(0)
+    play_pre_shield(p1, p2, random_policy(p1, p2, "pre_shield", rng))
+    play_pre_shield(p2, p1, random_policy(p2, p1, "pre_shield", rng))
+    before = snapshot(p1, p2)
+    play_turn(p1, p2, random_policy(p1, p2, "turn", rng))
+    after = snapshot(p1, p2)
+    gui.render()
+    yield "gui.render_unchanged", gui.render, 1, {}
+    states = [before, after]
+    def turn():
+        # Alternate between two positions one turn apart
+        states.reverse()
+        restore(states[0], p1, p2)
+        gui.update_gui()
+        root.update_idletasks()
+    yield "gui.update_gui_turn", turn, 1, {}
+    root.destroy()
+
+def measure(fn, calls=1, number=None, repeat=7):
+    # Best of `repeat` runs, in seconds per call
+    timer = timeit.Timer(fn)
+    if number is None:
+        number, _ = timer.autorange()
+    return min(timer.repeat(repeat, number)) / number / calls
+
+def run_benchmarks(groups, only=(), out=sys.stdout):
+    results = {}
+    for group in groups:
+        for name, fn, calls, options in group:
+            if only and not any(name.startswith(prefix) for prefix in only):
+                continue
+            seconds = measure(fn, calls, **options)
+            results[name] = seconds
+            print(f"{name:<48} {format_time(seconds):>10}", file=out)
+    games = [(name, s) for name, s in results.items() if name.startswith("game.")]
+    if games:
+        results["game.all_pairings"] = sum(s for _, s in games) / len(games)
+    return results
+
+def format_time(seconds):
+    for unit, scale in (("s", 1), ("ms", 1e-3), ("us", 1e-6)):
+        if seconds >= scale:
+            return f"{seconds / scale:.2f} {unit}"
+    return f"{seconds / 1e-9:.0f} ns"
+
+def save_baseline(path, results):
+    with open(path, "w") as f:
+        json.dump({
+            "created": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "results": results,
+        }, f, indent=2, sort_keys=True)
+
+def compare(baseline, results, threshold=DEFAULT_THRESHOLD):
+    # Rows of (name, baseline seconds, current seconds, status)
+    old = baseline["results"]
+    rows = []
+    for name in sorted(results):
+        if name not in old:
+            rows.append((name, None, results[name], "new"))
+            continue
+        ratio = results[name] / old[name]
+        if ratio > 1 + threshold:
+            status = "REGRESSION"
+        elif ratio < 1 / (1 + threshold):
+            status = "faster"
+        else:
+            status = "ok"
+        rows.append((name, old[name], results[name], status))
+    return rows
+
+def format_comparison(rows):
+    lines = [f"{'benchmark':<48} {'baseline':>10} {'current':>10} {'change':>8}  status"]
+    for name, old, new, status in rows:
+        if old is None:
+            lines.append(f"{name:<48} {'-':>10} {format_time(new):>10} {'':>8}  {status}")
+        else:
+            lines.append(f"{name:<48} {format_time(old):>10} {format_time(new):>10} "
+                         f"{100 * (new / old - 1):>+7.1f}%  {status}")
+    return "\n".join(lines)
+
+def main():
+    parser = argparse.ArgumentParser(description="Disfida engine and GUI benchmarks")
+    parser.add_argument("--save", metavar="PATH", help="write the results as a JSON baseline")
+    parser.add_argument("--compare", metavar="PATH", help="compare against a saved baseline")
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD,
+                        help="slowdown that counts as a regression (0.15 = 15%%)")
+    parser.add_argument("--only", action="append", default=[], metavar="PREFIX",
+                        help="run only benchmarks whose name starts with PREFIX (repeatable)")
+    parser.add_argument("--games", type=int, default=50, help="random games per character pairing")
+    parser.add_argument("--no-gui", action="store_true", help="skip sprite and GUI benchmarks")
+    args = parser.parse_args()
+    # Card image paths are relative to this directory
+    os.chdir(os.path.dirname(os.path.abspath(__file__)))
+    groups = [engine_benchmarks(), game_benchmarks(args.games)]
+    if not args.no_gui:
+        groups += [image_benchmarks(), gui_benchmarks()]
+    results = run_benchmarks(groups, args.only)
+    if args.save:
+        save_baseline(args.save, results)
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+        rows = compare(baseline, results, args.threshold)
+        print()
+        print(format_comparison(rows))
+        regressions = [row for row in rows if row[3] == "REGRESSION"]
+        if regressions:
+            print(f"{len(regressions)} benchmark(s) regressed by more than {100 * args.threshold:.0f}%")
+            raise SystemExit(1)
+
+if __name__ == "__main__":
+    main()
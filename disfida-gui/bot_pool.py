@@ -0,0 +1,180 @@
+# bot_pool.py
+# Bot plugins run in a pool of warm worker processes. A bot only sees an
+# observation (observation.observe plus "phase") and returns an action; a
+# worker that misses the deadline on a move is killed and replaced, the move
+# is played as a skip and the rest of its batch goes to another worker, so a
+# hanging or crashing bot cannot stall the game.
+import importlib
+import random
+import time
+from multiprocessing import Pipe, Process
+from multiprocessing.connection import wait
+from observation import observe, parse_action, players_from_state
+
+LOAD_TIMEOUT = 10.0  # seconds for a worker to import and build its bot
+
+class Bot:
+    # Subclass and implement act(); one instance lives in each worker process
+    def act(self, observation):
+        raise NotImplementedError
+
+class PolicyBot(Bot):
+    # Wraps a simulation policy by name ("random", "uniform", "skip")
+    def __init__(self, policy="random", seed=None):
+        from simulation import POLICIES
+        self.policy = POLICIES[policy]
+        self.rng = random.Random(seed)
+
+    def act(self, observation):
+        player, opponent = players_from_state(observation)
+        return self.policy(player, opponent, observation["phase"], self.rng)
+
+def load_bot(spec, seed=None):
+    # "module:factory" imports a Bot class or factory; a bare name is a simulation policy
+    if ":" not in spec:
+        return PolicyBot(spec, seed)
+    module_name, factory = spec.split(":", 1)
+    return getattr(importlib.import_module(module_name), factory)()
+
+def _worker(conn, spec, seed):
+    bot = load_bot(spec, seed)
+    conn.send("ready")
+    while True:
+        try:
+            batch = conn.recv()
+        except EOFError:
+            return
+        if batch is None:
+            return
+        # One reply per move, so the pool can time each move separately
+        for observation in batch:
+            try:
+                reply = bot.act(observation)
+            except Exception:
+                reply = None
+            conn.send(reply)
+
+class BotPool:
+    def __init__(self, spec, processes=1, deadline=1.0, batch_size=16, seed=None):
+        self.spec = spec
+        self.deadline = deadline  # seconds per move
+        self.batch_size = batch_size
+        self.rng = random.Random(seed)
+        self.moves = 0
+        self.timeouts = 0
+        self.errors = 0
+        self.workers = [self._spawn() for _ in range(processes)]
+        for worker in self.workers:
+            if not self._warm_up(worker, LOAD_TIMEOUT):
+                self.close()
+                raise RuntimeError(f"Bot {spec!r} failed to start")
+
+    def _spawn(self):
+        parent, child = Pipe()
+        process = Process(target=_worker, args=(child, self.spec, self.rng.getrandbits(64)),
+                          daemon=True)
+        process.start()
+        child.close()
+        return [process, parent, False]  # process, pipe, bot loaded
+
+    def _warm_up(self, worker, timeout):
+        try:
+            if worker[1].poll(timeout) and worker[1].recv() == "ready":
+                worker[2] = True
+        except EOFError:
+            pass
+        return worker[2]
+
+    def _replace(self, index):
+        process, conn, _ = self.workers[index]
+        process.kill()
+        process.join()
+        conn.close()
+        self.workers[index] = self._spawn()
+
+    def act_many(self, observations):
+        # Batches are spread over the workers; late or failed moves are skips
+        actions = [()] * len(observations)
+        batches = [range(i, min(i + self.batch_size, len(observations)))
+                   for i in range(0, len(observations), self.batch_size)]
+        busy = {}  # worker index -> [batch, moves answered, deadline for the next one]
+        while batches or busy:
+            for index, worker in enumerate(self.workers):
+                if batches and index not in busy:
+                    batch = batches.pop()
+                    try:
+                        worker[1].send([observations[i] for i in batch])
+                    except OSError:
+                        # The worker is already gone; retry the batch on its replacement
+                        batches.append(batch)
+                        self._replace(index)
+                        continue
+                    # A freshly respawned worker may still be loading its bot
+                    end = time.monotonic() + self.deadline
+                    busy[index] = [batch, 0, end if worker[2] else end + LOAD_TIMEOUT]
+            timeout = max(0.0, min(entry[2] for entry in busy.values()) - time.monotonic())
+            ready = wait([self.workers[i][1] for i in busy], timeout)
+            for index in list(busy):
+                entry = busy[index]
+                batch = entry[0]
+                worker = self.workers[index]
+                conn = worker[1]
+                failed = False
+                if conn in ready:
+                    try:
+                        while entry[1] < len(batch) and conn.poll():
+                            reply = conn.recv()
+                            if reply == "ready" and not worker[2]:
+                                worker[2] = True
+                            else:
+                                action = parse_action(reply) if reply is not None else None
+                                if action is None:
+                                    self.errors += 1
+                                else:
+                                    actions[batch[entry[1]]] = action
+                                entry[1] += 1
+                            # The clock restarts for every move
+                            entry[2] = time.monotonic() + self.deadline
+                    except EOFError:
+                        # The worker died mid-move
+                        self.errors += 1
+                        failed = True
+                elif time.monotonic() >= entry[2]:
+                    self.timeouts += 1
+                    failed = True
+                if failed:
+                    # The current move is a skip; the ones after it are retried elsewhere
+                    self._replace(index)
+                    if entry[1] + 1 < len(batch):
+                        batches.append(batch[entry[1] + 1:])
+                    del busy[index]
+                elif entry[1] >= len(batch):
+                    del busy[index]
+        self.moves += len(observations)
+        return actions
+
+    def act(self, observation):
+        return self.act_many([observation])[0]
+
+    def __call__(self, player, opponent, phase, rng=None):
+        # Same signature as the simulation policies
+        return self.act(observe(player, opponent, phase))
+
+    def close(self):
+        for process, conn, _ in self.workers:
+            try:
+                conn.send(None)
+            except OSError:
+                pass
+        for process, conn, _ in self.workers:
+            process.join(1.0)
+            if process.is_alive():
+                process.kill()
+            conn.close()
+        self.workers = []
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
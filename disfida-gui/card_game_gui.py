@@ -1,27 +1,50 @@
 # card_game_gui.py
+import random
 import tkinter as tk
 from tkinter import messagebox
+import card_game_logic
 from card_game_logic import *
 from card_image_manager import CardImageManager
 
 class CardGameGUI:
-    def __init__(self, root):
+    def __init__(self, root, opponent=None, replay=None):
         self.root = root
+        # Optional policy (see simulation.py) that plays Player 2
+        self.opponent = opponent
+        # Optional replay_timeline.ReplayTimeline to browse instead of playing
+        self.replay = replay
+        self.opponent_rng = random.Random()
+        # Rules in force when the game was dealt
+        self.rules = card_game_logic.RULES
+        self.total_turns = 2 * self.rules.max_player_turns
         self.root.title("Italian Card Combat")
         self.canvas = tk.Canvas(root, width=1280, height=720, bg="darkgreen")
         self.canvas.pack(fill="both", expand=True)
         self.image_manager = CardImageManager()
         self.selected_cards = []  # List of (card, special_flag, widget) tuples
-        self.player1, self.player2, init_messages = init_game()
+        if replay is None:
+            self.player1, self.player2, init_messages = init_game()
+            self.phase = "pre_shield_p1"
+        else:
+            self.player1, self.player2, init_messages = replay.p1, replay.p2, []
+            self.phase = "replay"
         self.current_player = self.player1
         self.turn_count = 0
-        self.phase = "pre_shield_p1"
-        self.p1_hand_widgets = []
-        self.p2_hand_widgets = []
-        self.p1_shield_widgets = []
-        self.p2_shield_widgets = []
-        self.played_card_widgets = []
+        # Retained canvas items per row; render() only reconfigures what changed
+        self.p1_hand_items = []
+        self.p2_hand_items = []
+        self.p1_highlights = []
+        self.p2_highlights = []
+        self.p1_shield_items = []
+        self.p2_shield_items = []
+        self.p1_played_items = []
+        self.p2_played_items = []
+        self.shown = {}  # canvas item -> image or text it currently shows (None = hidden)
+        self.render_pending = False
         self.setup_gui()
+        if replay is not None:
+            self.seek_replay(0)
+            return
         self.log_messages(init_messages)
         self.start_pre_shield_phase()
 
@@ -30,17 +53,18 @@ class CardGameGUI:
         self.turn_label = self.canvas.create_text(640, 10, text="Pre-Shield Phase: Player 1", anchor="center", font=("Arial", 12))
         
         # Player 1 (bottom, cards at y=500, info at y=640)
-        self.p1_char_img = self.canvas.create_image(50, 500, image=self.image_manager.get_image(None), anchor="nw")
+        p1_char, p2_char = self.player1.character, self.player2.character
+        self.p1_char_img = self.canvas.create_image(50, 500, image=self.image_manager.get_key_image((p1_char.suit, p1_char.face)), anchor="nw")
         self.p1_char_label = self.canvas.create_text(50, 640, text=f"{self.player1.character.face} of {self.player1.character.suit}", anchor="nw", font=("Arial", 12))
-        self.p1_hp_label = self.canvas.create_text(50, 660, text=f"HP: {self.player1.health}/40", anchor="nw", font=("Arial", 12))
+        self.p1_hp_label = self.canvas.create_text(50, 660, text=f"HP: {self.player1.health}/{self.rules.health}", anchor="nw", font=("Arial", 12))
         self.p1_bonus_label = self.canvas.create_text(50, 680, text=f"Attack: +{self.player1.character.attack_bonus}, Heal: +{self.player1.character.heal_bonus}, Defense: +{self.player1.character.defense_bonus}", anchor="nw", font=("Arial", 12))
         self.p1_stack_img = self.canvas.create_image(850, 500, image=self.image_manager.get_image(None), anchor="nw")
         self.p1_stack_label = self.canvas.create_text(850, 640, text=f"Stack: {len(self.player1.stack)}", anchor="nw", font=("Arial", 12))
         
         # Player 2 (top, cards at y=100, info at y=0)
-        self.p2_char_img = self.canvas.create_image(50, 100, image=self.image_manager.get_image(None, rotated=True), anchor="nw")
+        self.p2_char_img = self.canvas.create_image(50, 100, image=self.image_manager.get_key_image((p2_char.suit, p2_char.face), rotated=True), anchor="nw")
         self.p2_char_label = self.canvas.create_text(50, 0, text=f"{self.player2.character.face} of {self.player2.character.suit}", anchor="nw", font=("Arial", 12))
-        self.p2_hp_label = self.canvas.create_text(50, 20, text=f"HP: {self.player2.health}/40", anchor="nw", font=("Arial", 12))
+        self.p2_hp_label = self.canvas.create_text(50, 20, text=f"HP: {self.player2.health}/{self.rules.health}", anchor="nw", font=("Arial", 12))
         self.p2_bonus_label = self.canvas.create_text(50, 40, text=f"Attack: +{self.player2.character.attack_bonus}, Heal: +{self.player2.character.heal_bonus}, Defense: +{self.player2.character.defense_bonus}", anchor="nw", font=("Arial", 12))
         self.p2_stack_img = self.canvas.create_image(850, 100, image=self.image_manager.get_image(None, rotated=True), anchor="nw")
         self.p2_stack_label = self.canvas.create_text(850, 0, text=f"Stack: {len(self.player2.stack)}", anchor="nw", font=("Arial", 12))
@@ -49,6 +73,11 @@ class CardGameGUI:
         self.log_text = tk.Text(self.canvas, width=40, height=10, font=("Arial", 10))
         self.canvas.create_window(1050, 300, window=self.log_text)
         
+        if self.replay is not None:
+            self.setup_replay_controls()
+            self.update_gui()
+            return
+        
         # Control buttons (bottom center, y=650)
         self.play_button = tk.Button(self.canvas, text="Play Combo", command=self.play_combo)
         self.canvas.create_window(540, 650, window=self.play_button)
@@ -59,84 +88,171 @@ class CardGameGUI:
         
         self.update_gui()
 
-    def log_messages(self, messages):
-        for msg in messages:
-            self.log_text.insert(tk.END, msg + "\n")
-        self.log_text.see(tk.END)
+    def setup_replay_controls(self):
+        # Step/seek buttons, a scrub bar over every move, and arrow keys
+        moves = len(self.replay)
+        for x, text, command in ((440, "|<", lambda: self.seek_replay(0)),
+                                 (490, "<", lambda: self.step_replay(-1)),
+                                 (790, ">", lambda: self.step_replay(1)),
+                                 (840, ">|", lambda: self.seek_replay(moves))):
+            self.canvas.create_window(x, 650, window=tk.Button(self.canvas, text=text, command=command))
+        self.replay_scale = tk.Scale(self.canvas, from_=0, to=moves, orient="horizontal", length=240,
+                                     showvalue=False, command=self.scrub_replay)
+        self.canvas.create_window(640, 650, window=self.replay_scale)
+        self.root.bind("<Left>", lambda e: self.step_replay(-1))
+        self.root.bind("<Right>", lambda e: self.step_replay(1))
+        self.root.bind("<Home>", lambda e: self.seek_replay(0))
+        self.root.bind("<End>", lambda e: self.seek_replay(moves))
 
-    def update_gui(self):
-        # Update character images
-        p1_char_card = Card(self.player1.character.suit, self.player1.character.face)
-        p2_char_card = Card(self.player2.character.suit, self.player2.character.face)
-        self.canvas.itemconfig(self.p1_char_img, image=self.image_manager.get_image(p1_char_card))
-        self.canvas.itemconfig(self.p2_char_img, image=self.image_manager.get_image(p2_char_card, rotated=True))
-        
-        # Update health and stack
-        self.canvas.itemconfig(self.p1_hp_label, text=f"HP: {self.player1.health}/40")
-        self.canvas.itemconfig(self.p2_hp_label, text=f"HP: {self.player2.health}/40")
-        self.canvas.itemconfig(self.p1_stack_label, text=f"Stack: {len(self.player1.stack)}")
-        self.canvas.itemconfig(self.p2_stack_label, text=f"Stack: {len(self.player2.stack)}")
-        
-        # Update hands (5 slots, no overlap)
-        for widget in self.p1_hand_widgets:
-            self.canvas.delete(widget)
-        self.p1_hand_widgets = []
-        for i in range(5):
-            x = 200 + i * 100  # 80px card + 20px gap
-            if i < len(self.player1.hand):
-                card = self.player1.hand[i]
-                img = self.image_manager.get_image(card)
-                card_widget = self.canvas.create_image(x, 500, image=img, anchor="nw")
-                self.canvas.tag_bind(card_widget, "<Button-1>", lambda e, c=card, w=card_widget: self.select_card(c, w))
-                self.p1_hand_widgets.append(card_widget)
-        
-        for widget in self.p2_hand_widgets:
-            self.canvas.delete(widget)
-        self.p2_hand_widgets = []
-        for i in range(5):
-            x = 200 + i * 100
-            if i < len(self.player2.hand):
-                card = self.player2.hand[i]
-                img = self.image_manager.get_image(card, rotated=True)
-                card_widget = self.canvas.create_image(x, 100, image=img, anchor="nw")
-                self.canvas.tag_bind(card_widget, "<Button-1>", lambda e, c=card, w=card_widget: self.select_card(c, w))
-                self.p2_hand_widgets.append(card_widget)
+    def step_replay(self, delta):
+        self.seek_replay(self.replay.position + delta)
+
+    def scrub_replay(self, value):
+        # The scrub bar also reports the set() calls made by seek_replay
+        if int(value) != self.replay.position:
+            self.seek_replay(int(value))
+
+    def seek_replay(self, position):
+        timeline = self.replay
+        log = timeline.seek(position)
+        position = timeline.position
+        player, action = timeline.action()
+        self.current_player = player or self.player1
+        self.replay_scale.set(position)
         
-        # Update shields (left side)
-        for widget in self.p1_shield_widgets:
-            self.canvas.delete(widget)
-        self.p1_shield_widgets = []
-        for i, card in enumerate(sorted(self.player1.shields, key=lambda c: c.value)):
-            x = 200 + i * 70  # Smaller spacing for shields
-            card_widget = self.canvas.create_image(x, 350, image=self.image_manager.get_image(card), anchor="nw")
-            self.p1_shield_widgets.append(card_widget)
+        if position == 0:
+            text = f"Replay: deal (seed {timeline.record.seed})"
+        elif position <= 2:
+            text = f"Replay: move {position}/{len(timeline)} - {player.name} pre-shield"
+        else:
+            text = f"Replay: move {position}/{len(timeline)} - {player.name}'s Turn ({position - 2}/{self.total_turns})"
+        self.set_text(self.turn_label, text)
         
-        for widget in self.p2_shield_widgets:
-            self.canvas.delete(widget)
-        self.p2_shield_widgets = []
-        for i, card in enumerate(sorted(self.player2.shields, key=lambda c: c.value)):
-            x = 200 + i * 70
-            card_widget = self.canvas.create_image(x, 200, image=self.image_manager.get_image(card, rotated=True), anchor="nw")
-            self.p2_shield_widgets.append(card_widget)
+        self.log_text.delete("1.0", tk.END)
+        messages = [] if timeline.verified else ["⚠️ Replay does not match its checksum"]
+        if player is not None:
+            messages.append(f"{player.name} plays {action_to_input(action)}" if action else f"{player.name} skips")
+        messages.extend(log.text())
+        if position == len(timeline):
+            messages.extend(timeline.outcome()[1])
+        self.log_messages(messages)
+        self.update_gui()
+
+    def log_messages(self, messages):
+        if messages:
+            self.log_text.insert(tk.END, "".join(f"{msg}\n" for msg in messages))
+            self.log_text.see(tk.END)
+
+    def update_gui(self):
+        # Coalesce every state change in one event into a single redraw
+        if not self.render_pending:
+            self.render_pending = True
+            self.root.after_idle(self.render)
+
+    def set_text(self, item, text):
+        if self.shown.get(item) != text:
+            self.canvas.itemconfig(item, text=text)
+            self.shown[item] = text
+
+    def sync_row(self, items, cards, x, step, y, rotated=False, player=None):
+        # Show cards left to right in pooled image items, growing the pool on demand
+        for i, card in enumerate(cards):
+            if i == len(items):
+                item = self.canvas.create_image(x + i * step, y, anchor="nw", state="hidden")
+                if player is not None:
+                    # Hand slots are bound once; the card is looked up at click time
+                    self.canvas.tag_bind(item, "<Button-1>", lambda e, p=player, i=i: self.click_hand(p, i))
+                items.append(item)
+                self.shown[item] = None
+            item = items[i]
+            image = self.image_manager.get_image(card, rotated)
+            if self.shown[item] is not image:
+                if self.shown[item] is None:
+                    self.canvas.itemconfig(item, image=image, state="normal")
+                else:
+                    self.canvas.itemconfig(item, image=image)
+                self.shown[item] = image
+        for item in items[len(cards):]:
+            if self.shown[item] is not None:
+                self.canvas.itemconfig(item, state="hidden")
+                self.shown[item] = None
+
+    def sync_highlights(self, highlights, hand, selected, y):
+        for i, card in enumerate(hand):
+            if i == len(highlights):
+                x = 200 + i * 100
+                highlights.append(self.canvas.create_rectangle(x, y, x + 80, y + 132, outline="yellow",
+                                                               width=3, state="hidden"))
+                self.shown[highlights[i]] = False
+            on = card.id in selected
+            if self.shown[highlights[i]] != on:
+                self.canvas.itemconfig(highlights[i], state="normal" if on else "hidden")
+                self.shown[highlights[i]] = on
+        for item in highlights[len(hand):]:
+            if self.shown[item]:
+                self.canvas.itemconfig(item, state="hidden")
+                self.shown[item] = False
+
+    def render(self):
+        self.render_pending = False
+        p1, p2 = self.player1, self.player2
+        self.set_text(self.p1_hp_label, f"HP: {p1.health}/{self.rules.health}")
+        self.set_text(self.p2_hp_label, f"HP: {p2.health}/{self.rules.health}")
+        self.set_text(self.p1_stack_label, f"Stack: {len(p1.stack)}")
+        self.set_text(self.p2_stack_label, f"Stack: {len(p2.stack)}")
         
-        # Update played cards (right side)
-        for widget in self.played_card_widgets:
-            self.canvas.delete(widget)
-        self.played_card_widgets = []
-        for i, (card, special, _) in enumerate(self.selected_cards):
-            x = 450 + i * 70
-            y = 350 if self.current_player == self.player1 else 200
-            img = self.image_manager.get_image(card, rotated=(self.current_player == self.player2))
-            card_widget = self.canvas.create_image(x, y, image=img, anchor="nw")
-            self.played_card_widgets.append(card_widget)
+        # Hands (80px card + 20px gap), shields, and the cards being played
+        self.sync_row(self.p1_hand_items, p1.hand, 200, 100, 500, player=p1)
+        self.sync_row(self.p2_hand_items, p2.hand, 200, 100, 100, rotated=True, player=p2)
+        selected_cards = [card for card, _, _ in self.selected_cards]
+        selected = {card.id for card in selected_cards}
+        self.sync_highlights(self.p1_highlights, p1.hand, selected, 500)
+        self.sync_highlights(self.p2_highlights, p2.hand, selected, 100)
+        self.sync_row(self.p1_shield_items, p1.shields, 200, 70, 350)
+        self.sync_row(self.p2_shield_items, p2.shields, 200, 70, 200, rotated=True)
+        self.sync_row(self.p1_played_items, selected_cards if self.current_player == p1 else (), 450, 70, 350)
+        self.sync_row(self.p2_played_items, selected_cards if self.current_player == p2 else (), 450, 70, 200, rotated=True)
         
-        # Update turn label
         if self.phase == "main":
-            self.canvas.itemconfig(self.turn_label, text=f"{self.current_player.name}'s Turn ({self.turn_count + 1}/40) | P1: {self.player1.turns_played}/20, P2: {self.player2.turns_played}/20")
+            self.set_text(self.turn_label, f"{self.current_player.name}'s Turn ({self.turn_count + 1}/{self.total_turns}) | P1: {p1.turns_played}/{self.rules.max_player_turns}, P2: {p2.turns_played}/{self.rules.max_player_turns}")
+
+    def click_hand(self, player, i):
+        if self.replay is None and i < len(player.hand):
+            self.select_card(player.hand[i], self.p1_hand_items[i] if player == self.player1 else self.p2_hand_items[i])
+
+    def opponent_turn(self):
+        return self.opponent is not None and self.current_player == self.player2 and self.phase != "over"
+
+    def schedule_opponent(self):
+        if self.opponent_turn():
+            self.root.after(200, self.opponent_move)
+
+    def opponent_move(self):
+        if not self.opponent_turn():
+            return
+        if self.phase == "pre_shield_p2":
+            action = self.opponent(self.player2, self.player1, "pre_shield", self.opponent_rng)
+            shields_before = len(self.player2.shields)
+            summary = player_pre_shield(self.player2, self.player1, action_to_input(action))
+            if action and len(self.player2.shields) == shields_before:
+                summary = player_pre_shield(self.player2, self.player1, "0")
+            self.log_messages(summary)
+            self.finish_pre_shield()
+            return
+        action = self.opponent(self.player2, self.player1, "turn", self.opponent_rng)
+        turns_before = self.player2.turns_played
+        summary = play_action(self.player2, self.player1, action)
+        if self.player2.turns_played == turns_before:
+            self.log_messages(summary)
+            summary = resolve_turn(self.player2, self.player1, "0")
+        self.log_messages(summary)
+        self.end_turn()
 
     def select_card(self, card, widget):
         if self.current_player != self.player1 and self.current_player != self.player2:
             return
+        if self.opponent_turn():
+            return
         if card in self.player1.hand and self.current_player != self.player1:
             return
         if card in self.player2.hand and self.current_player != self.player2:
@@ -146,7 +262,6 @@ class CardGameGUI:
         for i, (c, s, w) in enumerate(self.selected_cards):
             if c == card:
                 self.selected_cards.pop(i)
-                self.canvas.delete(self.canvas.find_withtag(f"highlight_{id(w)}"))
                 self.update_gui()
                 return
         
@@ -160,10 +275,11 @@ class CardGameGUI:
                 special = messagebox.askyesno("Special Action", f"Use {card} as special (e.g., Blood Price or Charity's Burden)?")
         
         self.selected_cards.append((card, special, widget))
-        self.canvas.create_rectangle(self.canvas.bbox(widget), outline="yellow", width=3, tags=f"highlight_{id(widget)}")
         self.update_gui()
 
     def play_combo(self):
+        if self.opponent_turn():
+            return
         if self.phase == "pre_shield_p1":
             if len(self.selected_cards) != 1:
                 self.log_messages(["Select exactly one card for pre-shield"])
@@ -176,8 +292,9 @@ class CardGameGUI:
             self.selected_cards = []
             self.phase = "pre_shield_p2"
             self.current_player = self.player2
-            self.canvas.itemconfig(self.turn_label, text="Pre-Shield Phase: Player 2")
+            self.set_text(self.turn_label, "Pre-Shield Phase: Player 2")
             self.update_gui()
+            self.schedule_opponent()
             return
         elif self.phase == "pre_shield_p2":
             if len(self.selected_cards) != 1:
@@ -189,11 +306,7 @@ class CardGameGUI:
             summary = player_pre_shield(self.player2, self.player1, inp)
             self.log_messages(summary)
             self.selected_cards = []
-            self.phase = "main"
-            self.current_player = self.player1
-            self.canvas.itemconfig(self.turn_label, text=f"{self.current_player.name}'s Turn (1/40)")
-            self.log_messages(["✅ Pre-shield phase complete! Player 1 attacks first..."])
-            self.update_gui()
+            self.finish_pre_shield()
             return
         
         inp = "0"
@@ -207,6 +320,16 @@ class CardGameGUI:
         self.log_messages(summary)
         
         self.selected_cards = []
+        self.end_turn()
+
+    def finish_pre_shield(self):
+        self.phase = "main"
+        self.current_player = self.player1
+        self.set_text(self.turn_label, f"{self.current_player.name}'s Turn (1/{self.total_turns})")
+        self.log_messages(["✅ Pre-shield phase complete! Player 1 attacks first..."])
+        self.update_gui()
+
+    def end_turn(self):
         result, victory_messages = check_victory(self.player1, self.player2)
         if result:
             self.log_messages(victory_messages)
@@ -219,14 +342,17 @@ class CardGameGUI:
         if check_turn_limit(self.player1, self.player2):
             winner, end_summary = resolve_tournament_end(self.player1, self.player2)
             self.log_messages(end_summary)
-            self.end_game(winner.name.lower())
+            self.end_game("tie" if winner is None else winner.name.lower())
             return
         
         self.turn_count += 1
         self.current_player = self.player2 if self.current_player == self.player1 else self.player1
         self.update_gui()
+        self.schedule_opponent()
 
     def skip_turn(self):
+        if self.opponent_turn():
+            return
         if self.phase in ["pre_shield_p1", "pre_shield_p2"]:
             player = self.player1 if self.phase == "pre_shield_p1" else self.player2
             opponent = self.player2 if self.phase == "pre_shield_p1" else self.player1
@@ -234,25 +360,18 @@ class CardGameGUI:
             self.log_messages(summary)
             self.phase = "pre_shield_p2" if self.phase == "pre_shield_p1" else "main"
             self.current_player = self.player2 if self.phase == "pre_shield_p2" else self.player1
-            self.canvas.itemconfig(self.turn_label, text=f"Pre-Shield Phase: Player 2" if self.phase == "pre_shield_p2" else f"{self.current_player.name}'s Turn (1/40)")
+            self.set_text(self.turn_label, f"Pre-Shield Phase: Player 2" if self.phase == "pre_shield_p2" else f"{self.current_player.name}'s Turn (1/{self.total_turns})")
             self.update_gui()
             if self.phase == "main":
                 self.log_messages(["✅ Pre-shield phase complete! Player 1 attacks first..."])
+            else:
+                self.schedule_opponent()
             return
         
         opponent = self.player2 if self.current_player == self.player1 else self.player1
         summary = resolve_turn(self.current_player, opponent, "0")
         self.log_messages(summary)
-        draw_summary = refill_hand(self.current_player)
-        self.log_messages(draw_summary)
-        if check_turn_limit(self.player1, self.player2):
-            winner, end_summary = resolve_tournament_end(self.player1, self.player2)
-            self.log_messages(end_summary)
-            self.end_game(winner.name.lower())
-            return
-        self.turn_count += 1
-        self.current_player = self.player2 if self.current_player == self.player1 else self.player1
-        self.update_gui()
+        self.end_turn()
 
     def show_rules(self):
         rules_window = tk.Toplevel(self.root)
@@ -263,6 +382,7 @@ class CardGameGUI:
         rules_text.config(state="disabled")
 
     def end_game(self, result):
+        self.phase = "over"
         messagebox.showinfo("Game Over", f"Tournament Complete! {result.upper()} Wins!")
         self.root.quit()
 
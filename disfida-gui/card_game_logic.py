@@ -1,8 +1,20 @@
 # card_game_logic.py
+import hashlib
 import random
 import math
+from bisect import bisect_left, bisect_right
+from collections import deque
+from itertools import islice
+from events import (EventLog, NULL_LOG, Note, AttackEvent, ShieldsConsumedEvent,
+                    HealEvent, SelfDamageEvent, ShieldEvent, DrawEvent)
+from rules import Rules, RESOLUTIONS
+
+SUITS = ["Denari", "Coppe", "Spade", "Bastoni"]
+RANKS = ["A", "2", "3", "4", "5", "6", "7", "Fante", "Cavallo", "Re"]
 
 class Card:
+    __slots__ = ("suit", "rank", "value", "id", "_temp_bastoni_choice")
+
     def __init__(self, suit, rank):
         self.suit = suit
         self.rank = rank
@@ -12,67 +24,280 @@ class Card:
             self.value = 10
         else:
             self.value = int(rank)
+        # 0-39, same order as the card image files
+        self.id = SUITS.index(suit) * 10 + RANKS.index(rank)
     
     def __str__(self):
         return f"{self.rank} of {self.suit}"
 
 class Character:
+    __slots__ = ("face", "suit", "attack_bonus", "defense_bonus", "heal_bonus", "stack_size", "hand_size")
+
     def __init__(self, face, suit):
         self.face = face
         self.suit = suit
-        self.attack_bonus = 1 if face == "Cavallo" else 0
-        self.defense_bonus = 2 if face == "Re" else 0
-        self.heal_bonus = 2 if face == "Fante" else 0
-        self.stack_size = 13 if suit == "Denari" else 12
-        self.hand_size = 5 if suit == "Denari" else 4
+        self.attack_bonus, self.defense_bonus, self.heal_bonus = RULES.bonuses(face)
+        self.stack_size, self.hand_size = RULES.sizes(suit == "Denari")
+
+class CardZone(deque):
+    # Ordered cards, index 0 on top: O(1) draw from the top, put to the
+    # bottom and membership (cards are unique per game, keyed by id)
+    __slots__ = ("_ids",)
+
+    def __init__(self, cards=()):
+        super().__init__(cards)
+        self._ids = {card.id for card in self}
+
+    def __contains__(self, card):
+        return card.id in self._ids
+
+    def __repr__(self):
+        return f"CardZone([{', '.join(str(c) for c in self)}])"
+
+    def append(self, card):
+        super().append(card)
+        self._ids.add(card.id)
+
+    def appendleft(self, card):
+        super().appendleft(card)
+        self._ids.add(card.id)
+
+    def extend(self, cards):
+        for card in cards:
+            self.append(card)
+
+    def popleft(self):
+        card = super().popleft()
+        self._ids.discard(card.id)
+        return card
+
+    def pop(self):
+        card = super().pop()
+        self._ids.discard(card.id)
+        return card
+
+    def remove(self, card):
+        super().remove(card)
+        self._ids.discard(card.id)
+
+    def insert(self, index, card):
+        super().insert(index, card)
+        self._ids.add(card.id)
+
+    def __delitem__(self, index):
+        self._ids.discard(self[index].id)
+        super().__delitem__(index)
+
+    def clear(self):
+        super().clear()
+        self._ids.clear()
+
+    put_bottom = append
+    put_top = appendleft
+    draw_top = popleft
+
+    def draw(self, n):
+        return [self.popleft() for _ in range(min(n, len(self)))]
+
+    def top(self, n):
+        return list(islice(self, n))
+
+    def pop_at(self, index):
+        card = self[index]
+        del self[index]
+        return card
+
+    def take(self, indices):
+        # Cards at the given indices, in that order, removed in one pass
+        cards = [self[i] for i in indices]
+        dropped = set(indices)
+        self.reset([c for i, c in enumerate(self) if i not in dropped])
+        return cards
+
+    def truncate(self, length):
+        # Drop cards from the bottom until only `length` remain
+        while len(self) > length:
+            self.pop()
+
+    def reset(self, cards):
+        cards = list(cards)
+        super().clear()
+        super().extend(cards)
+        self._ids = {card.id for card in cards}
+
+    def copy(self):
+        return CardZone(self)
+
+    def check(self):
+        ids = [card.id for card in self]
+        if len(ids) != len(set(ids)):
+            raise RuntimeError(f"Duplicate card in {self!r}")
+        if set(ids) != self._ids:
+            raise RuntimeError(f"Membership index out of sync in {self!r}")
+
+class ShieldZone:
+    # Shields in absorb order (value, then arrival) with cached prefix sums of
+    # effective defense, so resolving an attack is a single binary search
+    __slots__ = ("defense_bonus", "_cards", "_values", "_ids", "_prefix", "_base")
+
+    def __init__(self, defense_bonus=0, cards=()):
+        self.defense_bonus = defense_bonus
+        self.reset(cards)
+
+    def __len__(self):
+        return len(self._cards)
+
+    def __iter__(self):
+        return iter(self._cards)
+
+    def __getitem__(self, index):
+        return self._cards[index]
+
+    def __contains__(self, card):
+        return card.id in self._ids
+
+    def __repr__(self):
+        return f"ShieldZone([{', '.join(str(c) for c in self._cards)}])"
+
+    def append(self, card):
+        i = bisect_right(self._values, card.value)
+        self._cards.insert(i, card)
+        self._values.insert(i, card.value)
+        self._ids.add(card.id)
+        self._prefix = None
+
+    def remove(self, card):
+        i = self._cards.index(card)
+        del self._cards[i]
+        del self._values[i]
+        self._ids.discard(card.id)
+        self._prefix = None
+
+    def reset(self, cards):
+        # sorted() is stable, so equal values keep their arrival order
+        self._cards = sorted(cards, key=lambda c: c.value)
+        self._values = [c.value for c in self._cards]
+        self._ids = {c.id for c in self._cards}
+        self._prefix = None
+
+    def clear(self):
+        self.reset(())
+
+    def copy(self):
+        return ShieldZone(self.defense_bonus, self._cards)
+
+    def values(self):
+        # Card values in absorb order; equal multisets absorb attacks identically
+        return tuple(self._values)
+
+    def prefix(self):
+        if self._prefix is None:
+            total = 0
+            sums = []
+            for value in self._values:
+                total += value + self.defense_bonus
+                sums.append(total)
+            self._prefix = sums
+            self._base = 0
+        return self._prefix
+
+    def total_defense(self):
+        prefix = self.prefix()
+        return prefix[-1] - self._base if prefix else 0
+
+    def absorb(self, attack):
+        # Weakest shields first until one stops the attack: (damage left, shields used)
+        return self.absorb_many((attack,))[0]
+
+    def absorb_many(self, attacks):
+        # A whole combo's attacks in order, consuming shields once at the end
+        prefix = self.prefix()
+        base = self._base
+        used = 0
+        results = []
+        for attack in attacks:
+            if used == len(prefix):
+                results.append((attack, []))
+                continue
+            cut = min(bisect_left(prefix, base + attack, used) + 1, len(prefix))
+            results.append((max(0, base + attack - prefix[cut - 1]), self._cards[used:cut]))
+            base = prefix[cut - 1]
+            used = cut
+        if used:
+            self._ids.difference_update(c.id for c in self._cards[:used])
+            del self._cards[:used]
+            del self._values[:used]
+            self._prefix = prefix[used:]
+            self._base = base
+        return results
+
+    def check(self):
+        ids = [card.id for card in self._cards]
+        if len(ids) != len(set(ids)):
+            raise RuntimeError(f"Duplicate card in {self!r}")
+        if set(ids) != self._ids:
+            raise RuntimeError(f"Membership index out of sync in {self!r}")
+        if self._values != sorted(self._values) or self._values != [c.value for c in self._cards]:
+            raise RuntimeError(f"Shields out of order in {self!r}")
 
 class Player:
+    __slots__ = ("name", "character", "stack", "hand", "shields", "health", "turns_played")
+
     def __init__(self, name, character, stack):
         self.name = name
         self.character = character
-        self.stack = stack
-        self.hand = []
-        self.shields = []
-        self.health = 40
+        self.stack = CardZone(stack)
+        self.hand = CardZone()
+        self.shields = ShieldZone(character.defense_bonus)
+        self.health = RULES.health
         self.turns_played = 0
 
-MAX_PLAYER_TURNS = 20
-RESOLUTION = "hp_winner_player2_tie"
+RULES = Rules()  # rules.Rules read by the engine; assign a new one to change the game
+CHECK_INVARIANTS = False  # validate zones after every state change (slow)
+PROFILER = None  # profiler.Profiler collecting engine counters, or None
+
+def check_zones(*players):
+    seen = set()
+    for player in players:
+        for zone in (player.hand, player.stack, player.shields):
+            zone.check()
+            for card in zone:
+                if card.id in seen:
+                    raise RuntimeError(f"{card} is in more than one zone")
+                seen.add(card.id)
 
 def build_numeric_deck():
-    suits = ["Denari", "Coppe", "Spade", "Bastoni"]
     ranks = ["A", "2", "3", "4", "5", "6", "7"]
-    deck = [Card(s, r) for s in suits for r in ranks]
+    deck = [Card(s, r) for s in SUITS for r in ranks]
     return deck
 
 def create_face_cards():
-    suits = ["Denari", "Coppe", "Spade", "Bastoni"]
     faces = ["Fante", "Cavallo", "Re"]
-    return [Card(s, f) for s in suits for f in faces]
+    return [Card(s, f) for s in SUITS for f in faces]
 
 def get_rules_summary():
     rules = [
         "=" * 50,
         "ITALIAN CARD COMBAT - TOURNAMENT RULES",
         "=" * 50,
-        "OBJECTIVE: Reduce opponent's HP to 0 or survive 40 turns with more HP",
-        f"TURN LIMIT: {MAX_PLAYER_TURNS} turns each (40 total)",
-        f"RESOLUTION: Higher HP wins. Exact tie: Player 2 wins!",
+        f"OBJECTIVE: Reduce opponent's HP to 0 or survive {2 * RULES.max_player_turns} turns with more HP",
+        f"TURN LIMIT: {RULES.max_player_turns} turns each ({2 * RULES.max_player_turns} total)",
+        f"RESOLUTION: Higher HP wins. {RESOLUTIONS[RULES.resolution]}",
         "DECK: 40-card Italian deck (A=11, 2-7, Fante/Cavallo/Re=10)",
-        "START: 40 HP each, 4-card hand (5 for Coins char)",
+        f"START: {RULES.health} HP each, {RULES.hand_size}-card hand ({RULES.denari_hand_size} for Coins char)",
         "\nCHARACTERS & BONUSES:",
-        "• Re (King): +2 defense per shield",
-        "• Cavallo (Knight): +1 attack per attack card",
-        "• Fante (Page): +2 healing per healing card",
+        f"• Re (King): +{RULES.re_defense_bonus} defense per shield",
+        f"• Cavallo (Knight): +{RULES.cavallo_attack_bonus} attack per attack card",
+        f"• Fante (Page): +{RULES.fante_heal_bonus} healing per healing card",
         "\nSUIT SPECIALS:",
-        "• Coins: Wealth of Choice - +1 card in stack/hand (passive)",
+        f"• Coins: Wealth of Choice - {RULES.wealth_of_choice()} (passive)",
         "• Swords: Blood Price - Use Cups as attacks (ignore shields, self-damage)",
         "• Cups: Charity's Burden - Use Swords as healing (opponent gains half)",
         "• Clubs: Iron Versatility - Clubs can be attack OR shield",
         "\nCOMBOS: Sequence of character-suit cards + optional 1 non-suit card",
         "TURNS: Skip, play 1 card, or play combo. Draw to hand size at turn end",
         "SHIELDS: Visible on table, destroyed smallest→largest, cycle to deck bottom",
-        "ENDGAME: After 40 turns, higher HP wins. Exact tie = Player 2 wins!",
+        f"ENDGAME: After {2 * RULES.max_player_turns} turns, higher HP wins. {RESOLUTIONS[RULES.resolution]}",
         "=" * 50
     ]
     return "\n".join(rules)
@@ -82,12 +307,14 @@ def draw_cards(player, n):
     drawn_cards = []
     for _ in range(n):
         if player.stack:
-            card = player.stack.pop(0)  # Remove from top
+            card = player.stack.draw_top()
             player.hand.append(card)
             drawn_cards.append(card)
             drawn += 1
         else:
             break
+    if PROFILER is not None:
+        PROFILER.count("cards_drawn", drawn)
     return drawn, drawn_cards
 
 def validate_combo(actions, player):
@@ -113,64 +340,67 @@ def move_card_to_bottom(player, card):
     if card not in player.stack:
         player.stack.append(card)
 
-def remove_shields_for_attack(opponent, attack_value):
-    if not opponent.shields:
-        return attack_value, []
-    remaining = attack_value
-    sorted_shields = sorted(opponent.shields, key=lambda c: c.value)
-    removed_shields = []
-    for shield in sorted_shields:
-        effective_defense = shield.value + opponent.character.defense_bonus
-        remaining -= effective_defense
-        removed_shields.append(shield)
-        if remaining <= 0:
-            break
-    for shield in removed_shields:
-        opponent.shields.remove(shield)
-        move_card_to_bottom(opponent, shield)
-    shields_str = ", ".join([str(s) for s in removed_shields]) if removed_shields else ""
-    summary = [f"Shields {shields_str} absorbed attack, sent to bottom of deck"] if removed_shields else []
-    return max(0, remaining), summary
-
-def apply_heal(player, card, opponent):
-    turn_summary = []
+def remove_shields_for_attack(opponent, attack_value, log=None):
+    damages, log = remove_shields_for_attacks(opponent, (attack_value,), log)
+    return damages[0], log
+
+def remove_shields_for_attacks(opponent, attack_values, log=None):
+    # Batched form: damage left after shields for each attack, in order
+    if log is None:
+        log = EventLog()
+    damages = []
+    for remaining, removed_shields in opponent.shields.absorb_many(attack_values):
+        for shield in removed_shields:
+            move_card_to_bottom(opponent, shield)
+        if PROFILER is not None:
+            PROFILER.count("shields_consumed", len(removed_shields))
+        if removed_shields and log.enabled:
+            log.append(ShieldsConsumedEvent(removed_shields))
+        damages.append(remaining)
+    return damages, log
+
+def apply_heal(player, card, opponent, log=None):
+    if log is None:
+        log = EventLog()
     heal_amount = card.value + player.character.heal_bonus
-    player.health = min(40, player.health + heal_amount)
+    player.health = min(RULES.health, player.health + heal_amount)
     opponent_bonus = 0
-    if player.character.suit == "Coppe" and card.suit == "Spade":
-        opponent_bonus = card.value // 2
-        opponent.health = min(40, opponent.health + opponent_bonus)
-        turn_summary.append(f"Heal {card}: +{heal_amount} HP, +{opponent_bonus} to opponent")
-    else:
-        turn_summary.append(f"Heal {card}: +{heal_amount} HP")
-    return heal_amount, opponent_bonus, turn_summary
+    charity = player.character.suit == "Coppe" and card.suit == "Spade"
+    if charity:
+        opponent_bonus = card.value // RULES.charity_divisor
+        opponent.health = min(RULES.health, opponent.health + opponent_bonus)
+    if log.enabled:
+        log.append(HealEvent(card, heal_amount, opponent_bonus, charity))
+    return heal_amount, opponent_bonus, log
 
-def apply_attack(player, card, opponent, ignore_shields=False):
-    turn_summary = []
+def apply_attack(player, card, opponent, ignore_shields=False, log=None):
+    if log is None:
+        log = EventLog()
     attack_value = card.value + player.character.attack_bonus
     remaining_damage = attack_value
     if ignore_shields:
         opponent.health -= attack_value
-        turn_summary.append(f"Blood Price {card}: {attack_value} damage (ignores shields)")
     else:
-        remaining_damage, shield_summary = remove_shields_for_attack(opponent, attack_value)
-        turn_summary.extend(shield_summary)
+        remaining_damage = remove_shields_for_attack(opponent, attack_value, log)[0]
         if remaining_damage > 0:
             opponent.health -= remaining_damage
-            turn_summary.append(f"Attack {card}: {attack_value}→{remaining_damage} damage")
-        else:
-            turn_summary.append(f"Attack {card}: {attack_value} blocked by shields")
+    if log.enabled:
+        log.append(AttackEvent(card, attack_value, remaining_damage, ignore_shields))
     self_damage = 0
     if player.character.suit == "Spade" and card.suit == "Coppe" and ignore_shields:
-        self_damage = card.value // 2
+        self_damage = card.value // RULES.blood_price_divisor
         player.health -= self_damage
-        turn_summary.append(f"Blood Price self-damage: -{self_damage} HP")
-    return attack_value, remaining_damage, self_damage, turn_summary
+        if log.enabled:
+            log.append(SelfDamageEvent(card, self_damage))
+    return attack_value, remaining_damage, self_damage, log
 
-def apply_shield(player, card):
-    effective_value = card.value + player.character.defense_bonus
+def apply_shield(player, card, log=None):
+    if log is None:
+        log = EventLog()
     player.shields.append(card)
-    return [f"Shield {card}: +{effective_value} defense"]
+    if log.enabled:
+        log.append(ShieldEvent(card, card.value + player.character.defense_bonus))
+    return log
 
 def can_use_special(player, card, special_flag):
     if not special_flag:
@@ -199,105 +429,136 @@ def parse_input(inp, player):
             idx = int(part) - 1
             if idx < 0 or idx >= len(player.hand):
                 return None
+            if any(idx == seen for seen, _ in actions):
+                return None
             actions.append((idx, special))
         except ValueError:
             return None
     return actions
 
-def resolve_turn(player, opponent, inp):
-    turn_summary = []
+def action_to_input(action):
+    # An action is a tuple of (hand_index, special, as_shield) triples; () skips
+    if not action:
+        return "0"
+    return ",".join(f"{idx + 1}{'s' if special else ''}" for idx, special, _ in action)
+
+def play_action(player, opponent, action, log=None):
+    for idx, special, as_shield in action:
+        if special and 0 <= idx < len(player.hand):
+            player.hand[idx]._temp_bastoni_choice = "shield" if as_shield else "attack"
+    return resolve_turn(player, opponent, action_to_input(action), log)
+
+def resolve_turn(player, opponent, inp, log=None):
+    if log is None:
+        log = EventLog()
     if inp == "0":
-        turn_summary.append(f"{player.name} skips turn")
+        if log.enabled:
+            log.append(Note("{} skips turn", player.name))
         player.turns_played += 1
-        return turn_summary
+        if PROFILER is not None:
+            PROFILER.count("turns")
+            PROFILER.count("skips")
+        return log
     actions = parse_input(inp, player)
     if actions is None:
-        turn_summary.append("Invalid input")
-        return turn_summary
+        if PROFILER is not None:
+            PROFILER.count("invalid_input")
+        log.append(Note("Invalid input"))
+        return log
     if not validate_combo(actions, player):
-        turn_summary.append("Invalid combo! Must be character-suit cards + optional 1 non-suit card.")
-        return turn_summary
-    special_error = False
+        if PROFILER is not None:
+            PROFILER.count("invalid_combo")
+        log.append(Note("Invalid combo! Must be character-suit cards + optional 1 non-suit card."))
+        return log
     for idx, special in actions:
         card = player.hand[idx]
         if special and not can_use_special(player, card, special):
-            turn_summary.append(f"Error: {card} has no special play for {player.character.face} of {player.character.suit}")
-            special_error = True
-            break
-    if special_error:
-        return turn_summary
-    cards_to_play = [(player.hand[idx], special) for idx, special in actions]
-    for idx, _ in sorted(actions, key=lambda x: x[0], reverse=True):
-        del player.hand[idx]
+            if PROFILER is not None:
+                PROFILER.count("invalid_special")
+            log.append(Note("Error: {} has no special play for {} of {}", card, player.character.face, player.character.suit))
+            return log
+    played = player.hand.take([idx for idx, _ in actions])
+    cards_to_play = [(card, special) for card, (_, special) in zip(played, actions)]
     cycled_cards = []
     for card, special in cards_to_play:
-        was_shield = False
         if special:
             if player.character.suit == "Bastoni" and card.suit == "Bastoni":
                 choice = getattr(card, '_temp_bastoni_choice', 'attack')
                 if choice == 'attack':
-                    _, remaining, self_dmg, attack_summary = apply_attack(player, card, opponent)
-                    turn_summary.extend(attack_summary)
+                    apply_attack(player, card, opponent, log=log)
                     cycled_cards.append(card)
                 else:
-                    turn_summary.extend(apply_shield(player, card))
-                    was_shield = True
+                    apply_shield(player, card, log)
             elif player.character.suit == "Spade" and card.suit == "Coppe":
-                _, _, self_dmg, attack_summary = apply_attack(player, card, opponent, ignore_shields=True)
-                turn_summary.extend(attack_summary)
+                apply_attack(player, card, opponent, ignore_shields=True, log=log)
                 cycled_cards.append(card)
             elif player.character.suit == "Coppe" and card.suit == "Spade":
-                heal_amt, opp_bonus, heal_summary = apply_heal(player, card, opponent)
-                turn_summary.extend(heal_summary)
+                apply_heal(player, card, opponent, log)
                 cycled_cards.append(card)
         else:
             if card.suit == "Denari":
-                turn_summary.extend(apply_shield(player, card))
-                was_shield = True
+                apply_shield(player, card, log)
             elif card.suit == "Coppe":
-                heal_amt, opp_bonus, heal_summary = apply_heal(player, card, opponent)
-                turn_summary.extend(heal_summary)
+                apply_heal(player, card, opponent, log)
                 cycled_cards.append(card)
             else:
-                _, remaining, self_dmg, attack_summary = apply_attack(player, card, opponent)
-                turn_summary.extend(attack_summary)
+                apply_attack(player, card, opponent, log=log)
                 cycled_cards.append(card)
     for card in cycled_cards:
         move_card_to_bottom(player, card)
     player.turns_played += 1
-    return turn_summary
+    if PROFILER is not None:
+        PROFILER.count("turns")
+        PROFILER.count("cards_played", len(cards_to_play))
+        specials = sum(1 for _, special in cards_to_play if special)
+        if specials:
+            PROFILER.count("specials", specials)
+    if CHECK_INVARIANTS:
+        check_zones(player, opponent)
+    return log
 
-def player_pre_shield(player, opponent, inp):
-    turn_summary = []
+def player_pre_shield(player, opponent, inp, log=None):
+    if log is None:
+        log = EventLog()
     if inp == "0":
-        turn_summary.append(f"{player.name} skips pre-shield")
+        if log.enabled:
+            log.append(Note("{} skips pre-shield", player.name))
         needed = player.character.hand_size - len(player.hand)
         if needed > 0:
             drawn, _ = draw_cards(player, needed)
-            turn_summary.append(f"{player.name} draws {drawn} card(s) to hand")
-        return turn_summary
+            if log.enabled:
+                log.append(DrawEvent(player.name, drawn, "pre_shield"))
+        return log
     actions = parse_input(inp, player)
     if actions is None or len(actions) != 1:
-        turn_summary.append("Invalid: must be exactly ONE card (e.g., '1' or '3s')")
-        return turn_summary
+        if PROFILER is not None:
+            PROFILER.count("invalid_input")
+        log.append(Note("Invalid: must be exactly ONE card (e.g., '1' or '3s')"))
+        return log
     idx, special = actions[0]
-    card = player.hand[idx]
-    del player.hand[idx]
+    card = player.hand.pop_at(idx)
     if card.suit == "Denari":
-        turn_summary.extend(apply_shield(player, card))
-        turn_summary.append(f"{player.name} plays starting shield: {card}")
+        apply_shield(player, card, log)
+        if log.enabled:
+            log.append(Note("{} plays starting shield: {}", player.name, card))
     elif special and player.character.suit == "Bastoni" and card.suit == "Bastoni":
-        turn_summary.extend(apply_shield(player, card))
-        turn_summary.append(f"{player.name} plays starting shield {card} (Club special)")
+        apply_shield(player, card, log)
+        if log.enabled:
+            log.append(Note("{} plays starting shield {} (Club special)", player.name, card))
     else:
-        turn_summary.append(f"Invalid: {card} cannot be played as a shield")
+        if PROFILER is not None:
+            PROFILER.count("invalid_pre_shield")
+        log.append(Note("Invalid: {} cannot be played as a shield", card))
         player.hand.insert(idx, card)
-        return turn_summary
+        return log
     needed = player.character.hand_size - len(player.hand)
     if needed > 0:
         drawn, _ = draw_cards(player, needed)
-        turn_summary.append(f"{player.name} draws {drawn} card(s) to reach full hand size")
-    return turn_summary
+        if log.enabled:
+            log.append(DrawEvent(player.name, drawn, "full_hand"))
+    if CHECK_INVARIANTS:
+        check_zones(player, opponent)
+    return log
 
 def check_victory(p1, p2):
     if p1.health <= 0 and p2.health <= 0:
@@ -309,9 +570,11 @@ def check_victory(p1, p2):
     return None, []
 
 def check_turn_limit(p1, p2):
-    return p1.turns_played >= MAX_PLAYER_TURNS or p2.turns_played >= MAX_PLAYER_TURNS
+    limit = RULES.max_player_turns
+    return p1.turns_played >= limit or p2.turns_played >= limit
 
 def resolve_tournament_end(p1, p2):
+    # (winning player, summary); the winner is None for a draw under "hp_winner_draw"
     summary = [
         f"⏰ TOURNAMENT END! {p1.turns_played + p2.turns_played} total turns played",
         f"Final Health - Player 1 ({p1.character.face}): {p1.health}HP",
@@ -325,40 +588,67 @@ def resolve_tournament_end(p1, p2):
         return p2, summary
     else:
         summary.append(f"⚖️ EXACT HEALTH TIE ({p1.health} HP each)!")
+        if RULES.resolution == "hp_winner_draw":
+            summary.append("🤝 THE TOURNAMENT IS A DRAW!")
+            return None, summary
+        if RULES.resolution == "hp_winner_player1_tie":
+            summary.append("🎯 PLAYER 1 WINS TIEBREAKER!")
+            return p1, summary
         summary.append(f"🎯 PLAYER 2 WINS TIEBREAKER!")
         return p2, summary
 
-def refill_hand(player):
+def tournament_result(p1, p2):
+    # resolve_tournament_end as "p1", "p2" or "tie", like check_victory
+    winner, summary = resolve_tournament_end(p1, p2)
+    return ("tie" if winner is None else "p1" if winner is p1 else "p2"), summary
+
+def refill_hand(player, log=None):
+    if log is None:
+        log = EventLog()
     needed = player.character.hand_size - len(player.hand)
-    summary = []
     if needed > 0:
         drawn, _ = draw_cards(player, needed)
-        if drawn > 0:
-            summary.append(f"{player.name} draws {drawn} card(s) at end of turn")
-    return summary
+        if drawn > 0 and log.enabled:
+            log.append(DrawEvent(player.name, drawn, "end_of_turn"))
+    return log
 
-def init_game():
+def game_seed(master_seed, *index):
+    # Independent per-game seed from (master seed, game index): game k is the
+    # same game however a sweep is split across workers or chunks
+    key = "/".join(str(part) for part in (master_seed,) + index).encode()
+    return int.from_bytes(hashlib.blake2b(key, digest_size=8).digest(), "little")
+
+def game_rng(master_seed, *index):
+    return random.Random(game_seed(master_seed, *index))
+
+def init_game(characters=None, rng=None):
+    # characters: optional ((face, suit), (face, suit)) to fix the matchup.
+    # rng: a random.Random (see game_rng); defaults to the global random module
+    rng = rng or random
     face_cards = create_face_cards()
     numeric_deck = build_numeric_deck()
-    random.shuffle(numeric_deck)
-    p1_char_card = random.choice(face_cards)
-    remaining_faces = [c for c in face_cards if c != p1_char_card]
-    p2_char_card = random.choice(remaining_faces)
-    p1_character = Character(p1_char_card.rank, p1_char_card.suit)
-    p2_character = Character(p2_char_card.rank, p2_char_card.suit)
+    rng.shuffle(numeric_deck)
+    if characters is None:
+        p1_char_card = rng.choice(face_cards)
+        remaining_faces = [c for c in face_cards if c != p1_char_card]
+        p2_char_card = rng.choice(remaining_faces)
+        p1_character = Character(p1_char_card.rank, p1_char_card.suit)
+        p2_character = Character(p2_char_card.rank, p2_char_card.suit)
+    else:
+        p1_character, p2_character = (Character(face, suit) for face, suit in characters)
     total_needed = p1_character.stack_size + p2_character.stack_size
     available_cards = numeric_deck[:total_needed]
     if len(available_cards) < total_needed:
         extra_needed = total_needed - len(available_cards)
-        extra_cards = random.sample(numeric_deck, min(extra_needed, len(numeric_deck)))
+        extra_cards = rng.sample(numeric_deck, min(extra_needed, len(numeric_deck)))
         available_cards.extend(extra_cards)
-        random.shuffle(available_cards)
+        rng.shuffle(available_cards)
         available_cards = available_cards[:total_needed]
     p1_stack = available_cards[:p1_character.stack_size]
     p2_stack = available_cards[p1_character.stack_size:p1_character.stack_size + p2_character.stack_size]
     # Ensure no duplicates between stacks
     if any(card in p2_stack for card in p1_stack):
-        random.shuffle(available_cards)
+        rng.shuffle(available_cards)
         p1_stack = available_cards[:p1_character.stack_size]
         p2_stack = available_cards[p1_character.stack_size:p1_character.stack_size + p2_character.stack_size]
     player1 = Player("Player 1", p1_character, p1_stack)
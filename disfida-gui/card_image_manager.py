@@ -1,73 +1,167 @@
 # card_image_manager.py
+# Card sprites are resized and rotated once, then kept in a single atlas file
+# next to the JPEGs. The atlas header records each source's mtime and size
+# plus the sprite size, and is rebuilt only when any of them change. Sprites
+# are turned into Tk images lazily, on the first get_image() for each card.
 from PIL import Image, ImageTk
 import os
+import struct
+
+CARD_IMAGES = {
+    ("Denari", "A"): "cards/01_Asso_di_denari.jpg",
+    ("Denari", "2"): "cards/02_Due_di_denari.jpg",
+    ("Denari", "3"): "cards/03_Tre_di_denari.jpg",
+    ("Denari", "4"): "cards/04_Quattro_di_denari.jpg",
+    ("Denari", "5"): "cards/05_Cinque_di_denari.jpg",
+    ("Denari", "6"): "cards/06_Sei_di_denari.jpg",
+    ("Denari", "7"): "cards/07_Sette_di_denari.jpg",
+    ("Denari", "Fante"): "cards/08_Otto_di_denari.jpg",
+    ("Denari", "Cavallo"): "cards/09_Nove_di_denari.jpg",
+    ("Denari", "Re"): "cards/10_Dieci_di_denari.jpg",
+    ("Coppe", "A"): "cards/11_Asso_di_coppe.jpg",
+    ("Coppe", "2"): "cards/12_Due_di_coppe.jpg",
+    ("Coppe", "3"): "cards/13_Tre_di_coppe.jpg",
+    ("Coppe", "4"): "cards/14_Quattro_di_coppe.jpg",
+    ("Coppe", "5"): "cards/15_Cinque_di_coppe.jpg",
+    ("Coppe", "6"): "cards/16_Sei_di_coppe.jpg",
+    ("Coppe", "7"): "cards/17_Sette_di_coppe.jpg",
+    ("Coppe", "Fante"): "cards/18_Otto_di_coppe.jpg",
+    ("Coppe", "Cavallo"): "cards/19_Nove_di_coppe.jpg",
+    ("Coppe", "Re"): "cards/20_Dieci_di_coppe.jpg",
+    ("Spade", "A"): "cards/21_Asso_di_spade.jpg",
+    ("Spade", "2"): "cards/22_Due_di_spade.jpg",
+    ("Spade", "3"): "cards/23_Tre_di_spade.jpg",
+    ("Spade", "4"): "cards/24_Quattro_di_spade.jpg",
+    ("Spade", "5"): "cards/25_Cinque_di_spade.jpg",
+    ("Spade", "6"): "cards/26_Sei_di_spade.jpg",
+    ("Spade", "7"): "cards/27_Sette_di_spade.jpg",
+    ("Spade", "Fante"): "cards/28_Otto_di_spade.jpg",
+    ("Spade", "Cavallo"): "cards/29_Nove_di_spade.jpg",
+    ("Spade", "Re"): "cards/30_Dieci_di_spade.jpg",
+    ("Bastoni", "A"): "cards/31_Asso_di_bastoni.jpg",
+    ("Bastoni", "2"): "cards/32_Due_di_bastoni.jpg",
+    ("Bastoni", "3"): "cards/33_Tre_di_bastoni.jpg",
+    ("Bastoni", "4"): "cards/34_Quattro_di_bastoni.jpg",
+    ("Bastoni", "5"): "cards/35_Cinque_di_bastoni.jpg",
+    ("Bastoni", "6"): "cards/36_Sei_di_bastoni.jpg",
+    ("Bastoni", "7"): "cards/37_Sette_di_bastoni.jpg",
+    ("Bastoni", "Fante"): "cards/38_Otto_di_bastoni.jpg",
+    ("Bastoni", "Cavallo"): "cards/39_Nove_di_bastoni.jpg",
+    ("Bastoni", "Re"): "cards/40_Dieci_di_Bastoni.jpg",
+}
+
+CARD_BACK = "cards/Carte_Napoletane_retro.jpg"
+CACHE_PATH = "cards/sprites.cache"
+CACHE_MAGIC = b"DSPC"
+CACHE_VERSION = 1
+SPRITE_SIZE = (80, 132)
+
+# Atlas order: every card, then the back (key None); two frames per entry
+SOURCES = list(CARD_IMAGES.items()) + [(None, CARD_BACK)]
+HEADER = struct.Struct("<4sBHHH")  # magic, version, width, height, entries
+STAMP = struct.Struct("<qq")  # source mtime_ns, file size; -1, -1 if missing
+
+def source_stamps():
+    stamps = []
+    for _, path in SOURCES:
+        try:
+            stat = os.stat(path)
+            stamps.append((stat.st_mtime_ns, stat.st_size))
+        except OSError:
+            stamps.append((-1, -1))
+    return stamps
+
+def atlas_header(size, stamps):
+    return HEADER.pack(CACHE_MAGIC, CACHE_VERSION, size[0], size[1], len(stamps)) + b"".join(
+        STAMP.pack(*stamp) for stamp in stamps)
+
+def read_atlas(path, size, stamps):
+    # Raw frames if the cache matches the sources and size, else None
+    header = atlas_header(size, stamps)
+    try:
+        with open(path, "rb") as f:
+            data = f.read()
+    except OSError:
+        return None
+    frames = memoryview(data)[len(header):]
+    if data[:len(header)] != header or len(frames) != 2 * len(stamps) * size[0] * size[1] * 3:
+        return None
+    return frames
+
+def build_atlas(size, stamps):
+    frame_bytes = size[0] * size[1] * 3
+    blank = bytes(frame_bytes)
+    frames = bytearray()
+    for ((_, path), stamp) in zip(SOURCES, stamps):
+        if stamp[0] < 0:
+            frames += blank + blank
+            continue
+        img = Image.open(path).convert("RGB").resize(size, Image.Resampling.LANCZOS)
+        frames += img.tobytes() + img.rotate(180).tobytes()
+    return frames
+
+def write_atlas(path, size, stamps, frames):
+    # Written beside the target and renamed, so readers never see half a file
+    tmp = f"{path}.{os.getpid()}.tmp"
+    try:
+        with open(tmp, "wb") as f:
+            f.write(atlas_header(size, stamps))
+            f.write(frames)
+        os.replace(tmp, path)
+    except OSError:
+        # A read-only install just regenerates on every launch
+        try:
+            os.remove(tmp)
+        except OSError:
+            pass
+
+def load_atlas(path=CACHE_PATH, size=SPRITE_SIZE):
+    stamps = source_stamps()
+    frames = read_atlas(path, size, stamps)
+    if frames is None:
+        frames = build_atlas(size, stamps)
+        write_atlas(path, size, stamps, frames)
+        frames = memoryview(frames)
+    return frames, stamps
 
 class CardImageManager:
-    def __init__(self):
+    def __init__(self, size=SPRITE_SIZE, cache_path=CACHE_PATH):
+        self.size = size
+        self.cache_path = cache_path
         self.card_images = {}
         self.card_images_rotated = {}
-        self.card_back = None
-        self.card_back_rotated = None
         self.load_images()
 
     def load_images(self):
-        CARD_IMAGES = {
-            ("Denari", "A"): "cards/01_Asso_di_denari.jpg",
-            ("Denari", "2"): "cards/02_Due_di_denari.jpg",
-            ("Denari", "3"): "cards/03_Tre_di_denari.jpg",
-            ("Denari", "4"): "cards/04_Quattro_di_denari.jpg",
-            ("Denari", "5"): "cards/05_Cinque_di_denari.jpg",
-            ("Denari", "6"): "cards/06_Sei_di_denari.jpg",
-            ("Denari", "7"): "cards/07_Sette_di_denari.jpg",
-            ("Denari", "Fante"): "cards/08_Otto_di_denari.jpg",
-            ("Denari", "Cavallo"): "cards/09_Nove_di_denari.jpg",
-            ("Denari", "Re"): "cards/10_Dieci_di_denari.jpg",
-            ("Coppe", "A"): "cards/11_Asso_di_coppe.jpg",
-            ("Coppe", "2"): "cards/12_Due_di_coppe.jpg",
-            ("Coppe", "3"): "cards/13_Tre_di_coppe.jpg",
-            ("Coppe", "4"): "cards/14_Quattro_di_coppe.jpg",
-            ("Coppe", "5"): "cards/15_Cinque_di_coppe.jpg",
-            ("Coppe", "6"): "cards/16_Sei_di_coppe.jpg",
-            ("Coppe", "7"): "cards/17_Sette_di_coppe.jpg",
-            ("Coppe", "Fante"): "cards/18_Otto_di_coppe.jpg",
-            ("Coppe", "Cavallo"): "cards/19_Nove_di_coppe.jpg",
-            ("Coppe", "Re"): "cards/20_Dieci_di_coppe.jpg",
-            ("Spade", "A"): "cards/21_Asso_di_spade.jpg",
-            ("Spade", "2"): "cards/22_Due_di_spade.jpg",
-            ("Spade", "3"): "cards/23_Tre_di_spade.jpg",
-            ("Spade", "4"): "cards/24_Quattro_di_spade.jpg",
-            ("Spade", "5"): "cards/25_Cinque_di_spade.jpg",
-            ("Spade", "6"): "cards/26_Sei_di_spade.jpg",
-            ("Spade", "7"): "cards/27_Sette_di_spade.jpg",
-            ("Spade", "Fante"): "cards/28_Otto_di_spade.jpg",
-            ("Spade", "Cavallo"): "cards/29_Nove_di_spade.jpg",
-            ("Spade", "Re"): "cards/30_Dieci_di_spade.jpg",
-            ("Bastoni", "A"): "cards/31_Asso_di_bastoni.jpg",
-            ("Bastoni", "2"): "cards/32_Due_di_bastoni.jpg",
-            ("Bastoni", "3"): "cards/33_Tre_di_bastoni.jpg",
-            ("Bastoni", "4"): "cards/34_Quattro_di_bastoni.jpg",
-            ("Bastoni", "5"): "cards/35_Cinque_di_bastoni.jpg",
-            ("Bastoni", "6"): "cards/36_Sei_di_bastoni.jpg",
-            ("Bastoni", "7"): "cards/37_Sette_di_bastoni.jpg",
-            ("Bastoni", "Fante"): "cards/38_Otto_di_bastoni.jpg",
-            ("Bastoni", "Cavallo"): "cards/39_Nove_di_bastoni.jpg",
-            ("Bastoni", "Re"): "cards/40_Dieci_di_Bastoni.jpg"
-        }
-        for (suit, rank), path in CARD_IMAGES.items():
-            if os.path.exists(path):
-                img = Image.open(path).resize((80, 132), Image.Resampling.LANCZOS)
-                self.card_images[(suit, rank)] = ImageTk.PhotoImage(img)
-                self.card_images_rotated[(suit, rank)] = ImageTk.PhotoImage(img.rotate(180))
+        self.card_images.clear()
+        self.card_images_rotated.clear()
+        self.frames, stamps = load_atlas(self.cache_path, self.size)
+        self.index = {}
+        for i, ((key, path), stamp) in enumerate(zip(SOURCES, stamps)):
+            if stamp[0] >= 0:
+                self.index[key] = i
+            elif key is None:
+                print("Warning: Card back image not found")
             else:
                 print(f"Warning: Image {path} not found")
-        if os.path.exists("cards/Carte_Napoletane_retro.jpg"):
-            img_back = Image.open("cards/Carte_Napoletane_retro.jpg").resize((80, 132), Image.Resampling.LANCZOS)
-            self.card_back = ImageTk.PhotoImage(img_back)
-            self.card_back_rotated = ImageTk.PhotoImage(img_back.rotate(180))
-        else:
-            print("Warning: Card back image not found")
+
+    def sprite(self, key, rotated=False):
+        # Decoded PIL image for a card key, or None if its source was missing
+        i = self.index.get(key)
+        if i is None:
+            return None
+        frame_bytes = self.size[0] * self.size[1] * 3
+        start = (2 * i + rotated) * frame_bytes
+        return Image.frombuffer("RGB", self.size, self.frames[start:start + frame_bytes],
+                                "raw", "RGB", 0, 1)
 
     def get_image(self, card, rotated=False):
-        if card is None:
-            return self.card_back_rotated if rotated else self.card_back
-        return self.card_images_rotated[(card.suit, card.rank)] if rotated else self.card_images[(card.suit, card.rank)]
+        return self.get_key_image(None if card is None else (card.suit, card.rank), rotated)
+
+    def get_key_image(self, key, rotated=False):
+        # key is (suit, rank), or None for the card back
+        images = self.card_images_rotated if rotated else self.card_images
+        image = images.get(key)
+        if image is None and key in self.index:
+            image = images[key] = ImageTk.PhotoImage(self.sprite(key, rotated))
+        return image
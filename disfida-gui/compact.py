@@ -0,0 +1,216 @@
+# compact.py
+# Integer card encoding and __slots__ game state for simulation workers.
+# Cards are ids 0-39 (suit * 10 + rank, same order as the card images);
+# hands, stacks and shields are byte arrays of ids.
+from array import array
+import card_game_logic
+from card_game_logic import SUITS, RANKS, Card, CardZone, Character, Player
+
+DENARI, COPPE, SPADE, BASTONI = range(4)
+FACES = ["Fante", "Cavallo", "Re"]
+
+CARD_SUIT = [cid // 10 for cid in range(40)]
+CARD_RANK = [cid % 10 for cid in range(40)]
+CARD_VALUE = [11 if r == 0 else (10 if r >= 7 else r + 1) for r in CARD_RANK]
+NUMERIC_CARDS = [cid for cid in range(40) if CARD_RANK[cid] < 7]
+
+# One shared Card per id, used when converting back to card_game_logic objects
+CARDS = [Card(SUITS[cid // 10], RANKS[cid % 10]) for cid in range(40)]
+
+def card_id(card):
+    return card.id
+
+def card_from_id(cid):
+    return CARDS[cid]
+
+def card_name(cid):
+    return f"{RANKS[CARD_RANK[cid]]} of {SUITS[CARD_SUIT[cid]]}"
+
+class CompactCharacter:
+    __slots__ = ("face", "suit", "attack_bonus", "defense_bonus", "heal_bonus", "stack_size", "hand_size")
+
+    def __init__(self, face, suit):
+        # face is "Fante"/"Cavallo"/"Re", suit is a suit index
+        self.face = face
+        self.suit = suit
+        rules = card_game_logic.RULES
+        self.attack_bonus, self.defense_bonus, self.heal_bonus = rules.bonuses(face)
+        self.stack_size, self.hand_size = rules.sizes(suit == DENARI)
+
+class CompactPlayer:
+    __slots__ = ("character", "stack", "hand", "shields", "health", "turns_played")
+
+    def __init__(self, character, stack):
+        self.character = character
+        self.stack = array("B", stack)
+        self.hand = array("B")
+        self.shields = array("B")
+        self.health = card_game_logic.RULES.health
+        self.turns_played = 0
+
+def hand_mask(player):
+    mask = 0
+    for cid in player.hand:
+        mask |= 1 << cid
+    return mask
+
+def shield_mask(player):
+    mask = 0
+    for cid in player.shields:
+        mask |= 1 << cid
+    return mask
+
+# -----------------------------
+# Adapters to and from card_game_logic
+# -----------------------------
+def to_compact(player):
+    character = CompactCharacter(player.character.face, SUITS.index(player.character.suit))
+    compact = CompactPlayer(character, [c.id for c in player.stack])
+    compact.hand = array("B", [c.id for c in player.hand])
+    compact.shields = array("B", [c.id for c in player.shields])
+    compact.health = player.health
+    compact.turns_played = player.turns_played
+    return compact
+
+def from_compact(compact, name):
+    character = Character(compact.character.face, SUITS[compact.character.suit])
+    player = Player(name, character, [CARDS[cid] for cid in compact.stack])
+    player.hand = CardZone(CARDS[cid] for cid in compact.hand)
+    player.shields.reset(CARDS[cid] for cid in compact.shields)
+    player.health = compact.health
+    player.turns_played = compact.turns_played
+    return player
+
+# -----------------------------
+# Rules on compact state (same semantics as card_game_logic)
+# -----------------------------
+def draw_cards(player, n):
+    n = min(n, len(player.stack))
+    player.hand.extend(player.stack[:n])
+    del player.stack[:n]
+    return n
+
+def refill_hand(player):
+    needed = player.character.hand_size - len(player.hand)
+    return draw_cards(player, needed) if needed > 0 else 0
+
+def can_use_special(player, cid):
+    char_suit = player.character.suit
+    suit = CARD_SUIT[cid]
+    return ((char_suit == SPADE and suit == COPPE) or
+            (char_suit == COPPE and suit == SPADE) or
+            (char_suit == BASTONI and suit == BASTONI))
+
+def validate_action(player, action):
+    hand = player.hand
+    seen = 0
+    last = len(action) - 1
+    for i, (idx, special, _) in enumerate(action):
+        if idx < 0 or idx >= len(hand) or seen & (1 << idx):
+            return False
+        seen |= 1 << idx
+        cid = hand[idx]
+        if i < last and CARD_SUIT[cid] != player.character.suit:
+            return False
+        if special and not can_use_special(player, cid):
+            return False
+    return bool(action)
+
+def remove_shields_for_attack(opponent, attack_value):
+    shields = opponent.shields
+    if not shields:
+        return attack_value
+    # sorted() is stable, so equal values keep their table order
+    order = sorted(range(len(shields)), key=lambda i: CARD_VALUE[shields[i]])
+    bonus = opponent.character.defense_bonus
+    remaining = attack_value
+    consumed = 0
+    for i in order:
+        remaining -= CARD_VALUE[shields[i]] + bonus
+        consumed += 1
+        if remaining <= 0:
+            break
+    removed = order[:consumed]
+    opponent.stack.extend(shields[i] for i in removed)
+    removed = set(removed)
+    opponent.shields = array("B", [cid for i, cid in enumerate(shields) if i not in removed])
+    return max(0, remaining)
+
+def apply_heal(player, cid, opponent):
+    value = CARD_VALUE[cid]
+    rules = card_game_logic.RULES
+    player.health = min(rules.health, player.health + value + player.character.heal_bonus)
+    if player.character.suit == COPPE and CARD_SUIT[cid] == SPADE:
+        opponent.health = min(rules.health, opponent.health + value // rules.charity_divisor)
+
+def apply_attack(player, cid, opponent, ignore_shields=False):
+    attack_value = CARD_VALUE[cid] + player.character.attack_bonus
+    if ignore_shields:
+        opponent.health -= attack_value
+        if player.character.suit == SPADE and CARD_SUIT[cid] == COPPE:
+            player.health -= CARD_VALUE[cid] // card_game_logic.RULES.blood_price_divisor
+    else:
+        opponent.health -= remove_shields_for_attack(opponent, attack_value)
+
+def resolve_action(player, opponent, action):
+    # Returns False (state untouched) for an invalid action, like resolve_turn
+    if not action:
+        player.turns_played += 1
+        return True
+    if not validate_action(player, action):
+        return False
+    hand = player.hand
+    played = [(hand[idx], special, as_shield) for idx, special, as_shield in action]
+    for idx in sorted((a[0] for a in action), reverse=True):
+        del hand[idx]
+    char_suit = player.character.suit
+    cycled = []
+    for cid, special, as_shield in played:
+        suit = CARD_SUIT[cid]
+        if special:
+            if char_suit == BASTONI:
+                if as_shield:
+                    player.shields.append(cid)
+                    continue
+                apply_attack(player, cid, opponent)
+            elif char_suit == SPADE:
+                apply_attack(player, cid, opponent, ignore_shields=True)
+            else:
+                apply_heal(player, cid, opponent)
+        elif suit == DENARI:
+            player.shields.append(cid)
+            continue
+        elif suit == COPPE:
+            apply_heal(player, cid, opponent)
+        else:
+            apply_attack(player, cid, opponent)
+        cycled.append(cid)
+    player.stack.extend(cycled)
+    player.turns_played += 1
+    return True
+
+def pre_shield(player, action):
+    # Returns False (state untouched) if the card cannot open as a shield
+    if action:
+        if len(action) != 1:
+            return False
+        idx, special, _ = action[0]
+        if idx < 0 or idx >= len(player.hand):
+            return False
+        cid = player.hand[idx]
+        suit = CARD_SUIT[cid]
+        if not (suit == DENARI or (special and suit == BASTONI and player.character.suit == BASTONI)):
+            return False
+        del player.hand[idx]
+        player.shields.append(cid)
+    refill_hand(player)
+    return True
+
+def check_victory(p1, p2):
+    if p1.health <= 0 and p2.health <= 0:
+        return "tie"
+    elif p1.health <= 0:
+        return "p2"
+    elif p2.health <= 0:
+        return "p1"
+    return None
@@ -0,0 +1,155 @@
+# endgame.py
+# Exact solver for the last few turns before the turn limit. Hands are
+# treated as known; the order of each stack is not. The cards a stack held
+# when solving started are an unordered prefix (every k-card draw from it is
+# equally likely), and cards cycled to the bottom afterwards keep their order.
+# Values are (p1 win, tie, p2 win) probabilities; each side maximises its
+# own win probability plus half the tie probability.
+from itertools import combinations, islice
+from math import comb
+import card_game_logic
+from card_game_logic import check_victory, check_turn_limit, play_action, tournament_result
+from events import NULL_LOG
+from legal_moves import legal_action_list
+from search_state import snapshot, restore
+
+P1_WIN = (1.0, 0.0, 0.0)
+TIE = (0.0, 1.0, 0.0)
+P2_WIN = (0.0, 0.0, 1.0)
+
+def remaining_plies(player, opponent):
+    # Turns left until check_turn_limit ends the game, player to move
+    mover, waiting = player.turns_played, opponent.turns_played
+    limit = card_game_logic.RULES.max_player_turns
+    plies = 0
+    while True:
+        mover += 1
+        plies += 1
+        if mover >= limit or waiting >= limit:
+            return plies
+        mover, waiting = waiting, mover
+
+def _shield_order(player):
+    # Shields in the same absorb order behave identically
+    return tuple(c.id for c in player.shields)
+
+def _player_key(player, unknown):
+    return (player.character.face, player.character.suit,
+            tuple(sorted(c.id for c in player.hand)),
+            tuple(sorted(c.id for c in islice(player.stack, unknown))),
+            tuple(c.id for c in islice(player.stack, unknown, None)),
+            _shield_order(player), player.health, player.turns_played)
+
+class EndgameSolver:
+    # The memo outlives a game, so positions are keyed by character too and
+    # it empties itself when card_game_logic.RULES is replaced
+    def __init__(self, threshold=3, max_memo=1 << 20):
+        self.threshold = threshold
+        self.max_memo = max_memo
+        self.memo = {}
+        self.rules = card_game_logic.RULES
+
+    def active(self, player, opponent):
+        return remaining_plies(player, opponent) <= self.threshold
+
+    def solve(self, player, opponent):
+        # [(action, (win, tie, loss))] for the player to move, best first
+        if card_game_logic.RULES is not self.rules:
+            self.memo.clear()
+            self.rules = card_game_logic.RULES
+        first = player.turns_played == opponent.turns_played
+        self.p1, self.p2 = (player, opponent) if first else (opponent, player)
+        unknown = {id(player): len(player.stack), id(opponent): len(opponent.stack)}
+        results = []
+        for action in legal_action_list(player):
+            value = self._after_action(player, opponent, action, unknown)
+            if not first:
+                value = (value[2], value[1], value[0])
+            results.append((action, value))
+        results.sort(key=lambda item: item[1][0] + 0.5 * item[1][1], reverse=True)
+        if len(self.memo) > self.max_memo:
+            self.memo.clear()
+        return results
+
+    def best_action(self, player, opponent):
+        return self.solve(player, opponent)[0][0]
+
+    def _terminal(self):
+        result, _ = check_victory(self.p1, self.p2)
+        if result is None and check_turn_limit(self.p1, self.p2):
+            # Higher HP wins; an exact tie follows rules.resolution
+            result, _ = tournament_result(self.p1, self.p2)
+        if result:
+            return {"p1": P1_WIN, "p2": P2_WIN, "tie": TIE}[result]
+        return None
+
+    def _value(self, mover, other, unknown):
+        key = (_player_key(self.p1, unknown[id(self.p1)]),
+               _player_key(self.p2, unknown[id(self.p2)]))
+        value = self.memo.get(key)
+        if value is not None:
+            return value
+        mover_is_p1 = mover is self.p1
+        best = None
+        best_score = -1.0
+        for action in legal_action_list(mover):
+            value = self._after_action(mover, other, action, unknown)
+            score = (value[0] if mover_is_p1 else value[2]) + 0.5 * value[1]
+            if score > best_score:
+                best, best_score = value, score
+        self.memo[key] = best
+        return best
+
+    def _after_action(self, mover, other, action, unknown):
+        snap = snapshot(self.p1, self.p2)
+        play_action(mover, other, action, NULL_LOG)
+        result, _ = check_victory(self.p1, self.p2)
+        if result:
+            value = {"p1": P1_WIN, "p2": P2_WIN, "tie": TIE}[result]
+        else:
+            value = self._after_refill(mover, other, unknown)
+        restore(snap, self.p1, self.p2)
+        return value
+
+    def _after_refill(self, mover, other, unknown):
+        # The refill cannot change the outcome once the turn limit is reached
+        value = self._terminal()
+        if value is not None:
+            return value
+        hidden = unknown[id(mover)]
+        need = min(mover.character.hand_size - len(mover.hand), len(mover.stack))
+        if need <= 0 or hidden == 0 or need >= hidden:
+            # Deterministic draw: nothing hidden to pick from, or all of it
+            mover.hand.extend(mover.stack.draw(need))
+            unknown = dict(unknown)
+            unknown[id(mover)] = max(0, hidden - need)
+            return self._value(other, mover, unknown)
+        # Chance node: every need-subset of the hidden prefix is equally likely
+        prefix = mover.stack.top(hidden)
+        tail = list(islice(mover.stack, hidden, None))
+        hand_len = len(mover.hand)
+        unknown = dict(unknown)
+        unknown[id(mover)] = hidden - need
+        total = [0.0, 0.0, 0.0]
+        for chosen in combinations(range(hidden), need):
+            picked = set(chosen)
+            mover.hand.truncate(hand_len)
+            mover.hand.extend(prefix[i] for i in chosen)
+            mover.stack.reset([prefix[i] for i in range(hidden) if i not in picked] + tail)
+            value = self._value(other, mover, unknown)
+            total[0] += value[0]
+            total[1] += value[1]
+            total[2] += value[2]
+        outcomes = comb(hidden, need)
+        return (total[0] / outcomes, total[1] / outcomes, total[2] / outcomes)
+
+class EndgameBot:
+    # Policy wrapper: exact play near the turn limit, fallback policy before
+    def __init__(self, fallback, threshold=3):
+        self.fallback = fallback
+        self.solver = EndgameSolver(threshold)
+
+    def __call__(self, player, opponent, phase, rng=None):
+        if phase == "turn" and self.solver.active(player, opponent):
+            return self.solver.best_action(player, opponent)
+        return self.fallback(player, opponent, phase, rng)
@@ -0,0 +1,126 @@
+# events.py
+# Typed records of what happened during a turn. The rules code appends them
+# to a log and text is only built when a consumer (GUI log, CLI) calls str().
+# Pass NULL_LOG to skip event creation entirely in headless runs.
+
+class Event:
+    __slots__ = ()
+
+    def __repr__(self):
+        return f"{type(self).__name__}({str(self)!r})"
+
+class Note(Event):
+    # Free-form message, formatted on demand
+    __slots__ = ("template", "args")
+
+    def __init__(self, template, *args):
+        self.template = template
+        self.args = args
+
+    def __str__(self):
+        return self.template.format(*self.args) if self.args else self.template
+
+class AttackEvent(Event):
+    __slots__ = ("card", "value", "damage", "ignore_shields")
+
+    def __init__(self, card, value, damage, ignore_shields=False):
+        self.card = card
+        self.value = value
+        self.damage = damage
+        self.ignore_shields = ignore_shields
+
+    def __str__(self):
+        if self.ignore_shields:
+            return f"Blood Price {self.card}: {self.value} damage (ignores shields)"
+        if self.damage > 0:
+            return f"Attack {self.card}: {self.value}→{self.damage} damage"
+        return f"Attack {self.card}: {self.value} blocked by shields"
+
+class ShieldsConsumedEvent(Event):
+    __slots__ = ("shields",)
+
+    def __init__(self, shields):
+        self.shields = shields
+
+    def __str__(self):
+        return f"Shields {', '.join(str(s) for s in self.shields)} absorbed attack, sent to bottom of deck"
+
+class HealEvent(Event):
+    __slots__ = ("card", "amount", "opponent_bonus", "charity")
+
+    def __init__(self, card, amount, opponent_bonus=0, charity=False):
+        self.card = card
+        self.amount = amount
+        self.opponent_bonus = opponent_bonus
+        self.charity = charity  # Charity's Burden also heals the opponent
+
+    def __str__(self):
+        if self.charity:
+            return f"Heal {self.card}: +{self.amount} HP, +{self.opponent_bonus} to opponent"
+        return f"Heal {self.card}: +{self.amount} HP"
+
+class SelfDamageEvent(Event):
+    __slots__ = ("card", "amount")
+
+    def __init__(self, card, amount):
+        self.card = card
+        self.amount = amount
+
+    def __str__(self):
+        return f"Blood Price self-damage: -{self.amount} HP"
+
+class ShieldEvent(Event):
+    __slots__ = ("card", "defense")
+
+    def __init__(self, card, defense):
+        self.card = card
+        self.defense = defense
+
+    def __str__(self):
+        return f"Shield {self.card}: +{self.defense} defense"
+
+class DrawEvent(Event):
+    __slots__ = ("player", "count", "reason")
+
+    TEMPLATES = {
+        "pre_shield": "{} draws {} card(s) to hand",
+        "full_hand": "{} draws {} card(s) to reach full hand size",
+        "end_of_turn": "{} draws {} card(s) at end of turn",
+    }
+
+    def __init__(self, player, count, reason):
+        self.player = player  # player name
+        self.count = count
+        self.reason = reason
+
+    def __str__(self):
+        return self.TEMPLATES[self.reason].format(self.player, self.count)
+
+class EventLog(list):
+    __slots__ = ()
+    enabled = True
+
+    def text(self):
+        return [str(event) for event in self]
+
+class NullLog:
+    # "No events" mode: rules code checks .enabled and records nothing
+    __slots__ = ()
+    enabled = False
+
+    def append(self, event):
+        pass
+
+    def extend(self, events):
+        pass
+
+    def __iter__(self):
+        return iter(())
+
+    def __len__(self):
+        return 0
+
+    def text(self):
+        return []
+
+NULL_LOG = NullLog()
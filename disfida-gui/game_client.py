@@ -0,0 +1,86 @@
+# game_client.py
+# Local test client for game_server.py: opens many connections at once and
+# answers every move request with a simulation policy.
+import argparse
+import asyncio
+import json
+import random
+import time
+from observation import players_from_state
+from simulation import POLICIES
+
+async def connect(host, port, unix_path):
+    if unix_path:
+        return await asyncio.open_unix_connection(unix_path)
+    return await asyncio.open_connection(host, port)
+
+async def send(writer, message):
+    writer.write(json.dumps(message, separators=(",", ":")).encode() + b"\n")
+    await writer.drain()
+
+async def play_games(games, policy, join, rng, host="127.0.0.1", port=8765, unix_path=None):
+    # Plays `games` matches on one connection; returns (seat, end message) pairs
+    reader, writer = await connect(host, port, unix_path)
+    results = []
+    try:
+        for _ in range(games):
+            await send(writer, join)
+            seat = None
+            while True:
+                line = await reader.readline()
+                if not line:
+                    return results
+                message = json.loads(line)
+                kind = message["type"]
+                if kind == "start":
+                    seat = message["seat"]
+                elif kind == "request":
+                    player, opponent = players_from_state(message["state"])
+                    action = policy(player, opponent, message["phase"], rng)
+                    await send(writer, {"type": "action", "move": message["move"],
+                                        "action": [list(card) for card in action]})
+                elif kind == "end":
+                    results.append((seat, message))
+                    break
+                elif kind == "error":
+                    raise RuntimeError(message["message"])
+    finally:
+        writer.close()
+        await writer.wait_closed()
+    return results
+
+async def run(connections, games, policy, join, seed=None, host="127.0.0.1", port=8765,
+              unix_path=None):
+    master = random.Random(seed)
+    jobs = [play_games(games, policy, join, random.Random(master.getrandbits(64)),
+                       host, port, unix_path) for _ in range(connections)]
+    results = []
+    for batch in await asyncio.gather(*jobs):
+        results.extend(batch)
+    return results
+
+def main():
+    parser = argparse.ArgumentParser(description="Drive game_server.py with policy bots")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--unix", metavar="PATH")
+    parser.add_argument("--connections", type=int, default=100)
+    parser.add_argument("--games", type=int, default=10, help="games per connection")
+    parser.add_argument("--policy", choices=sorted(POLICIES), default="random")
+    parser.add_argument("--opponent", default="random",
+                        help="server-side policy name, or 'remote' to pair clients together")
+    parser.add_argument("--seat", type=int, choices=(1, 2), default=1)
+    parser.add_argument("--seed", type=int, default=None)
+    args = parser.parse_args()
+    join = {"type": "join", "opponent": args.opponent, "seat": args.seat}
+    start = time.perf_counter()
+    results = asyncio.run(run(args.connections, args.games, POLICIES[args.policy], join,
+                              args.seed, args.host, args.port, args.unix))
+    elapsed = time.perf_counter() - start
+    won = sum(1 for seat, end in results if end["winner"] == f"p{seat}")
+    ties = sum(1 for _, end in results if end["winner"] == "tie")
+    print(f"Games: {len(results)}, won {won}, tied {ties}, lost {len(results) - won - ties}")
+    print(f"Elapsed: {elapsed:.2f}s ({len(results) / elapsed:.0f} games/sec)")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,325 @@
+# game_server.py
+# asyncio server running many Disfida matches in one process over TCP or a
+# Unix socket. Each direction carries one JSON object per line:
+#   client: {"type": "join", "opponent": "random" | "uniform" | "skip" | "remote",
+#            "seat": 1 | 2, "events": false, "characters": [[face, suit], [face, suit]]}
+#   server: {"type": "start", "game": id, "seat": 1 | 2, "characters": [...]}
+#   server: {"type": "request", "move": n, "phase": "pre_shield" | "turn",
+#            "timeout": seconds, "state": {...}}
+#   client: {"type": "action", "move": n, "action": [[hand_index, special, as_shield], ...]}
+#   server: {"type": "move", "seat": s, "phase": ..., "action": [...], "valid": bool,
+#            "events": [text, ...]}   (events only for clients that asked for them)
+#   server: {"type": "end", "game": id, "winner": "p1" | "p2" | "tie", "ending": ..., "turns": n}
+# A move that does not arrive before the timeout is played as a skip. Writes
+# wait on drain(), so a client that stops reading only stalls its own match.
+# A remote join waits for the next remote join; a waiting client that
+# disconnects is dropped, and one still alone after the pairing timeout gets
+# {"type": "error", "message": "no opponent joined"}. Either remote player
+# may pick the characters; a join whose pick differs from the waiting
+# player's is refused.
+import argparse
+import asyncio
+import itertools
+import json
+import random
+from contextlib import suppress
+from card_game_logic import (SUITS, init_game, play_action, player_pre_shield, resolve_turn,
+                             refill_hand, check_victory, check_turn_limit,
+                             tournament_result, action_to_input)
+from events import NULL_LOG, EventLog
+from observation import observe, parse_action
+from simulation import POLICIES
+
+MAX_LINE = 1 << 16
+FACES = ("Fante", "Cavallo", "Re")
+
+def parse_characters(raw):
+    if raw is None:
+        return None
+    try:
+        characters = tuple((face, suit) for face, suit in raw)
+    except (TypeError, ValueError):
+        return False
+    if len(characters) != 2 or characters[0] == characters[1] or any(
+            face not in FACES or suit not in SUITS for face, suit in characters):
+        return False
+    return characters
+
+class Connection:
+    __slots__ = ("reader", "writer", "closed")
+
+    def __init__(self, reader, writer):
+        self.reader = reader
+        self.writer = writer
+        self.closed = False
+
+    async def send(self, message):
+        if self.closed:
+            return
+        self.writer.write(json.dumps(message, separators=(",", ":")).encode() + b"\n")
+        try:
+            await self.writer.drain()
+        except ConnectionError:
+            self.closed = True
+
+    async def receive(self):
+        # Next JSON object message, or None once the client is gone
+        while not self.closed:
+            try:
+                line = await self.reader.readline()
+            except (ConnectionError, ValueError):  # ValueError: line over MAX_LINE
+                line = b""
+            if not line:
+                self.closed = True
+                return None
+            try:
+                message = json.loads(line)
+            except ValueError:
+                await self.send({"type": "error", "message": "invalid JSON"})
+                continue
+            if isinstance(message, dict):
+                return message
+            await self.send({"type": "error", "message": "expected a JSON object"})
+        return None
+
+class BotSeat:
+    # Server-side policy from simulation.POLICIES
+    events = False
+
+    def __init__(self, policy, rng):
+        self.policy = policy
+        self.rng = rng
+
+    async def choose(self, player, opponent, phase, move):
+        return self.policy(player, opponent, phase, self.rng)
+
+    async def send(self, message):
+        pass
+
+class RemoteSeat:
+    def __init__(self, connection, timeout, events=False):
+        self.connection = connection
+        self.timeout = timeout
+        self.events = events
+
+    async def choose(self, player, opponent, phase, move):
+        connection = self.connection
+        if connection.closed:
+            return ()
+        await connection.send({"type": "request", "move": move, "phase": phase,
+                               "timeout": self.timeout, "state": observe(player, opponent)})
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + self.timeout
+        while True:
+            remaining = deadline - loop.time()
+            if remaining <= 0:
+                break
+            try:
+                message = await asyncio.wait_for(connection.receive(), remaining)
+            except asyncio.TimeoutError:
+                break
+            if message is None:
+                return ()
+            # Late answers to earlier requests carry an old move number
+            if message.get("type") != "action" or message.get("move") != move:
+                continue
+            action = parse_action(message.get("action"))
+            if action is not None:
+                return action
+            await connection.send({"type": "error", "message": "malformed action", "move": move})
+        await connection.send({"type": "timeout", "move": move})
+        return ()
+
+    async def send(self, message):
+        await self.connection.send(message)
+
+async def broadcast(seats, message, log):
+    for seat in seats:
+        if seat.events:
+            await seat.send(dict(message, events=log.text()))
+        else:
+            await seat.send(message)
+
+async def run_match(game_id, seats, characters=None, rng=None):
+    p1, p2, _ = init_game(characters, rng)
+    players = (p1, p2)
+    names = [[p.character.face, p.character.suit] for p in players]
+    for number, seat in enumerate(seats, 1):
+        await seat.send({"type": "start", "game": game_id, "seat": number, "characters": names})
+    wants_events = any(seat.events for seat in seats)
+    move = 0
+    for i in (0, 1):
+        player, opponent = players[i], players[1 - i]
+        action = await seats[i].choose(player, opponent, "pre_shield", move)
+        move += 1
+        log = EventLog() if wants_events else NULL_LOG
+        shields_before = len(player.shields)
+        player_pre_shield(player, opponent, action_to_input(action), log)
+        valid = not action or len(player.shields) != shields_before
+        if not valid:
+            player_pre_shield(player, opponent, "0", log)
+        await broadcast(seats, {"type": "move", "seat": i + 1, "phase": "pre_shield",
+                                "action": action, "valid": valid}, log)
+    current = 0
+    result = None
+    while result is None:
+        player, opponent = players[current], players[1 - current]
+        action = await seats[current].choose(player, opponent, "turn", move)
+        move += 1
+        log = EventLog() if wants_events else NULL_LOG
+        turns_before = player.turns_played
+        play_action(player, opponent, action, log)
+        valid = player.turns_played != turns_before
+        if not valid:
+            resolve_turn(player, opponent, "0", log)
+        result, _ = check_victory(p1, p2)
+        ending = "knockout"
+        if not result:
+            refill_hand(player, log)
+            if check_turn_limit(p1, p2):
+                result, _ = tournament_result(p1, p2)
+                ending = "turn_limit"
+        await broadcast(seats, {"type": "move", "seat": current + 1, "phase": "turn",
+                                "action": action, "valid": valid}, log)
+        current = 1 - current
+    end = {"type": "end", "game": game_id, "winner": result, "ending": ending,
+           "turns": p1.turns_played + p2.turns_played, "health": [p1.health, p2.health]}
+    for seat in seats:
+        await seat.send(end)
+    return result
+
+class GameServer:
+    def __init__(self, move_timeout=10.0, seed=None, pair_timeout=60.0):
+        self.move_timeout = move_timeout
+        self.pair_timeout = pair_timeout
+        self.rng = random.Random(seed)
+        self.game_ids = itertools.count(1)
+        self.waiting = None  # (seat, future, characters) of a client waiting for a remote opponent
+        self.active = 0
+        self.finished = 0
+
+    async def handle(self, reader, writer):
+        connection = Connection(reader, writer)
+        try:
+            while True:
+                message = await connection.receive()
+                if message is None:
+                    break
+                if message.get("type") == "join":
+                    await self.join(connection, message)
+                else:
+                    await connection.send({"type": "error", "message": "expected join"})
+        finally:
+            writer.close()
+            with suppress(ConnectionError):
+                await writer.wait_closed()
+
+    async def join(self, connection, message):
+        seat = RemoteSeat(connection, self.move_timeout, bool(message.get("events")))
+        characters = parse_characters(message.get("characters"))
+        if characters is False:
+            await connection.send({"type": "error", "message": "invalid characters"})
+            return
+        opponent = message.get("opponent", "random")
+        if opponent == "remote":
+            await self.pair(seat, characters)
+            return
+        policy = POLICIES.get(opponent)
+        if policy is None:
+            await connection.send({"type": "error", "message": f"unknown opponent {opponent!r}"})
+            return
+        bot = BotSeat(policy, random.Random(self.rng.getrandbits(64)))
+        seats = (bot, seat) if message.get("seat") == 2 else (seat, bot)
+        await self.play(seats, characters)
+
+    async def pair(self, seat, characters):
+        loop = asyncio.get_running_loop()
+        if self.waiting is not None and self.waiting[0].connection.closed:
+            self.waiting = None
+        if self.waiting is not None:
+            first, future, wanted = self.waiting
+            if characters is not None and wanted is not None and characters != wanted:
+                await seat.connection.send({"type": "error",
+                                            "message": "characters differ from the waiting player's"})
+                return
+            # Hand this seat to the waiting client's handler, which runs the match
+            # so that each connection keeps a single reader
+            self.waiting = None
+            done = loop.create_future()
+            future.set_result((seat, characters, done))
+            await done
+            return
+        future = loop.create_future()
+        self.waiting = (seat, future, characters)
+        connection = seat.connection
+        deadline = loop.time() + self.pair_timeout
+        watch = asyncio.ensure_future(connection.receive())
+        try:
+            while not future.done():
+                remaining = deadline - loop.time()
+                if remaining <= 0:
+                    await connection.send({"type": "error", "message": "no opponent joined"})
+                    return
+                await asyncio.wait((future, watch), timeout=remaining,
+                                   return_when=asyncio.FIRST_COMPLETED)
+                if future.done():
+                    break
+                if watch.done():
+                    if watch.result() is None:
+                        return  # disconnected while waiting
+                    await connection.send({"type": "error", "message": "waiting for an opponent"})
+                    watch = asyncio.ensure_future(connection.receive())
+        finally:
+            if self.waiting is not None and self.waiting[1] is future:
+                self.waiting = None
+            if not watch.done():
+                watch.cancel()
+                with suppress(asyncio.CancelledError):
+                    await watch
+        second, second_characters, done = future.result()
+        if characters is None:
+            characters = second_characters
+        try:
+            await self.play((seat, second), characters)
+        finally:
+            done.set_result(None)
+
+    async def play(self, seats, characters=None):
+        self.active += 1
+        try:
+            # Matches interleave, so each deals from its own stream
+            rng = random.Random(self.rng.getrandbits(64))
+            return await run_match(next(self.game_ids), seats, characters, rng)
+        finally:
+            self.active -= 1
+            self.finished += 1
+
+async def serve(host="127.0.0.1", port=8765, unix_path=None, move_timeout=10.0, seed=None,
+                pair_timeout=60.0):
+    state = GameServer(move_timeout, seed, pair_timeout)
+    if unix_path:
+        server = await asyncio.start_unix_server(state.handle, path=unix_path, limit=MAX_LINE)
+    else:
+        server = await asyncio.start_server(state.handle, host, port, limit=MAX_LINE)
+    async with server:
+        await server.serve_forever()
+
+def main():
+    parser = argparse.ArgumentParser(description="Host Disfida matches over TCP or a Unix socket")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--unix", metavar="PATH", help="listen on a Unix socket instead of TCP")
+    parser.add_argument("--move-timeout", type=float, default=10.0,
+                        help="seconds before a missing move is played as a skip")
+    parser.add_argument("--pair-timeout", type=float, default=60.0,
+                        help="seconds a remote join waits for an opponent")
+    parser.add_argument("--seed", type=int, default=None)
+    args = parser.parse_args()
+    try:
+        asyncio.run(serve(args.host, args.port, args.unix, args.move_timeout, args.seed,
+                          args.pair_timeout))
+    except KeyboardInterrupt:
+        pass
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,222 @@
+# game_stats.py
+# Streaming statistics over simulation results in constant memory. GameStats
+# folds in one play_game() result at a time and keeps, per character pairing,
+# win/tie/loss counts, the knockout/turn-limit split, running mean and
+# variance of both players' final HP (Welford) and a game-length histogram
+# bounded by the turn limit, plus card play/special counts over all games.
+# Aggregators from worker processes merge exactly (Chan et al.), and to_dict()
+# is plain JSON for checkpoints.
+import argparse
+import json
+import math
+import os
+import card_game_logic
+from compact import NUMERIC_CARDS, card_name
+
+class RunningStat:
+    __slots__ = ("n", "mean", "m2")
+
+    def __init__(self, n=0, mean=0.0, m2=0.0):
+        self.n = n
+        self.mean = mean
+        self.m2 = m2  # sum of squared deviations from the mean
+
+    def add(self, x):
+        self.n += 1
+        delta = x - self.mean
+        self.mean += delta / self.n
+        self.m2 += delta * (x - self.mean)
+
+    def merge(self, other):
+        if not other.n:
+            return
+        n = self.n + other.n
+        delta = other.mean - self.mean
+        self.mean += delta * other.n / n
+        self.m2 += other.m2 + delta * delta * self.n * other.n / n
+        self.n = n
+
+    @property
+    def variance(self):
+        # Sample variance
+        return self.m2 / (self.n - 1) if self.n > 1 else 0.0
+
+    @property
+    def stdev(self):
+        return math.sqrt(self.variance)
+
+    def to_list(self):
+        return [self.n, self.mean, self.m2]
+
+class PairingStats:
+    __slots__ = ("games", "p1", "p2", "tie", "knockout", "turn_limit", "tiebreak", "p1_health",
+                 "p2_health", "turns")
+
+    def __init__(self, max_turns):
+        self.games = self.p1 = self.p2 = self.tie = 0
+        self.knockout = self.turn_limit = self.tiebreak = 0
+        self.p1_health = RunningStat()
+        self.p2_health = RunningStat()
+        # turns[k]: games that ended after k turns in total
+        self.turns = [0] * (2 * max_turns + 1)
+
+    def add(self, result):
+        self.games += 1
+        winner = result["winner"]
+        if winner == "p1":
+            self.p1 += 1
+        elif winner == "p2":
+            self.p2 += 1
+        else:
+            self.tie += 1
+        if result["ending"] == "knockout":
+            self.knockout += 1
+        else:
+            self.turn_limit += 1
+        self.tiebreak += result["tiebreak"]
+        self.p1_health.add(result["p1_health"])
+        self.p2_health.add(result["p2_health"])
+        self.turns[min(result["turns"], len(self.turns) - 1)] += 1
+
+    def merge(self, other):
+        for name in ("games", "p1", "p2", "tie", "knockout", "turn_limit", "tiebreak"):
+            setattr(self, name, getattr(self, name) + getattr(other, name))
+        self.p1_health.merge(other.p1_health)
+        self.p2_health.merge(other.p2_health)
+        for k, n in enumerate(other.turns):
+            self.turns[k] += n
+
+    def mean_turns(self):
+        return sum(k * n for k, n in enumerate(self.turns)) / max(self.games, 1)
+
+    def turns_percentile(self, q):
+        target = q * self.games
+        seen = 0
+        for k, n in enumerate(self.turns):
+            seen += n
+            if n and seen >= target:
+                return k
+        return 0
+
+    def to_dict(self):
+        data = {name: getattr(self, name) for name in
+                ("games", "p1", "p2", "tie", "knockout", "turn_limit", "tiebreak")}
+        data["p1_health"] = self.p1_health.to_list()
+        data["p2_health"] = self.p2_health.to_list()
+        data["turns"] = list(self.turns)
+        return data
+
+    @classmethod
+    def from_dict(cls, data):
+        stats = cls(len(data["turns"]) // 2)
+        for name in ("games", "p1", "p2", "tie", "knockout", "turn_limit", "tiebreak"):
+            setattr(stats, name, data[name])
+        stats.p1_health = RunningStat(*data["p1_health"])
+        stats.p2_health = RunningStat(*data["p2_health"])
+        stats.turns = list(data["turns"])
+        return stats
+
+def pairing_key(characters):
+    # ((face, suit), (face, suit)) -> "Fante Denari vs Re Spade"
+    (f1, s1), (f2, s2) = characters
+    return f"{f1} {s1} vs {f2} {s2}"
+
+class GameStats:
+    def __init__(self, max_turns=None):
+        # max_turns defaults to the turn limit of the rules in force
+        self.max_turns = card_game_logic.RULES.max_player_turns if max_turns is None else max_turns
+        self.pairings = {}
+        # Indexed by card id
+        self.played = [0] * 40
+        self.special = [0] * 40
+
+    @property
+    def games(self):
+        return sum(p.games for p in self.pairings.values())
+
+    def add(self, result):
+        # result: a play_game() dict; "cards" is only there with track_cards=True
+        key = pairing_key(result["characters"])
+        pairing = self.pairings.get(key)
+        if pairing is None:
+            pairing = self.pairings[key] = PairingStats(self.max_turns)
+        pairing.add(result)
+        for cid, special in result.get("cards", ()):
+            self.played[cid] += 1
+            self.special[cid] += special
+
+    def merge(self, other):
+        if other.max_turns != self.max_turns:
+            raise ValueError(f"Cannot merge stats for {other.max_turns}-turn games into "
+                             f"{self.max_turns}-turn games")
+        for key, pairing in other.pairings.items():
+            mine = self.pairings.get(key)
+            if mine is None:
+                mine = self.pairings[key] = PairingStats(self.max_turns)
+            mine.merge(pairing)
+        for cid in range(40):
+            self.played[cid] += other.played[cid]
+            self.special[cid] += other.special[cid]
+
+    def to_dict(self):
+        return {
+            "max_turns": self.max_turns,
+            "pairings": {key: p.to_dict() for key, p in sorted(self.pairings.items())},
+            "cards": {"played": self.played, "special": self.special},
+        }
+
+    @classmethod
+    def from_dict(cls, data):
+        stats = cls(data["max_turns"])
+        stats.pairings = {key: PairingStats.from_dict(p) for key, p in data["pairings"].items()}
+        stats.played = list(data["cards"]["played"])
+        stats.special = list(data["cards"]["special"])
+        return stats
+
+    def save(self, path):
+        # Written to a temporary file first so an interrupted run keeps the old checkpoint
+        tmp = f"{path}.tmp"
+        with open(tmp, "w") as f:
+            json.dump(self.to_dict(), f)
+        os.replace(tmp, path)
+
+    @classmethod
+    def load(cls, path):
+        with open(path) as f:
+            return cls.from_dict(json.load(f))
+
+    def summary(self):
+        lines = [f"{'pairing':<34} {'games':>8} {'P1 win':>7} {'tie':>6} {'P2 win':>7} {'KO':>6} "
+                 f"{'P1 HP':>12} {'P2 HP':>12} {'turns':>6} {'p90':>4}"]
+        for key in sorted(self.pairings):
+            p = self.pairings[key]
+            games = max(p.games, 1)
+            lines.append(
+                f"{key:<34} {p.games:>8} {100 * p.p1 / games:>6.1f}% {100 * p.tie / games:>5.1f}% "
+                f"{100 * p.p2 / games:>6.1f}% {100 * p.knockout / games:>5.1f}% "
+                f"{p.p1_health.mean:>6.1f}+-{p.p1_health.stdev:<4.1f} "
+                f"{p.p2_health.mean:>6.1f}+-{p.p2_health.stdev:<4.1f} "
+                f"{p.mean_turns():>6.1f} {p.turns_percentile(0.9):>4}")
+        if any(self.played):
+            games = max(self.games, 1)
+            lines.append(f"{'card':<16} {'played':>10} {'per game':>9} {'special':>10} {'special %':>10}")
+            for cid in NUMERIC_CARDS:
+                played, special = self.played[cid], self.special[cid]
+                lines.append(f"{card_name(cid):<16} {played:>10} {played / games:>9.2f} {special:>10} "
+                             f"{100 * special / max(played, 1):>9.1f}%")
+        return "\n".join(lines)
+
+def main():
+    parser = argparse.ArgumentParser(description="Merge and summarize simulation.py --stats checkpoints")
+    parser.add_argument("paths", nargs="+")
+    parser.add_argument("--out", metavar="PATH", help="write the merged statistics here")
+    args = parser.parse_args()
+    stats = GameStats.load(args.paths[0])
+    for path in args.paths[1:]:
+        stats.merge(GameStats.load(path))
+    print(stats.summary())
+    if args.out:
+        stats.save(args.out)
+
+if __name__ == "__main__":
+    main()
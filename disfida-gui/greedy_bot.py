@@ -0,0 +1,60 @@
+# greedy_bot.py
+# One-ply player: every legal action is scored by its immediate outcome
+# (health swing, defense built and shields broken) looked up in an
+# OutcomeCache, and the best one is played, ties broken by the rng. Bots
+# share outcome_cache.SHARED unless given their own cache.
+from legal_moves import legal_action_list, legal_pre_shield_actions
+from outcome_cache import SHARED
+
+WIN = 1000.0
+
+def strongest_pre_shield(player):
+    options = [a for a in legal_pre_shield_actions(player) if a]
+    if not options:
+        return ()
+    return max(options, key=lambda a: player.hand[a[0][0]].value)
+
+class GreedyBot:
+    def __init__(self, cache=None, shield_weight=0.5, break_weight=0.5):
+        self.cache = SHARED if cache is None else cache
+        self.shield_weight = shield_weight  # per point of defense added to own shields
+        self.break_weight = break_weight  # per point of opponent defense destroyed
+
+    def score(self, player, opponent, action):
+        outcome = self.cache.outcome(player, opponent, action)
+        if not outcome.valid:
+            return None
+        health = player.health + outcome.health
+        opp_health = opponent.health + outcome.opp_health
+        if opp_health <= 0:
+            return WIN if health > 0 else 0.0
+        if health <= 0:
+            return -WIN
+        broken = 0
+        if outcome.consumed:
+            bonus = opponent.character.defense_bonus
+            broken = sum(value + bonus for value in opponent.shields.values()[:outcome.consumed])
+        return (outcome.health - outcome.opp_health + self.shield_weight * outcome.shield_gain
+                + self.break_weight * broken)
+
+    def __call__(self, player, opponent, phase, rng=None):
+        if phase == "pre_shield":
+            return strongest_pre_shield(player)
+        best_score, best = None, []
+        for action in legal_action_list(player):
+            score = self.score(player, opponent, action)
+            if score is None:
+                continue
+            if best_score is None or score > best_score:
+                best_score, best = score, [action]
+            elif score == best_score:
+                best.append(action)
+        if not best:
+            return ()
+        return rng.choice(best) if rng is not None else best[0]
+
+GREEDY = GreedyBot()
+
+def greedy_policy(player, opponent, phase, rng):
+    # Module-level function so simulation workers pickle it by name
+    return GREEDY(player, opponent, phase, rng)
@@ -0,0 +1,86 @@
+# legal_moves.py
+# Legal action generation from tables precomputed per (character suit, hand
+# signature). The signature packs the suit of every hand slot plus the hand
+# length, so two hands with the same suit layout share one table entry.
+from itertools import permutations
+from card_game_logic import SUITS
+
+DENARI, COPPE, SPADE, BASTONI = range(4)
+
+_TABLES = {}
+
+def hand_signature(hand):
+    signature = len(hand) << 10
+    for i, card in enumerate(hand):
+        signature |= (card.id // 10) << (2 * i)
+    return signature
+
+def card_modes(char_suit, suit, idx):
+    # (idx, special, as_shield) variants. A Bastoni special played as an
+    # attack resolves exactly like the plain attack, so only the shield
+    # variant is listed for it.
+    modes = [(idx, False, False)]
+    if char_suit == SPADE and suit == COPPE:
+        modes.append((idx, True, False))  # Blood Price
+    elif char_suit == COPPE and suit == SPADE:
+        modes.append((idx, True, False))  # Charity's Burden
+    elif char_suit == BASTONI and suit == BASTONI:
+        modes.append((idx, True, True))  # Iron Versatility shield
+    return modes
+
+def _expand(char_suit, suits, order):
+    # Every special/shield combination for one ordering of hand indices
+    actions = [()]
+    for idx in order:
+        actions = [a + (m,) for a in actions for m in card_modes(char_suit, suits[idx], idx)]
+    return actions
+
+def build_table(char_suit, suits):
+    actions = [()]
+    suited = [i for i, s in enumerate(suits) if s == char_suit]
+    for last in range(len(suits)):
+        others = [i for i in suited if i != last]
+        for k in range(len(others) + 1):
+            for prefix in permutations(others, k):
+                actions.extend(_expand(char_suit, suits, prefix + (last,)))
+    return tuple(actions)
+
+def table_for(char_suit, signature):
+    key = (char_suit, signature)
+    table = _TABLES.get(key)
+    if table is None:
+        length = signature >> 10
+        suits = [(signature >> (2 * i)) & 3 for i in range(length)]
+        table = _TABLES[key] = build_table(char_suit, suits)
+    return table
+
+def precompute_tables(max_hand=5):
+    # Fill the whole table up front, e.g. once per worker process
+    for char_suit in range(4):
+        for length in range(max_hand + 1):
+            for digits in range(4 ** length):
+                table_for(char_suit, (length << 10) | _spread(digits, length))
+
+def _spread(digits, length):
+    signature = 0
+    for i in range(length):
+        signature |= (digits % 4) << (2 * i)
+        digits //= 4
+    return signature
+
+def legal_actions(player):
+    # Skip, every single card and every combo ordering with its special flags
+    char_suit = SUITS.index(player.character.suit)
+    yield from table_for(char_suit, hand_signature(player.hand))
+
+def legal_action_list(player):
+    return table_for(SUITS.index(player.character.suit), hand_signature(player.hand))
+
+def legal_pre_shield_actions(player):
+    yield ()
+    bastoni = player.character.suit == "Bastoni"
+    for i, card in enumerate(player.hand):
+        if card.suit == "Denari":
+            yield ((i, False, False),)
+        elif bastoni and card.suit == "Bastoni":
+            yield ((i, True, True),)
@@ -1,8 +1,39 @@
 # main.py
+import argparse
 import tkinter as tk
 from card_game_gui import CardGameGUI
 
+def build_opponent(args):
+    if args.opponent == "mcts":
+        from mcts_bot import MCTSBot
+        return MCTSBot(time_limit=args.think_time, processes=args.processes)
+    if args.opponent == "random":
+        from simulation import random_policy
+        return random_policy
+    if args.opponent == "bot":
+        from bot_pool import BotPool
+        return BotPool(args.bot, deadline=args.bot_deadline)
+    return None
+
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Disfida GUI")
+    parser.add_argument("--opponent", choices=["human", "random", "mcts", "bot"], default="human",
+                        help="who plays Player 2")
+    parser.add_argument("--think-time", type=float, default=1.0, help="MCTS seconds per move")
+    parser.add_argument("--processes", type=int, default=1, help="MCTS root-parallel workers")
+    parser.add_argument("--bot", default="random", help="bot plugin for --opponent bot (module:Class)")
+    parser.add_argument("--bot-deadline", type=float, default=1.0, help="bot seconds per move")
+    parser.add_argument("--replay", metavar="PATH", help="browse a game from a replay file instead of playing")
+    parser.add_argument("--game", type=int, default=0, help="index of the game in --replay")
+    parser.add_argument("--keyframe-interval", type=int, default=8, help="replay moves between full-state keyframes")
+    args = parser.parse_args()
+    replay = None
+    if args.replay:
+        from replay_timeline import ReplayTimeline, load_record
+        replay = ReplayTimeline(load_record(args.replay, args.game), args.keyframe_interval)
+    opponent = build_opponent(args) if replay is None else None
     root = tk.Tk()
-    app = CardGameGUI(root)
+    app = CardGameGUI(root, opponent=opponent, replay=replay)
     root.mainloop()
+    if hasattr(opponent, "close"):
+        opponent.close()
@@ -0,0 +1,175 @@
+# mcts_bot.py
+# Information-set MCTS player. Hidden cards (opponent hand, both stacks) are
+# re-dealt at random for every iteration; with processes > 1 each worker
+# searches independently and the root visit counts are merged.
+import math
+import random
+import time
+from multiprocessing import Pool
+from card_game_logic import CardZone, check_victory, check_turn_limit, tournament_result
+from compact import CARDS, NUMERIC_CARDS
+from endgame import EndgameSolver
+from legal_moves import legal_action_list, legal_pre_shield_actions
+from search_state import clone_player, make_move
+from simulation import random_policy
+
+ROLLOUT_TURN_CAP = 200  # safety stop for rollouts without a turn limit
+
+class Node:
+    __slots__ = ("children", "visits", "reward", "avail", "root_move")
+
+    def __init__(self, root_move):
+        self.children = {}
+        self.visits = 0
+        self.reward = 0.0
+        self.avail = 1
+        self.root_move = root_move  # True if the searching player made this move
+
+def determinize(player, opponent, rng):
+    known = {c.id for c in player.hand}
+    known.update(c.id for c in player.shields)
+    known.update(c.id for c in opponent.shields)
+    pool = [CARDS[cid] for cid in NUMERIC_CARDS if cid not in known]
+    rng.shuffle(pool)
+    me = clone_player(player)
+    them = clone_player(opponent)
+    a = len(opponent.hand)
+    b = a + len(opponent.stack)
+    them.hand = CardZone(pool[:a])
+    them.stack = CardZone(pool[a:b])
+    me.stack = CardZone(pool[b:b + len(player.stack)])
+    return me, them
+
+def outcome(p1, p2, turn_limit):
+    result, _ = check_victory(p1, p2)
+    if result:
+        return result
+    if turn_limit and check_turn_limit(p1, p2):
+        return tournament_result(p1, p2)[0]
+    return None
+
+def score_for(result, first):
+    if result == "tie":
+        return 0.5
+    return 1.0 if (result == "p1") == first else 0.0
+
+def search(player, opponent, iterations=None, time_limit=1.0, exploration=1.4,
+           turn_limit=True, seed=None):
+    # Returns {action: (visits, reward)} for the root's children
+    rng = random.Random(seed)
+    # Player 1 moves when both have played the same number of turns
+    first = player.turns_played == opponent.turns_played
+    root = Node(False)
+    deadline = time.perf_counter() + time_limit if time_limit else None
+    done = 0
+    while (iterations is None or done < iterations) and (deadline is None or time.perf_counter() < deadline):
+        me, them = determinize(player, opponent, rng)
+        p1, p2 = (me, them) if first else (them, me)
+        node = root
+        path = []
+        current, other = me, them
+        root_move = True
+        result = None
+        turns = 0
+        while result is None:
+            legal = legal_action_list(current)
+            children = node.children
+            untried = []
+            for action in legal:
+                child = children.get(action)
+                if child is None:
+                    untried.append(action)
+                else:
+                    child.avail += 1
+            expanded = bool(untried)
+            if expanded:
+                action = rng.choice(untried)
+                child = children[action] = Node(root_move)
+            else:
+                action = max(legal, key=lambda a: children[a].reward / children[a].visits +
+                             exploration * math.sqrt(math.log(children[a].avail) / children[a].visits))
+                child = children[action]
+            make_move(current, other, action)
+            path.append(child)
+            node = child
+            result = outcome(p1, p2, turn_limit)
+            current, other = other, current
+            root_move = not root_move
+            turns += 1
+            if expanded:
+                break
+        while result is None and turns < ROLLOUT_TURN_CAP:
+            delta = make_move(current, other, random_policy(current, other, "turn", rng))
+            if not delta.valid:
+                make_move(current, other, ())
+            result = outcome(p1, p2, turn_limit)
+            current, other = other, current
+            turns += 1
+        score = score_for(result, first) if result else 0.5
+        for child in path:
+            child.visits += 1
+            child.reward += score if child.root_move else 1.0 - score
+        root.visits += 1
+        done += 1
+    return {action: (child.visits, child.reward) for action, child in root.children.items()}
+
+def _search_worker(args):
+    return search(*args)
+
+def best_pre_shield(player):
+    # Not searched: open with the strongest available shield
+    options = [a for a in legal_pre_shield_actions(player) if a]
+    if not options:
+        return ()
+    return max(options, key=lambda a: player.hand[a[0][0]].value)
+
+class MCTSBot:
+    def __init__(self, iterations=None, time_limit=1.0, processes=1, exploration=1.4,
+                 turn_limit=True, seed=None, endgame_threshold=0):
+        self.iterations = iterations
+        self.time_limit = time_limit
+        self.processes = processes
+        self.exploration = exploration
+        self.turn_limit = turn_limit
+        self.rng = random.Random(seed)
+        self._pool = None
+        # Exact play for the last few turns (needs the turn limit)
+        self.endgame = EndgameSolver(endgame_threshold) if endgame_threshold and turn_limit else None
+
+    def __call__(self, player, opponent, phase, rng=None):
+        # Same signature as the simulation policies
+        if phase == "pre_shield":
+            return best_pre_shield(player)
+        return self.choose_action(player, opponent)
+
+    def choose_action(self, player, opponent):
+        legal = legal_action_list(player)
+        if len(legal) == 1:
+            return legal[0]
+        if self.endgame is not None and self.endgame.active(player, opponent):
+            # The solver treats hands as known, so it only sees a sampled opponent
+            me, them = determinize(player, opponent, self.rng)
+            return self.endgame.best_action(me, them)
+        stats = {}
+        if self.processes > 1:
+            if self._pool is None:
+                self._pool = Pool(self.processes)
+            jobs = [(player, opponent, self.iterations, self.time_limit, self.exploration,
+                     self.turn_limit, self.rng.getrandbits(64)) for _ in range(self.processes)]
+            results = self._pool.map(_search_worker, jobs)
+        else:
+            results = [search(player, opponent, self.iterations, self.time_limit, self.exploration,
+                              self.turn_limit, self.rng.getrandbits(64))]
+        for result in results:
+            for action, (visits, reward) in result.items():
+                total = stats.get(action, (0, 0.0))
+                stats[action] = (total[0] + visits, total[1] + reward)
+        if not stats:
+            return legal[0]
+        return max(stats, key=lambda a: stats[a][0])
+
+    def close(self):
+        if self._pool is not None:
+            self._pool.close()
+            self._pool.join()
+            self._pool = None
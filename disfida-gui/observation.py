@@ -0,0 +1,52 @@
+# observation.py
+# The view of a game one seat is allowed to see, as plain JSON-friendly data,
+# and the way back to card_game_logic players for policies that need them.
+from card_game_logic import Character, Player
+from compact import CARDS
+
+def observe(player, opponent, phase=None):
+    # What a seat may see: its own hand, both shield rows and zone sizes
+    observation = {
+        "character": [player.character.face, player.character.suit],
+        "hand": [card.id for card in player.hand],
+        "shields": [card.id for card in player.shields],
+        "stack": len(player.stack),
+        "health": player.health,
+        "turns": player.turns_played,
+        "opponent": {
+            "character": [opponent.character.face, opponent.character.suit],
+            "hand": len(opponent.hand),
+            "shields": [card.id for card in opponent.shields],
+            "stack": len(opponent.stack),
+            "health": opponent.health,
+            "turns": opponent.turns_played,
+        },
+    }
+    if phase is not None:
+        observation["phase"] = phase
+    return observation
+
+def parse_action(raw):
+    # [[hand_index, special, as_shield], ...] -> action tuple, or None
+    try:
+        action = tuple((int(idx), bool(special), bool(as_shield)) for idx, special, as_shield in raw)
+    except (TypeError, ValueError):
+        return None
+    if any(not 0 <= idx < 8 for idx, _, _ in action):
+        return None
+    return action
+
+def players_from_state(state):
+    # Rebuild card_game_logic players from an observation. Hidden zones
+    # (both stacks, the opponent's hand) are left empty.
+    other = state["opponent"]
+    player = Player("You", Character(*state["character"]), [])
+    player.hand.extend(CARDS[cid] for cid in state["hand"])
+    player.shields.reset(CARDS[cid] for cid in state["shields"])
+    player.health = state["health"]
+    player.turns_played = state["turns"]
+    opponent = Player("Opponent", Character(*other["character"]), [])
+    opponent.shields.reset(CARDS[cid] for cid in other["shields"])
+    opponent.health = other["health"]
+    opponent.turns_played = other["turns"]
+    return player, opponent
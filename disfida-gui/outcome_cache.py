@@ -0,0 +1,98 @@
+# outcome_cache.py
+# Memoized turn outcomes for one-ply search. What a turn does depends only on
+# the cards played with their special and Bastoni flags, the mover's
+# character, the opponent's shield values and defense bonus and both health
+# totals (healing is capped), so outcomes are cached under that key rather
+# than hand indices. Shields are always consumed weakest first, so an outcome
+# records how many were used; the actual cards are opponent.shields[:consumed]
+# in any position with the same key.
+from collections import OrderedDict
+import card_game_logic
+from search_state import make_move, unmake_move
+
+class TurnOutcome:
+    __slots__ = ("valid", "health", "opp_health", "consumed", "shield_gain")
+
+    def __init__(self, valid, health=0, opp_health=0, consumed=0, shield_gain=0):
+        self.valid = valid  # False: the engine rejects the action (played as a skip)
+        self.health = health  # change to the mover's health
+        self.opp_health = opp_health  # change to the opponent's health
+        self.consumed = consumed  # opponent shields used up, weakest first
+        self.shield_gain = shield_gain  # effective defense added to the mover's shields
+
+    def __repr__(self):
+        return (f"TurnOutcome(valid={self.valid}, health={self.health:+d}, opp_health={self.opp_health:+d}, "
+                f"consumed={self.consumed}, shield_gain={self.shield_gain})")
+
+def outcome_key(player, opponent, action):
+    character = player.character
+    hand = player.hand
+    # as_shield only matters for a special Bastoni card
+    played = tuple((hand[idx].id, special, special and as_shield) for idx, special, as_shield in action)
+    # A health total is only part of the key when the healing cap could bind;
+    # the sums bound what the action could heal either player
+    rules = card_game_logic.RULES
+    total = sum(hand[idx].value for idx, _, _ in action)
+    health = opp_health = None
+    if player.health + total + len(action) * character.heal_bonus > rules.health:
+        health = player.health
+    if opponent.health + total // rules.charity_divisor > rules.health:
+        opp_health = opponent.health
+    return (character.face, character.suit, played, opponent.character.defense_bonus,
+            opponent.shields.values(), health, opp_health)
+
+def compute_outcome(player, opponent, action):
+    # Plays the action on the real players and rolls it back
+    shields_before = player.shields.total_defense()
+    delta = make_move(player, opponent, action, refill=False)
+    if not delta.valid:
+        unmake_move(delta)
+        return TurnOutcome(False)
+    outcome = TurnOutcome(True, player.health - delta.health, opponent.health - delta.opp_health,
+                          len(delta.opp_shields) - len(opponent.shields),
+                          player.shields.total_defense() - shields_before)
+    unmake_move(delta)
+    return outcome
+
+class OutcomeCache:
+    # Least recently used outcomes are evicted beyond `capacity` entries. The
+    # cache empties itself when card_game_logic.RULES is replaced.
+    def __init__(self, capacity=1 << 16):
+        self.capacity = capacity
+        self.entries = OrderedDict()
+        self.rules = card_game_logic.RULES
+        self.hits = 0
+        self.misses = 0
+
+    def outcome(self, player, opponent, action):
+        if not action:
+            return TurnOutcome(True)
+        if card_game_logic.RULES is not self.rules:
+            self.clear()
+            self.rules = card_game_logic.RULES
+        key = outcome_key(player, opponent, action)
+        entries = self.entries
+        outcome = entries.get(key)
+        if outcome is not None:
+            entries.move_to_end(key)
+            self.hits += 1
+            return outcome
+        self.misses += 1
+        outcome = entries[key] = compute_outcome(player, opponent, action)
+        if len(entries) > self.capacity:
+            entries.popitem(last=False)
+        return outcome
+
+    def hit_rate(self):
+        return self.hits / max(self.hits + self.misses, 1)
+
+    def __len__(self):
+        return len(self.entries)
+
+    def clear(self):
+        self.entries.clear()
+        self.hits = 0
+        self.misses = 0
+
+# One cache per process, shared by every bot that does not bring its own
+SHARED = OutcomeCache()
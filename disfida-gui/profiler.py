@@ -0,0 +1,81 @@
+# profiler.py
+# Opt-in instrumentation for the rules engine. Assign a Profiler to
+# card_game_logic.PROFILER and the engine counts turns, draws, consumed
+# shields, specials and rejected inputs; simulation.play_game also times its
+# pre-shield, resolve, refill and victory-check phases and the policies. With
+# PROFILER left at None every hook is a single "is not None" test.
+import json
+import os
+import time
+
+PHASES = ("policy", "pre_shield", "resolve", "refill", "victory")
+
+class Profiler:
+    def __init__(self, trace_games=0):
+        self.counters = {}
+        self.timers = {}  # phase -> [calls, nanoseconds]
+        self.games = 0
+        self.trace_games = trace_games  # games with index below this go into the trace
+        self.events = []
+        self.game = 0
+        self.tracing = False
+        self.pid = os.getpid()
+
+    def count(self, name, n=1):
+        self.counters[name] = self.counters.get(name, 0) + n
+
+    def start_game(self, game=None):
+        # game: index used as the trace track; defaults to games seen so far
+        self.game = self.games if game is None else game
+        self.games += 1
+        self.tracing = self.game < self.trace_games
+        if self.tracing:
+            self.events.append({"name": "thread_name", "ph": "M", "pid": self.pid, "tid": self.game,
+                                "args": {"name": f"game {self.game}"}})
+
+    def end(self, phase, start):
+        # start: time.perf_counter_ns() taken when the phase began. The clock is
+        # system-wide on Linux, so traces from worker processes line up
+        now = time.perf_counter_ns()
+        timer = self.timers.get(phase)
+        if timer is None:
+            timer = self.timers[phase] = [0, 0]
+        timer[0] += 1
+        timer[1] += now - start
+        if self.tracing:
+            self.events.append({"name": phase, "ph": "X", "ts": start / 1000,
+                                "dur": (now - start) / 1000, "pid": self.pid, "tid": self.game})
+
+    def to_dict(self):
+        return {"games": self.games, "counters": self.counters, "timers": self.timers,
+                "events": self.events}
+
+    def merge(self, data):
+        # Adds a to_dict() from another process
+        self.games += data["games"]
+        for name, n in data["counters"].items():
+            self.count(name, n)
+        for phase, (calls, ns) in data["timers"].items():
+            timer = self.timers.setdefault(phase, [0, 0])
+            timer[0] += calls
+            timer[1] += ns
+        self.events.extend(data["events"])
+
+    def summary(self):
+        games = max(self.games, 1)
+        total = sum(ns for _, ns in self.timers.values()) or 1
+        lines = [f"{'phase':<12} {'calls':>10} {'total ms':>10} {'mean us':>9} {'share':>7}"]
+        for phase in sorted(self.timers, key=lambda p: PHASES.index(p) if p in PHASES else len(PHASES)):
+            calls, ns = self.timers[phase]
+            lines.append(f"{phase:<12} {calls:>10} {ns / 1e6:>10.1f} {ns / 1e3 / max(calls, 1):>9.2f} "
+                         f"{100 * ns / total:>6.1f}%")
+        lines.append(f"{'counter':<20} {'total':>10} {'per game':>9}")
+        for name in sorted(self.counters):
+            n = self.counters[name]
+            lines.append(f"{name:<20} {n:>10} {n / games:>9.2f}")
+        return "\n".join(lines)
+
+    def write_trace(self, path):
+        # Chrome trace-event JSON (chrome://tracing or Perfetto); one track per game
+        with open(path, "w") as f:
+            json.dump({"traceEvents": self.events, "displayTimeUnit": "ms"}, f)
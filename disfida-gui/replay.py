@@ -0,0 +1,203 @@
+# replay.py
+# Compact binary game records. A file is a header (MAGIC + version byte)
+# followed by games; a game is the deal seed (varint), the action count
+# (varint), one record per chosen action and a CRC32 of the final state.
+# An action record is a count byte and then one byte per card: hand index in
+# bits 0-2, special in bit 3 and the Bastoni shield choice in bit 4.
+# Pre-shield picks are the first two actions of every game.
+import argparse
+import os
+import random
+import struct
+import zlib
+
+MAGIC = b"DSFR"
+VERSION = 1
+HEADER = MAGIC + bytes([VERSION])
+READ_SIZE = 1 << 16
+
+class TruncatedReplay(ValueError):
+    pass
+
+def write_varint(out, value):
+    while value >= 0x80:
+        out.append((value & 0x7F) | 0x80)
+        value >>= 7
+    out.append(value)
+
+def read_varint(data, pos):
+    value = 0
+    shift = 0
+    while True:
+        if pos >= len(data):
+            raise TruncatedReplay("Replay ends inside a varint")
+        byte = data[pos]
+        pos += 1
+        value |= (byte & 0x7F) << shift
+        if byte < 0x80:
+            return value, pos
+        shift += 7
+
+def encode_action(out, action):
+    out.append(len(action))
+    for idx, special, as_shield in action:
+        out.append(idx | (special << 3) | (as_shield << 4))
+
+def decode_action(data, pos):
+    if pos >= len(data) or pos + data[pos] >= len(data):
+        raise TruncatedReplay("Replay ends inside an action")
+    count = data[pos]
+    cards = data[pos + 1:pos + 1 + count]
+    action = tuple((b & 7, bool(b & 8), bool(b & 16)) for b in cards)
+    return action, pos + 1 + count
+
+def state_checksum(p1, p2):
+    state = bytearray()
+    for player in (p1, p2):
+        # Health can dip below zero on the killing blow
+        state += bytes([player.health + 128, player.turns_played])
+        for zone in (player.hand, player.stack, player.shields):
+            state.append(len(zone))
+            state += bytes(card.id for card in zone)
+    return zlib.crc32(state)
+
+class GameRecord:
+    __slots__ = ("seed", "actions", "checksum")
+
+    def __init__(self, seed, actions=None, checksum=None):
+        self.seed = seed
+        self.actions = [] if actions is None else actions
+        self.checksum = checksum
+
+    def track(self, policy):
+        # Wrap a policy so every action it chooses is recorded
+        def recorded(player, opponent, phase, rng):
+            action = policy(player, opponent, phase, rng)
+            self.actions.append(action)
+            return action
+        return recorded
+
+    def finish(self, p1, p2):
+        self.checksum = state_checksum(p1, p2)
+
+    def encode(self, out=None):
+        out = bytearray() if out is None else out
+        write_varint(out, self.seed)
+        write_varint(out, len(self.actions))
+        for action in self.actions:
+            encode_action(out, action)
+        out += struct.pack("<I", self.checksum)
+        return out
+
+def decode_game(data, pos):
+    seed, pos = read_varint(data, pos)
+    count, pos = read_varint(data, pos)
+    actions = []
+    for _ in range(count):
+        action, pos = decode_action(data, pos)
+        actions.append(action)
+    if pos + 4 > len(data):
+        raise TruncatedReplay("Replay ends inside a checksum")
+    checksum, = struct.unpack_from("<I", data, pos)
+    return GameRecord(seed, actions, checksum), pos + 4
+
+def _read_header(f, path):
+    header = f.read(len(HEADER))
+    if header[:len(MAGIC)] != MAGIC:
+        raise ValueError(f"{path} is not a Disfida replay file")
+    if header[len(MAGIC):] != bytes([VERSION]):
+        raise ValueError(f"{path}: unsupported replay version {header[len(MAGIC):]!r}")
+
+class ReplayWriter:
+    # Appends to an existing file after checking its header
+    def __init__(self, path):
+        self.path = path
+        if os.path.exists(path) and os.path.getsize(path) > 0:
+            with open(path, "rb") as f:
+                _read_header(f, path)
+            self.file = open(path, "ab")
+        else:
+            self.file = open(path, "wb")
+            self.file.write(HEADER)
+        self.games = 0
+
+    def write(self, record):
+        self.file.write(record.encode())
+        self.games += 1
+
+    def write_encoded(self, data, games):
+        # Games already encoded elsewhere, e.g. by a worker process
+        self.file.write(data)
+        self.games += games
+
+    def close(self):
+        self.file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+class ReplayReader:
+    # Streams GameRecords without loading the whole file
+    def __init__(self, path):
+        self.path = path
+
+    def __iter__(self):
+        with open(self.path, "rb") as f:
+            _read_header(f, self.path)
+            data = b""
+            pos = 0
+            while True:
+                try:
+                    record, end = decode_game(data, pos)
+                except TruncatedReplay:
+                    more = f.read(READ_SIZE)
+                    if not more:
+                        if pos < len(data):
+                            raise
+                        return
+                    data = data[pos:] + more
+                    pos = 0
+                    continue
+                pos = end
+                yield record
+
+def replay_game(record):
+    # Re-run the recorded actions; returns (result, replayed record)
+    from simulation import play_game
+    actions = iter(record.actions)
+    def scripted(player, opponent, phase, rng):
+        return next(actions, ())
+    replayed = GameRecord(record.seed)
+    result = play_game(scripted, scripted, random.Random(record.seed), replayed)
+    return result, replayed
+
+def verify_game(record):
+    _, replayed = replay_game(record)
+    return replayed.checksum == record.checksum and replayed.actions == record.actions
+
+def verify_file(path):
+    games = 0
+    failures = []
+    for index, record in enumerate(ReplayReader(path)):
+        games += 1
+        if not verify_game(record):
+            failures.append(index)
+    return games, failures
+
+def main():
+    parser = argparse.ArgumentParser(description="Verify a Disfida replay file")
+    parser.add_argument("path")
+    args = parser.parse_args()
+    games, failures = verify_file(args.path)
+    size = os.path.getsize(args.path)
+    print(f"{games} games, {size} bytes ({size / max(games, 1):.1f} bytes/game)")
+    if failures:
+        print(f"{len(failures)} games failed verification, first at index {failures[0]}")
+        raise SystemExit(1)
+    print("All games verified")
+
+if __name__ == "__main__":
+    main()
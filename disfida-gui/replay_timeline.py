@@ -0,0 +1,82 @@
+# replay_timeline.py
+# Seekable view of one recorded game for the replay viewer. The game is
+# played through once on load, keeping a full-state keyframe every
+# `interval` moves; a seek restores the nearest keyframe at or before the
+# target and re-applies at most interval moves. Move 0 and 1 are the
+# pre-shields of Player 1 and 2, then turns alternate from Player 1, so
+# even moves always belong to Player 1.
+import random
+from card_game_logic import init_game, check_victory, check_turn_limit, refill_hand, tournament_result
+from events import NULL_LOG, EventLog
+from replay import ReplayReader, state_checksum
+from search_state import snapshot, restore
+from simulation import play_pre_shield, play_turn
+
+def load_record(path, index=0):
+    for i, record in enumerate(ReplayReader(path)):
+        if i == index:
+            return record
+    raise IndexError(f"{path} has no game {index}")
+
+class ReplayTimeline:
+    def __init__(self, record, interval=8):
+        self.record = record
+        self.interval = interval
+        self.p1, self.p2, _ = init_game(None, random.Random(record.seed))
+        self.keyframes = [snapshot(self.p1, self.p2)]
+        for move in range(len(record.actions)):
+            self.apply(move)
+            if (move + 1) % interval == 0:
+                self.keyframes.append(snapshot(self.p1, self.p2))
+        # False if the file no longer matches the engine that replays it
+        self.verified = record.checksum is None or state_checksum(self.p1, self.p2) == record.checksum
+        self.position = len(record.actions)
+        self.seek(0)
+
+    def __len__(self):
+        return len(self.record.actions)
+
+    def mover(self, move):
+        return (self.p1, self.p2) if move % 2 == 0 else (self.p2, self.p1)
+
+    def apply(self, move, log=NULL_LOG):
+        player, opponent = self.mover(move)
+        action = self.record.actions[move]
+        if move < 2:
+            play_pre_shield(player, opponent, action, log)
+        else:
+            play_turn(player, opponent, action, log)
+            if check_victory(self.p1, self.p2)[0] is None:
+                refill_hand(player, log)
+        return log
+
+    def seek(self, position):
+        # Returns the events of the move that led to `position`
+        position = max(0, min(position, len(self)))
+        log = EventLog()
+        if position == self.position + 1:
+            self.apply(self.position, log)
+        else:
+            # Land one move short of `position` at worst, so its events are replayed
+            start = max(0, position - 1) // self.interval * self.interval
+            restore(self.keyframes[start // self.interval], self.p1, self.p2)
+            for move in range(start, position):
+                self.apply(move, log if move == position - 1 else NULL_LOG)
+        self.position = position
+        return log
+
+    def step(self, delta):
+        return self.seek(self.position + delta)
+
+    def action(self):
+        # The move that led to the current position, as (player, action)
+        if self.position == 0:
+            return None, ()
+        return self.mover(self.position - 1)[0], self.record.actions[self.position - 1]
+
+    def outcome(self):
+        # (winner, messages) once the game is over at this position, else (None, [])
+        result, messages = check_victory(self.p1, self.p2)
+        if result is None and check_turn_limit(self.p1, self.p2):
+            result, messages = tournament_result(self.p1, self.p2)
+        return result, messages
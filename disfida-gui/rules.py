@@ -0,0 +1,146 @@
+# rules.py
+# Tunable game constants. card_game_logic.RULES (and disfida.RULES for the
+# CLI game) is read wherever a rule applies, so assigning a different Rules
+# there changes every game dealt afterwards. Rules round-trip through plain
+# dicts and JSON files, and "name=value" strings override single fields.
+import json
+
+RESOLUTIONS = {
+    # How an exact HP tie at the turn limit is decided
+    "hp_winner_player2_tie": "Exact tie: Player 2 wins!",
+    "hp_winner_player1_tie": "Exact tie: Player 1 wins!",
+    "hp_winner_draw": "Exact tie is a draw",
+}
+
+DEFAULTS = {
+    "health": 40,  # starting health, also the healing cap
+    "max_player_turns": 20,
+    "cavallo_attack_bonus": 1,
+    "re_defense_bonus": 2,
+    "fante_heal_bonus": 2,
+    "stack_size": 12,
+    "hand_size": 4,
+    "denari_stack_size": 13,  # Wealth of Choice
+    "denari_hand_size": 5,
+    "blood_price_divisor": 2,  # Spade self-damage is card value // divisor
+    "charity_divisor": 2,  # Coppe heals the opponent card value // divisor
+    "resolution": "hp_winner_player2_tie",
+}
+
+NUMERIC_CARD_COUNT = 28
+# Limits of the encodings built on these rules: legal_moves.hand_signature
+# packs at most 5 hand slots, zobrist.HEALTH_KEYS covers health from -64 to
+# 63 and zobrist.TURN_KEYS (and the replay checksum bytes) up to 254 turns.
+# The killing blow can overshoot: five attacks of 7 + cavallo_attack_bonus on
+# a player at 1 HP must stay above -64, so bonuses are at most 6.
+MAX_HAND_SIZE = 5
+MAX_HEALTH = 63
+MAX_PLAYER_TURNS = 254
+MAX_BONUS = 6
+
+BONUSES = ("cavallo_attack_bonus", "re_defense_bonus", "fante_heal_bonus")
+UPPER_LIMITS = {"hand_size": MAX_HAND_SIZE, "denari_hand_size": MAX_HAND_SIZE, "health": MAX_HEALTH,
+                "max_player_turns": MAX_PLAYER_TURNS}
+
+def check_value(name, value):
+    # The checks on one rule that do not depend on the others
+    if name == "resolution":
+        if value not in RESOLUTIONS:
+            raise ValueError(f"resolution must be one of {', '.join(RESOLUTIONS)}")
+        return
+    if not isinstance(value, int):
+        raise ValueError(f"{name} must be an integer")
+    if name in BONUSES:
+        if not 0 <= value <= MAX_BONUS:
+            raise ValueError(f"{name} must be between 0 and {MAX_BONUS}")
+        return
+    if value < 1:
+        raise ValueError(f"{name} must be at least 1")
+    if name in UPPER_LIMITS and value > UPPER_LIMITS[name]:
+        raise ValueError(f"{name} must be at most {UPPER_LIMITS[name]}")
+
+class Rules:
+    __slots__ = tuple(DEFAULTS)
+
+    def __init__(self, **overrides):
+        for name, value in DEFAULTS.items():
+            setattr(self, name, value)
+        for name, value in overrides.items():
+            if name not in DEFAULTS:
+                raise ValueError(f"Unknown rule {name!r}")
+            setattr(self, name, value)
+        self.check()
+
+    def check(self):
+        for name in DEFAULTS:
+            check_value(name, getattr(self, name))
+        if self.hand_size > self.stack_size or self.denari_hand_size > self.denari_stack_size:
+            raise ValueError("a hand cannot be larger than its stack")
+        # Two Denari characters can meet, and both stacks come from the 28 numeric cards
+        if 2 * max(self.stack_size, self.denari_stack_size) > NUMERIC_CARD_COUNT:
+            raise ValueError(f"two stacks must fit in the {NUMERIC_CARD_COUNT} numeric cards")
+
+    def bonuses(self, face):
+        # (attack, defense, heal) for a character face
+        return (self.cavallo_attack_bonus if face == "Cavallo" else 0,
+                self.re_defense_bonus if face == "Re" else 0,
+                self.fante_heal_bonus if face == "Fante" else 0)
+
+    def sizes(self, denari):
+        # (stack, hand) for a Denari or other character
+        if denari:
+            return self.denari_stack_size, self.denari_hand_size
+        return self.stack_size, self.hand_size
+
+    def wealth_of_choice(self):
+        # Rules-summary text for the Denari card advantage
+        if self.denari_stack_size - self.stack_size == self.denari_hand_size - self.hand_size == 1:
+            return "+1 card in stack/hand"
+        return f"{self.denari_stack_size} cards in stack, {self.denari_hand_size} in hand"
+
+    def to_dict(self):
+        return {name: getattr(self, name) for name in DEFAULTS}
+
+    @classmethod
+    def from_dict(cls, data):
+        return cls(**data)
+
+    def replace(self, **changes):
+        return Rules(**{**self.to_dict(), **changes})
+
+    def changes(self):
+        # Fields that differ from the defaults
+        return {name: value for name, value in self.to_dict().items() if value != DEFAULTS[name]}
+
+    def label(self):
+        changes = self.changes()
+        return " ".join(f"{name}={value}" for name, value in changes.items()) or "default"
+
+    def __eq__(self, other):
+        return isinstance(other, Rules) and self.to_dict() == other.to_dict()
+
+    def __repr__(self):
+        return f"Rules({', '.join(f'{n}={v!r}' for n, v in self.changes().items())})"
+
+def parse_value(name, text):
+    if name not in DEFAULTS:
+        raise ValueError(f"Unknown rule {name!r}; rules are {', '.join(DEFAULTS)}")
+    return text if name == "resolution" else int(text)
+
+def parse_override(text):
+    # "health=30" -> ("health", 30)
+    name, sep, value = text.partition("=")
+    if not sep:
+        raise ValueError(f"Expected name=value, got {text!r}")
+    name = name.strip()
+    return name, parse_value(name, value.strip())
+
+def load_rules(path=None, overrides=()):
+    # A JSON object of rule fields (missing ones keep their defaults), then
+    # "name=value" overrides on top
+    data = {}
+    if path is not None:
+        with open(path) as f:
+            data = json.load(f)
+    data.update(parse_override(text) for text in overrides)
+    return Rules(**data)
@@ -0,0 +1,217 @@
+# rules_sweep.py
+# Balance metrics for many rule sets at once. Configs are the product of the
+# --grid NAME=V1,V2,... options, or --sample K random draws from the
+# --range NAME=LOW:HIGH options; --set overrides apply to every config.
+# Each config plays the same deals (game k comes from game_rng(seed, k)
+# whatever the rules), in chunks spread over a process pool, and reports
+# win rates, the knockout share, game length and how evenly the twelve
+# characters fare (ties count half).
+import argparse
+import itertools
+import json
+import os
+import random
+import statistics
+import time
+from multiprocessing import Pool
+import card_game_logic
+from card_game_logic import game_rng
+from game_stats import GameStats
+from rules import Rules, check_value, load_rules, parse_value
+from simulation import POLICIES, play_game
+
+def grid_configs(base, grid):
+    # grid: [(name, [values])] of values valid on their own (see parse_grid);
+    # combinations the rules reject are dropped
+    names = [name for name, _ in grid]
+    configs, rejected = [], 0
+    for values in itertools.product(*(values for _, values in grid)):
+        try:
+            configs.append(base.replace(**dict(zip(names, values))))
+        except ValueError:
+            rejected += 1
+    return configs, rejected
+
+def sample_configs(base, ranges, k, rng, attempts=100):
+    # ranges: [(name, low, high)], integers drawn uniformly and inclusively
+    configs, rejected = [], 0
+    while len(configs) < k and rejected < attempts * k:
+        try:
+            rules = base.replace(**{name: rng.randint(low, high) for name, low, high in ranges})
+        except ValueError:
+            rejected += 1
+            continue
+        if rules not in configs:
+            configs.append(rules)
+    return configs, rejected
+
+def run_chunk(args):
+    # Plays games [start, start + n_games) under one config; returns (config index, GameStats)
+    index, rules, policy_p1, policy_p2, start, n_games, seed = args
+    previous = card_game_logic.RULES
+    card_game_logic.RULES = Rules.from_dict(rules)
+    try:
+        stats = GameStats()
+        for k in range(start, start + n_games):
+            stats.add(play_game(POLICIES[policy_p1], POLICIES[policy_p2], game_rng(seed, k)))
+    finally:
+        card_game_logic.RULES = previous
+    return index, stats
+
+def sweep(configs, n_games, policy_p1="random", policy_p2="random", seed=None, processes=None,
+          chunk_size=500):
+    if seed is None:
+        seed = random.randrange(2 ** 32)
+    processes = processes or os.cpu_count() or 1
+    chunks = [(index, rules.to_dict(), policy_p1, policy_p2, start, min(chunk_size, n_games - start), seed)
+              for index, rules in enumerate(configs) for start in range(0, n_games, chunk_size)]
+    results = [GameStats(rules.max_player_turns) for rules in configs]
+    start_time = time.perf_counter()
+    if processes == 1 or len(chunks) == 1:
+        for index, stats in map(run_chunk, chunks):
+            results[index].merge(stats)
+    else:
+        with Pool(processes) as pool:
+            for index, stats in pool.imap_unordered(run_chunk, chunks):
+                results[index].merge(stats)
+    return {
+        "seed": seed,
+        "policies": (policy_p1, policy_p2),
+        "games": n_games,
+        "elapsed": time.perf_counter() - start_time,
+        "configs": [{"rules": rules.changes(), "label": rules.label(), "metrics": balance_metrics(stats)}
+                    for rules, stats in zip(configs, results)],
+    }
+
+def balance_metrics(stats):
+    games = p1 = p2 = tie = knockout = tiebreak = turns = 0
+    score = {}  # character -> [points, games]
+    for key, pairing in stats.pairings.items():
+        games += pairing.games
+        p1 += pairing.p1
+        p2 += pairing.p2
+        tie += pairing.tie
+        knockout += pairing.knockout
+        tiebreak += pairing.tiebreak
+        turns += pairing.mean_turns() * pairing.games
+        first, second = key.split(" vs ")
+        for character, wins in ((first, pairing.p1), (second, pairing.p2)):
+            entry = score.setdefault(character, [0.0, 0])
+            entry[0] += wins + 0.5 * pairing.tie
+            entry[1] += pairing.games
+    rates = {character: points / n for character, (points, n) in score.items()}
+    weakest = min(rates, key=rates.get)
+    strongest = max(rates, key=rates.get)
+    games = max(games, 1)
+    return {
+        "games": games,
+        "p1": p1 / games,
+        "tie": tie / games,
+        "p2": p2 / games,
+        "knockout": knockout / games,
+        "tiebreak": tiebreak / games,
+        "mean_turns": turns / games,
+        # Character win rates (either seat): best minus worst, and their spread
+        "character_range": rates[strongest] - rates[weakest],
+        "character_stdev": statistics.pstdev(rates.values()),
+        "weakest": (weakest, rates[weakest]),
+        "strongest": (strongest, rates[strongest]),
+        "characters": rates,
+    }
+
+SORT_KEYS = {
+    "config": None,
+    "range": lambda row: row["metrics"]["character_range"],
+    "stdev": lambda row: row["metrics"]["character_stdev"],
+    "p1": lambda row: abs(row["metrics"]["p1"] - 0.5),
+}
+
+def format_report(report, sort="config"):
+    rows = report["configs"]
+    if SORT_KEYS[sort] is not None:
+        rows = sorted(rows, key=SORT_KEYS[sort])
+    lines = [f"{'games':>7} {'P1 win':>7} {'tie':>6} {'P2 win':>7} {'KO':>6} {'turns':>6} "
+             f"{'range':>6} {'stdev':>6}  {'weakest':<22} {'strongest':<22} rules"]
+    for row in rows:
+        m = row["metrics"]
+        weakest, low = m["weakest"]
+        strongest, high = m["strongest"]
+        lines.append(f"{m['games']:>7} {100 * m['p1']:>6.1f}% {100 * m['tie']:>5.1f}% {100 * m['p2']:>6.1f}% "
+                     f"{100 * m['knockout']:>5.1f}% {m['mean_turns']:>6.1f} {100 * m['character_range']:>5.1f}% "
+                     f"{100 * m['character_stdev']:>5.1f}%  {f'{weakest} {100 * low:.0f}%':<22} "
+                     f"{f'{strongest} {100 * high:.0f}%':<22} {row['label']}")
+    lines.append(f"{len(rows)} configs x {report['games']} games, seed {report['seed']}, "
+                 f"{report['elapsed']:.1f}s")
+    return "\n".join(lines)
+
+def parse_grid(text):
+    # "health=30,40,50" -> ("health", [30, 40, 50]); a value no config could
+    # use is an error rather than a skipped combination
+    name, sep, values = text.partition("=")
+    if not sep:
+        raise ValueError(f"Expected NAME=V1,V2,..., got {text!r}")
+    name = name.strip()
+    values = [parse_value(name, value.strip()) for value in values.split(",")]
+    for value in values:
+        check_value(name, value)
+    return name, values
+
+def parse_range(text):
+    # "health=30:50" -> ("health", 30, 50)
+    name, sep, bounds = text.partition("=")
+    low, colon, high = bounds.partition(":")
+    if not sep or not colon:
+        raise ValueError(f"Expected NAME=LOW:HIGH, got {text!r}")
+    name = name.strip()
+    if name == "resolution":
+        raise ValueError("resolution is not numeric; use --grid for it")
+    low, high = parse_value(name, low), parse_value(name, high)
+    check_value(name, low)
+    check_value(name, high)
+    return name, low, high
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare balance across rule sets")
+    parser.add_argument("--grid", action="append", default=[], metavar="NAME=V1,V2,...",
+                        help="values to try for one rule; configs are every combination (repeatable)")
+    parser.add_argument("--sample", type=int, metavar="K", default=None,
+                        help="instead of a grid, draw K random configs from the --range options")
+    parser.add_argument("--range", action="append", default=[], metavar="NAME=LOW:HIGH",
+                        help="inclusive integer range for --sample (repeatable)")
+    parser.add_argument("--set", action="append", default=[], metavar="NAME=VALUE",
+                        help="rule applied to every config (repeatable)")
+    parser.add_argument("--rules", metavar="PATH", help="JSON file of base rules")
+    parser.add_argument("-n", "--games", type=int, default=2000, help="games per config")
+    parser.add_argument("--p1", choices=sorted(POLICIES), default="random")
+    parser.add_argument("--p2", choices=sorted(POLICIES), default="random")
+    parser.add_argument("--seed", type=int, default=None)
+    parser.add_argument("--processes", type=int, default=None)
+    parser.add_argument("--chunk-size", type=int, default=500)
+    parser.add_argument("--sort", choices=sorted(SORT_KEYS), default="config",
+                        help="row order: as generated, most even characters first, or P1 closest to 50%%")
+    parser.add_argument("--json", metavar="PATH", help="also write the report as JSON")
+    args = parser.parse_args()
+    try:
+        base = load_rules(args.rules, args.set)
+        if args.sample is not None:
+            if not args.range:
+                parser.error("--sample needs at least one --range")
+            rng = random.Random(args.seed)
+            configs, rejected = sample_configs(base, [parse_range(text) for text in args.range],
+                                               args.sample, rng)
+        else:
+            configs, rejected = grid_configs(base, [parse_grid(text) for text in args.grid])
+    except ValueError as e:
+        parser.error(str(e))
+    if rejected:
+        print(f"Skipped {rejected} invalid config(s)")
+    if not configs:
+        parser.error("no valid configs to play")
+    report = sweep(configs, args.games, args.p1, args.p2, args.seed, args.processes, args.chunk_size)
+    print(format_report(report, args.sort))
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(report, f, indent=2)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,74 @@
+# search_state.py
+# Make/unmake moves and cheap snapshots on card_game_logic players, so search
+# code can try a move and roll it back without copy.deepcopy.
+from itertools import islice
+from card_game_logic import Player, play_action, refill_hand
+from events import NULL_LOG
+
+class TurnDelta:
+    # Just enough to rebuild both players as they were before make_move()
+    __slots__ = ("player", "opponent", "hand", "stack_len", "drawn", "shields",
+                 "opp_shields", "opp_stack_len", "health", "opp_health", "valid")
+
+def make_move(player, opponent, action, refill=True):
+    delta = TurnDelta()
+    delta.player = player
+    delta.opponent = opponent
+    delta.hand = list(player.hand)
+    delta.stack_len = len(player.stack)
+    delta.shields = list(player.shields)
+    delta.opp_shields = list(opponent.shields)
+    delta.opp_stack_len = len(opponent.stack)
+    delta.health = player.health
+    delta.opp_health = opponent.health
+    turns_before = player.turns_played
+    play_action(player, opponent, action, NULL_LOG)
+    delta.valid = player.turns_played != turns_before
+    delta.drawn = []
+    # The game ends on a knockout before the refill
+    if refill and delta.valid and player.health > 0 and opponent.health > 0:
+        hand_len = len(player.hand)
+        refill_hand(player, NULL_LOG)
+        delta.drawn = list(islice(player.hand, hand_len, None))
+    return delta
+
+def unmake_move(delta):
+    player = delta.player
+    opponent = delta.opponent
+    if delta.valid:
+        player.turns_played -= 1
+    player.hand.reset(delta.hand)
+    # Stack was S, became S + cycled, then lost len(drawn) cards from the top
+    drawn = delta.drawn
+    if len(drawn) >= delta.stack_len:
+        player.stack.reset(drawn[:delta.stack_len])
+    else:
+        player.stack.truncate(delta.stack_len - len(drawn))
+        for card in reversed(drawn):
+            player.stack.put_top(card)
+    player.shields.reset(delta.shields)
+    opponent.shields.reset(delta.opp_shields)
+    opponent.stack.truncate(delta.opp_stack_len)
+    player.health = delta.health
+    opponent.health = delta.opp_health
+
+def snapshot(*players):
+    return tuple((tuple(p.hand), tuple(p.stack), tuple(p.shields), p.health, p.turns_played)
+                 for p in players)
+
+def restore(snap, *players):
+    for player, (hand, stack, shields, health, turns_played) in zip(players, snap):
+        player.hand.reset(hand)
+        player.stack.reset(stack)
+        player.shields.reset(shields)
+        player.health = health
+        player.turns_played = turns_played
+
+def clone_player(player):
+    # Cards and Character are shared; only the zones are copied
+    clone = Player(player.name, player.character, player.stack)
+    clone.hand = player.hand.copy()
+    clone.shields = player.shields.copy()
+    clone.health = player.health
+    clone.turns_played = player.turns_played
+    return clone
@@ -0,0 +1,379 @@
+# simulation.py
+import argparse
+import os
+import random
+import time
+from multiprocessing import Pool
+import card_game_logic
+from card_game_logic import *
+from events import NULL_LOG
+from game_stats import GameStats
+from greedy_bot import greedy_policy
+from legal_moves import legal_action_list, legal_pre_shield_actions
+
+# A policy is called as policy(player, opponent, phase, rng) with phase
+# "pre_shield" or "turn" and returns an action for play_action().
+
+def skip_policy(player, opponent, phase, rng):
+    return ()
+
+def random_mode(player, idx, rng):
+    card = player.hand[idx]
+    if can_use_special(player, card, True) and rng.random() < 0.5:
+        as_shield = player.character.suit == "Bastoni" and rng.random() < 0.5
+        return (idx, True, as_shield)
+    return (idx, False, False)
+
+def random_policy(player, opponent, phase, rng):
+    hand = player.hand
+    if phase == "pre_shield":
+        options = [(i, False, False) for i, c in enumerate(hand) if c.suit == "Denari"]
+        if player.character.suit == "Bastoni":
+            options += [(i, True, True) for i, c in enumerate(hand) if c.suit == "Bastoni"]
+        if not options or rng.random() < 0.25:
+            return ()
+        return (rng.choice(options),)
+    if not hand or rng.random() < 0.1:
+        return ()
+    # Character-suit cards in random order, optionally closed by any other card
+    suit_indices = [i for i, c in enumerate(hand) if c.suit == player.character.suit]
+    rng.shuffle(suit_indices)
+    chosen = suit_indices[:rng.randint(0, len(suit_indices))]
+    rest = [i for i in range(len(hand)) if i not in chosen]
+    if rest and (not chosen or rng.random() < 0.5):
+        chosen.append(rng.choice(rest))
+    return tuple(random_mode(player, i, rng) for i in chosen)
+
+def uniform_policy(player, opponent, phase, rng):
+    # Uniform over all legal actions, so long combos dominate
+    if phase == "pre_shield":
+        return rng.choice(list(legal_pre_shield_actions(player)))
+    return rng.choice(legal_action_list(player))
+
+POLICIES = {
+    "random": random_policy,
+    "skip": skip_policy,
+    "uniform": uniform_policy,
+    "greedy": greedy_policy,
+}
+
+def resolve_policy(name, deadline=1.0):
+    # A POLICIES name, or "bot:<spec>" for a bot_pool.BotPool plugin
+    if name.startswith("bot:"):
+        from bot_pool import BotPool
+        return BotPool(name[4:], deadline=deadline)
+    return POLICIES[name]
+
+def play_pre_shield(player, opponent, action, log=NULL_LOG):
+    shields_before = len(player.shields)
+    player_pre_shield(player, opponent, action_to_input(action), log)
+    if action and len(player.shields) == shields_before:
+        # Rejected pre-shield leaves the hand untouched; fall back to skipping
+        player_pre_shield(player, opponent, "0", log)
+        return False
+    return bool(action)
+
+def play_turn(player, opponent, action, log=NULL_LOG):
+    turns_before = player.turns_played
+    play_action(player, opponent, action, log)
+    if player.turns_played == turns_before:
+        # Rejected actions are played as a skip
+        resolve_turn(player, opponent, "0", log)
+        return False
+    return True
+
+def _play_noting(play, player, opponent, action, played):
+    # play_pre_shield/play_turn that appends the (card id, special) pairs of an
+    # accepted action to played
+    hand = player.hand
+    cards = [(hand[idx].id, special) for idx, special, _ in action if 0 <= idx < len(hand)]
+    if play(player, opponent, action):
+        played.extend(cards)
+
+def play_game(policy_p1, policy_p2, rng, record=None, characters=None, game=None, track_cards=False):
+    # rng deals the game and feeds both policies; use game_rng() for a
+    # reproducible game, or random.Random(record.seed) when recording.
+    # game is the index within a sweep, used to label profiler traces.
+    # track_cards adds the accepted plays to the result as "cards".
+    if record is not None:
+        policy_p1, policy_p2 = record.track(policy_p1), record.track(policy_p2)
+    profiler = card_game_logic.PROFILER
+    if profiler is not None:
+        profiler.start_game(game)
+        return _play_profiled(policy_p1, policy_p2, rng, record, characters, profiler, track_cards)
+    played = [] if track_cards else None
+    player1, player2, _ = init_game(characters, rng)
+    for player, opponent, policy in ((player1, player2, policy_p1), (player2, player1, policy_p2)):
+        action = policy(player, opponent, "pre_shield", rng)
+        if played is None:
+            play_pre_shield(player, opponent, action)
+        else:
+            _play_noting(play_pre_shield, player, opponent, action, played)
+    current, opponent = player1, player2
+    policy, other_policy = policy_p1, policy_p2
+    while True:
+        action = policy(current, opponent, "turn", rng)
+        if played is None:
+            play_turn(current, opponent, action)
+        else:
+            _play_noting(play_turn, current, opponent, action, played)
+        result, _ = check_victory(player1, player2)
+        if result:
+            return game_result(result, "knockout", player1, player2, record, played)
+        refill_hand(current, NULL_LOG)
+        if check_turn_limit(player1, player2):
+            winner, _ = tournament_result(player1, player2)
+            return game_result(winner, "turn_limit", player1, player2, record, played)
+        current, opponent = opponent, current
+        policy, other_policy = other_policy, policy
+
+def _play_profiled(policy_p1, policy_p2, rng, record, characters, profiler, track_cards):
+    # play_game with every phase timed; kept apart so the plain loop stays lean
+    clock, end = time.perf_counter_ns, profiler.end
+    played = [] if track_cards else None
+    player1, player2, _ = init_game(characters, rng)
+    for player, opponent, policy in ((player1, player2, policy_p1), (player2, player1, policy_p2)):
+        start = clock()
+        action = policy(player, opponent, "pre_shield", rng)
+        end("policy", start)
+        start = clock()
+        if played is None:
+            play_pre_shield(player, opponent, action)
+        else:
+            _play_noting(play_pre_shield, player, opponent, action, played)
+        end("pre_shield", start)
+    current, opponent = player1, player2
+    policy, other_policy = policy_p1, policy_p2
+    while True:
+        start = clock()
+        action = policy(current, opponent, "turn", rng)
+        end("policy", start)
+        start = clock()
+        if played is None:
+            play_turn(current, opponent, action)
+        else:
+            _play_noting(play_turn, current, opponent, action, played)
+        end("resolve", start)
+        start = clock()
+        result, _ = check_victory(player1, player2)
+        end("victory", start)
+        if result:
+            return game_result(result, "knockout", player1, player2, record, played)
+        start = clock()
+        refill_hand(current, NULL_LOG)
+        end("refill", start)
+        if check_turn_limit(player1, player2):
+            winner, _ = tournament_result(player1, player2)
+            return game_result(winner, "turn_limit", player1, player2, record, played)
+        current, opponent = opponent, current
+        policy, other_policy = other_policy, policy
+
+def game_result(winner, ending, player1, player2, record=None, played=None):
+    if record is not None:
+        record.finish(player1, player2)
+    result = {
+        "winner": winner,
+        "ending": ending,
+        "turns": player1.turns_played + player2.turns_played,
+        "p1_health": player1.health,
+        "p2_health": player2.health,
+        # An exact HP tie at the turn limit went to one player (see rules.RESOLUTIONS)
+        "tiebreak": ending == "turn_limit" and player1.health == player2.health and winner != "tie",
+        "characters": ((player1.character.face, player1.character.suit),
+                       (player2.character.face, player2.character.suit)),
+    }
+    if played is not None:
+        result["cards"] = played
+    return result
+
+CHECKPOINT_SECONDS = 30
+
+def empty_totals():
+    return {"games": 0, "p1": 0, "p2": 0, "tie": 0, "knockout": 0, "turn_limit": 0, "turns": 0,
+            "tiebreak": 0}
+
+def add_result(totals, result):
+    totals["games"] += 1
+    totals[result["winner"]] += 1
+    totals[result["ending"]] += 1
+    totals["turns"] += result["turns"]
+    totals["tiebreak"] += result["tiebreak"]
+
+def merge_totals(totals, other):
+    for key, value in other.items():
+        totals[key] += value
+
+def run_game(policy_p1, policy_p2, seed, index, track_cards=False):
+    # Game `index` of the sweep with master seed `seed`, on its own stream
+    return play_game(policy_p1, policy_p2, game_rng(seed, index), game=index, track_cards=track_cards)
+
+def run_chunk(args):
+    # Returns (totals, GameStats or None); stats are only kept when asked for
+    policy_p1, policy_p2, start, n_games, seed, keep_stats = args
+    totals = empty_totals()
+    stats = GameStats() if keep_stats else None
+    for index in range(start, start + n_games):
+        result = run_game(policy_p1, policy_p2, seed, index, keep_stats)
+        add_result(totals, result)
+        if stats is not None:
+            stats.add(result)
+    return totals, stats
+
+def record_chunk(args):
+    # Like run_chunk, but also returns the chunk's games as replay bytes
+    from replay import GameRecord
+    policy_p1, policy_p2, start, n_games, seed, keep_stats = args
+    totals = empty_totals()
+    stats = GameStats() if keep_stats else None
+    data = bytearray()
+    for index in range(start, start + n_games):
+        record = GameRecord(game_seed(seed, index))
+        result = play_game(policy_p1, policy_p2, random.Random(record.seed), record, game=index,
+                           track_cards=keep_stats)
+        add_result(totals, result)
+        if stats is not None:
+            stats.add(result)
+        record.encode(data)
+    return totals, stats, bytes(data)
+
+def profile_chunk(args):
+    # Runs another chunk function under a fresh Profiler; returns (its result, profile)
+    from profiler import Profiler
+    work, chunk, trace_games = args
+    card_game_logic.PROFILER = Profiler(trace_games)
+    try:
+        result = work(chunk)
+        return result, card_game_logic.PROFILER.to_dict()
+    finally:
+        card_game_logic.PROFILER = None
+
+def _run_chunks(work, chunks, processes, ordered=False, profiler=None):
+    if profiler is not None:
+        # Each worker profiles its own chunks; the parent merges them
+        chunks = [(work, chunk, profiler.trace_games) for chunk in chunks]
+        for result, data in _run_chunks(profile_chunk, chunks, processes, ordered):
+            profiler.merge(data)
+            yield result
+        return
+    if processes == 1 or len(chunks) == 1:
+        yield from map(work, chunks)
+        return
+    with Pool(processes) as pool:
+        yield from (pool.imap if ordered else pool.imap_unordered)(work, chunks)
+
+def simulate(n_games, policy_p1=random_policy, policy_p2=random_policy, seed=None,
+             processes=None, chunk_size=1000, record_path=None, profiler=None, stats=None,
+             stats_path=None):
+    # stats: a GameStats that every game is added to; with stats_path it is
+    # also saved there as a checkpoint every CHECKPOINT_SECONDS and at the end
+    if seed is None:
+        seed = random.randrange(2 ** 32)
+    processes = processes or os.cpu_count() or 1
+    chunks = []
+    for start in range(0, n_games, chunk_size):
+        size = min(chunk_size, n_games - start)
+        chunks.append((policy_p1, policy_p2, start, size, seed, stats is not None))
+    totals = empty_totals()
+    start_time = time.perf_counter()
+    last_save = start_time
+    def add_chunk(chunk_totals, chunk_stats):
+        nonlocal last_save
+        merge_totals(totals, chunk_totals)
+        if stats is not None:
+            stats.merge(chunk_stats)
+            if stats_path is not None and time.perf_counter() - last_save >= CHECKPOINT_SECONDS:
+                stats.save(stats_path)
+                last_save = time.perf_counter()
+    if record_path is not None:
+        from replay import ReplayWriter
+        with ReplayWriter(record_path) as writer:
+            for chunk_totals, chunk_stats, data in _run_chunks(record_chunk, chunks, processes,
+                                                               ordered=True, profiler=profiler):
+                add_chunk(chunk_totals, chunk_stats)
+                writer.write_encoded(data, chunk_totals["games"])
+    else:
+        for chunk_totals, chunk_stats in _run_chunks(run_chunk, chunks, processes, profiler=profiler):
+            add_chunk(chunk_totals, chunk_stats)
+    if stats_path is not None:
+        stats.save(stats_path)
+    elapsed = time.perf_counter() - start_time
+    totals["seed"] = seed
+    totals["elapsed"] = elapsed
+    totals["games_per_sec"] = totals["games"] / elapsed if elapsed > 0 else 0.0
+    return totals
+
+def format_totals(totals):
+    games = max(totals["games"], 1)
+    return "\n".join([
+        f"Games: {totals['games']} (seed {totals['seed']})",
+        f"Player 1 wins: {totals['p1']} ({100 * totals['p1'] / games:.1f}%)",
+        f"Player 2 wins: {totals['p2']} ({100 * totals['p2'] / games:.1f}%)",
+        f"Ties: {totals['tie']} ({100 * totals['tie'] / games:.1f}%)",
+        f"Knockouts: {totals['knockout']}, turn limit: {totals['turn_limit']}"
+        f" ({totals['tiebreak']} decided by the tiebreak)",
+        f"Average turns: {totals['turns'] / games:.1f}",
+        f"Elapsed: {totals['elapsed']:.2f}s ({totals['games_per_sec']:.0f} games/sec)",
+    ])
+
+def main():
+    parser = argparse.ArgumentParser(description="Run headless Disfida games in parallel")
+    parser.add_argument("-n", "--games", type=int, default=10000)
+    parser.add_argument("--p1", default="random",
+                        help=f"one of {', '.join(sorted(POLICIES))}, or bot:<module:Class>")
+    parser.add_argument("--p2", default="random")
+    parser.add_argument("--seed", type=int, default=None)
+    parser.add_argument("--processes", type=int, default=None)
+    parser.add_argument("--chunk-size", type=int, default=1000)
+    parser.add_argument("--record", metavar="PATH", default=None,
+                        help="append every game to a binary replay file")
+    parser.add_argument("--bot-deadline", type=float, default=1.0, help="bot seconds per move")
+    parser.add_argument("--game", type=int, metavar="K", default=None,
+                        help="replay only game K of the --seed sweep and print its result")
+    parser.add_argument("--profile", action="store_true",
+                        help="print engine counters and per-phase timings")
+    parser.add_argument("--trace", metavar="PATH",
+                        help="write a Chrome trace-event timeline (implies --profile)")
+    parser.add_argument("--trace-games", type=int, default=20, help="games to include in --trace")
+    parser.add_argument("--stats", metavar="PATH",
+                        help="per-pairing and per-card statistics, checkpointed to PATH as JSON")
+    args = parser.parse_args()
+    if args.game is not None and args.seed is None:
+        parser.error("--game needs --seed")
+    for name in (args.p1, args.p2):
+        if name not in POLICIES and not name.startswith("bot:"):
+            parser.error(f"unknown policy {name!r}")
+    policies = [resolve_policy(name, args.bot_deadline) for name in (args.p1, args.p2)]
+    bots = [p for p in policies if p not in POLICIES.values()]
+    # Bot pools own their worker processes and stay in this one
+    processes = 1 if bots else args.processes
+    if args.game is not None:
+        try:
+            print(run_game(policies[0], policies[1], args.seed, args.game))
+        finally:
+            for bot in bots:
+                bot.close()
+        return
+    profiler = None
+    if args.profile or args.trace:
+        from profiler import Profiler
+        profiler = Profiler(args.trace_games if args.trace else 0)
+    stats = GameStats() if args.stats else None
+    try:
+        totals = simulate(args.games, policies[0], policies[1], args.seed,
+                          processes, args.chunk_size, args.record, profiler, stats, args.stats)
+    finally:
+        for bot in bots:
+            bot.close()
+    print(format_totals(totals))
+    if stats is not None:
+        print(stats.summary())
+    if profiler is not None:
+        print(profiler.summary())
+        if args.trace:
+            profiler.write_trace(args.trace)
+            print(f"Trace of {min(args.trace_games, args.games)} games written to {args.trace}")
+    for bot in bots:
+        print(f"Bot {bot.spec}: {bot.moves} moves, {bot.timeouts} timeouts, {bot.errors} errors")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,384 @@
+# vector_sim.py
+# Lockstep simulator: N games held as NumPy arrays, advanced one turn per call.
+# Turn resolution follows card_game_logic.resolve_turn exactly; the game flow
+# (invalid action treated as a skip, victory check, refill, turn limit) follows
+# simulation.play_game.
+import argparse
+import time
+import numpy as np
+import card_game_logic
+from card_game_logic import SUITS
+from compact import (CARD_SUIT, CARD_VALUE, NUMERIC_CARDS, DENARI, COPPE, SPADE, BASTONI,
+                     FACES, CompactCharacter, CompactPlayer)
+
+MAX_HAND = 5
+ZONE = 40  # stack ring buffer / shield table width
+EMPTY = -1
+
+SUIT_OF = np.array(CARD_SUIT + [EMPTY], dtype=np.int8)        # index -1 -> EMPTY
+VALUE_OF = np.array(CARD_VALUE + [0], dtype=np.int16)
+NUMERIC = np.array(NUMERIC_CARDS, dtype=np.int8)
+
+# Face card index 0-11 in create_face_cards() order
+FACE_SUIT = np.repeat(np.arange(4), 3)
+FACE_KIND = np.tile(np.arange(3), 4)  # 0 Fante, 1 Cavallo, 2 Re
+# winner code for an exact HP tie at the turn limit, per rules.resolution
+TIE_WINNER = {"hp_winner_player2_tie": 1, "hp_winner_player1_tie": 0, "hp_winner_draw": 2}
+
+class VectorGames:
+    def __init__(self, n, rng, p1_faces=None, p2_faces=None):
+        self.n = n
+        self.rng = rng
+        self.rules = rules = card_game_logic.RULES
+        if max(rules.hand_size, rules.denari_hand_size) > MAX_HAND:
+            raise ValueError(f"vector_sim supports hands of at most {MAX_HAND} cards")
+        if p1_faces is None:
+            p1_faces = rng.integers(12, size=n)
+        if p2_faces is None:
+            p2_faces = (p1_faces + 1 + rng.integers(11, size=n)) % 12
+        faces = np.stack([np.broadcast_to(p1_faces, n), np.broadcast_to(p2_faces, n)], axis=1)
+        self.faces = faces
+        self.char_suit = FACE_SUIT[faces].astype(np.int8)
+        kind = FACE_KIND[faces]
+        self.attack_bonus = np.where(kind == 1, rules.cavallo_attack_bonus, 0).astype(np.int16)
+        self.defense_bonus = np.where(kind == 2, rules.re_defense_bonus, 0).astype(np.int16)
+        self.heal_bonus = np.where(kind == 0, rules.fante_heal_bonus, 0).astype(np.int16)
+        denari = self.char_suit == DENARI
+        self.stack_size = np.where(denari, rules.denari_stack_size, rules.stack_size).astype(np.int16)
+        self.hand_size = np.where(denari, rules.denari_hand_size, rules.hand_size).astype(np.int16)
+
+        self.health = np.full((n, 2), rules.health, dtype=np.int16)
+        self.turns_played = np.zeros((n, 2), dtype=np.int16)
+        self.hand = np.full((n, 2, MAX_HAND), EMPTY, dtype=np.int8)
+        self.hand_len = np.zeros((n, 2), dtype=np.int16)
+        self.stack = np.full((n, 2, ZONE), EMPTY, dtype=np.int8)
+        self.stack_head = np.zeros((n, 2), dtype=np.int16)
+        self.stack_len = np.zeros((n, 2), dtype=np.int16)
+        self.shields = np.full((n, 2, ZONE), EMPTY, dtype=np.int8)
+        self.shield_len = np.zeros((n, 2), dtype=np.int16)
+
+        self.current = np.zeros(n, dtype=np.int8)
+        self.done = np.zeros(n, dtype=bool)
+        self.winner = np.full(n, EMPTY, dtype=np.int8)  # 0 p1, 1 p2, 2 tie
+        self.knockout = np.zeros(n, dtype=bool)
+
+        # Deal: shuffled numeric deck, Player 1's stack first, then Player 2's
+        deck = NUMERIC[np.argsort(rng.random((n, len(NUMERIC))), axis=1)]
+        size1 = self.stack_size[:, 0]
+        size2 = self.stack_size[:, 1]
+        cols = np.arange(len(NUMERIC))
+        self.stack[:, 0, :len(NUMERIC)] = np.where(cols < size1[:, None], deck, EMPTY)
+        shifted = np.take_along_axis(deck, np.minimum(cols + size1[:, None], len(NUMERIC) - 1), axis=1)
+        self.stack[:, 1, :len(NUMERIC)] = np.where(cols < size2[:, None], shifted, EMPTY)
+        self.stack_len[:, 0] = size1
+        self.stack_len[:, 1] = size2
+        everyone = np.ones(n, dtype=bool)
+        self._draw(everyone, np.zeros(n, dtype=np.int8), self.hand_size[:, 0])
+        self._draw(everyone, np.ones(n, dtype=np.int8), self.hand_size[:, 1])
+
+    # -----------------------------
+    # Zone helpers (g: game indices, p: player index per game)
+    # -----------------------------
+    def _draw(self, mask, who, count):
+        g = np.nonzero(mask)[0]
+        p = who[g]
+        count = np.minimum(count[g], self.stack_len[g, p])
+        for j in range(MAX_HAND):
+            take = count > j
+            if not take.any():
+                break
+            gg, pp = g[take], p[take]
+            pos = self.stack_head[gg, pp]
+            self.hand[gg, pp, self.hand_len[gg, pp]] = self.stack[gg, pp, pos]
+            self.stack[gg, pp, pos] = EMPTY
+            self.stack_head[gg, pp] = (pos + 1) % ZONE
+            self.stack_len[gg, pp] -= 1
+            self.hand_len[gg, pp] += 1
+
+    def _put_bottom(self, g, p, cards):
+        pos = (self.stack_head[g, p] + self.stack_len[g, p]) % ZONE
+        self.stack[g, p, pos] = cards
+        self.stack_len[g, p] += 1
+
+    def _add_shield(self, g, p, cards):
+        self.shields[g, p, self.shield_len[g, p]] = cards
+        self.shield_len[g, p] += 1
+
+    def _absorb(self, g, p, attack):
+        # remove_shields_for_attack: smallest first (stable on table order)
+        shields = self.shields[g, p]
+        count = self.shield_len[g, p]
+        cols = np.arange(ZONE)
+        valid = cols < count[:, None]
+        key = np.where(valid, VALUE_OF[shields] * 64 + cols, 1 << 14)
+        order = np.argsort(key, axis=1, kind="stable")
+        ordered = np.take_along_axis(shields, order, axis=1)
+        effective = np.where(valid, VALUE_OF[ordered] + self.defense_bonus[g, p][:, None], 0)
+        absorbed = np.cumsum(effective, axis=1)
+        short = (absorbed < attack[:, None]) & valid
+        consumed = np.minimum(count, short.sum(axis=1) + 1)
+        consumed[count == 0] = 0
+        last = np.take_along_axis(absorbed, np.maximum(consumed - 1, 0)[:, None], axis=1)[:, 0]
+        remaining = np.where(consumed > 0, np.maximum(attack - last, 0), attack)
+        for j in range(int(consumed.max(initial=0))):
+            hit = consumed > j
+            self._put_bottom(g[hit], p[hit], ordered[hit, j])
+        removed = np.zeros_like(valid)
+        np.put_along_axis(removed, order, cols < consumed[:, None], axis=1)
+        keep_order = np.argsort(np.where(valid & ~removed, cols, ZONE + cols), axis=1, kind="stable")
+        self.shields[g, p] = np.where(cols < (count - consumed)[:, None],
+                                      np.take_along_axis(shields, keep_order, axis=1), EMPTY)
+        self.shield_len[g, p] = count - consumed
+        return remaining
+
+    # -----------------------------
+    # Turn phases
+    # -----------------------------
+    def validate(self, cards, special):
+        # cards: (N, 5) hand indices padded with -1; special: (N, 5) bool
+        g = np.arange(self.n)
+        p = self.current
+        n_play = (cards >= 0).sum(axis=1)
+        slots = np.arange(MAX_HAND)
+        used = slots < n_play[:, None]
+        ok = ~((cards >= 0) & ~used).any(axis=1)  # indices must be a prefix
+        ok &= ~(used & (cards >= self.hand_len[g, p][:, None])).any(axis=1)
+        picked = np.where(used, cards, MAX_HAND)
+        same = picked[:, :, None] == picked[:, None, :]
+        ok &= ~((same & ~np.eye(MAX_HAND, dtype=bool)) & used[:, :, None]).any(axis=(1, 2))
+        cid = self._played_cards(cards, used)
+        suit = SUIT_OF[cid]
+        char_suit = self.char_suit[g, p][:, None]
+        not_last = slots < (n_play - 1)[:, None]
+        ok &= ~(not_last & (suit != char_suit)).any(axis=1)
+        special_ok = (((char_suit == SPADE) & (suit == COPPE)) |
+                      ((char_suit == COPPE) & (suit == SPADE)) |
+                      ((char_suit == BASTONI) & (suit == BASTONI)))
+        ok &= ~(used & special & ~special_ok).any(axis=1)
+        return ok
+
+    def _played_cards(self, cards, used):
+        g = np.arange(self.n)
+        hand = self.hand[g, self.current]
+        cid = np.take_along_axis(hand, np.clip(cards, 0, MAX_HAND - 1), axis=1)
+        return np.where(used, cid, EMPTY)
+
+    def step(self, cards, special, as_shield):
+        active = ~self.done
+        valid = self.validate(cards, special)
+        # An invalid action is played as a skip, as in simulation.play_game
+        cards = np.where((active & valid)[:, None], cards, EMPTY)
+        used = cards >= 0
+        cid = self._played_cards(cards, used)
+        g_all = np.arange(self.n)
+        p_all = self.current.astype(np.int64)
+        o_all = 1 - p_all
+
+        # Remove played cards from the hand, keeping the rest in order
+        played_mask = np.zeros((self.n, MAX_HAND + 1), dtype=bool)
+        np.put_along_axis(played_mask, np.where(used, cards, MAX_HAND), True, axis=1)
+        played_mask = played_mask[:, :MAX_HAND]
+        hand = self.hand[g_all, p_all]
+        slots = np.arange(MAX_HAND)
+        in_hand = slots < self.hand_len[g_all, p_all][:, None]
+        keep = in_hand & ~played_mask
+        keep_order = np.argsort(np.where(keep, slots, MAX_HAND + slots), axis=1, kind="stable")
+        kept = keep.sum(axis=1)
+        self.hand[g_all, p_all] = np.where(slots < kept[:, None],
+                                           np.take_along_axis(hand, keep_order, axis=1), EMPTY)
+        self.hand_len[g_all, p_all] = kept
+
+        char_suit = self.char_suit[g_all, p_all]
+        for k in range(MAX_HAND):
+            live = used[:, k]
+            if not live.any():
+                break
+            card = cid[:, k]
+            suit = SUIT_OF[card]
+            value = VALUE_OF[card]
+            sp = special[:, k]
+            shield = live & ((~sp & (suit == DENARI)) | (sp & (char_suit == BASTONI) & as_shield[:, k]))
+            heal = live & ((~sp & (suit == COPPE)) | (sp & (char_suit == COPPE)))
+            blood = live & sp & (char_suit == SPADE)
+            attack = live & ~shield & ~heal & ~blood
+
+            g = np.nonzero(shield)[0]
+            self._add_shield(g, p_all[g], card[g])
+
+            g = np.nonzero(heal)[0]
+            p, o = p_all[g], o_all[g]
+            cap = self.rules.health
+            self.health[g, p] = np.minimum(cap, self.health[g, p] + value[g] + self.heal_bonus[g, p])
+            charity = (char_suit[g] == COPPE) & (suit[g] == SPADE)
+            gc = g[charity]
+            self.health[gc, o[charity]] = np.minimum(
+                cap, self.health[gc, o[charity]] + value[gc] // self.rules.charity_divisor)
+
+            g = np.nonzero(blood)[0]
+            p, o = p_all[g], o_all[g]
+            self.health[g, o] -= value[g] + self.attack_bonus[g, p]
+            self.health[g, p] -= value[g] // self.rules.blood_price_divisor
+
+            g = np.nonzero(attack)[0]
+            if len(g):
+                p, o = p_all[g], o_all[g]
+                remaining = self._absorb(g, o, value[g] + self.attack_bonus[g, p])
+                self.health[g, o] -= remaining.astype(np.int16)
+
+            g = np.nonzero(live & ~shield)[0]
+            self._put_bottom(g, p_all[g], card[g])
+
+        self.turns_played[g_all[active], p_all[active]] += 1
+
+        # Victory, refill, turn limit - in card_game_gui / play_game order
+        ko1 = self.health[:, 0] <= 0
+        ko2 = self.health[:, 1] <= 0
+        ko = active & (ko1 | ko2)
+        self.winner[ko] = np.where(ko1 & ko2, 2, np.where(ko1, 1, 0))[ko]
+        self.knockout |= ko
+        self.done |= ko
+        active &= ~ko
+        self._draw(active, self.current, self.hand_size[g_all, p_all] - self.hand_len[g_all, p_all])
+        limit = active & (self.turns_played >= self.rules.max_player_turns).any(axis=1)
+        # Higher HP wins; an exact tie is settled by rules.resolution
+        h1, h2 = self.health[:, 0], self.health[:, 1]
+        tie = TIE_WINNER[self.rules.resolution]
+        self.winner[limit] = np.where(h1 > h2, 0, np.where(h2 > h1, 1, tie))[limit]
+        self.done |= limit
+        self.current = np.where(active & ~limit, 1 - self.current, self.current).astype(np.int8)
+        return valid
+
+    def pre_shield(self, cards, special):
+        # cards: (N,) hand index or -1 to skip; applies to the current player
+        g = np.arange(self.n)
+        p = self.current.astype(np.int64)
+        chosen = (cards >= 0) & (cards < self.hand_len[g, p])
+        cid = np.where(chosen, self.hand[g, p, np.clip(cards, 0, MAX_HAND - 1)], EMPTY)
+        suit = SUIT_OF[cid]
+        ok = chosen & ((suit == DENARI) | (special & (suit == BASTONI) & (self.char_suit[g, p] == BASTONI)))
+        gs = np.nonzero(ok)[0]
+        ps = p[gs]
+        self._add_shield(gs, ps, cid[gs])
+        slots = np.arange(MAX_HAND)
+        hand = self.hand[gs, ps]
+        keep = (slots < self.hand_len[gs, ps][:, None]) & (slots != cards[gs][:, None])
+        keep_order = np.argsort(np.where(keep, slots, MAX_HAND + slots), axis=1, kind="stable")
+        self.hand[gs, ps] = np.where(slots < (self.hand_len[gs, ps] - 1)[:, None],
+                                     np.take_along_axis(hand, keep_order, axis=1), EMPTY)
+        self.hand_len[gs, ps] -= 1
+        everyone = np.ones(self.n, dtype=bool)
+        self._draw(everyone, self.current, self.hand_size[g, p] - self.hand_len[g, p])
+        self.current = (1 - self.current).astype(np.int8)
+        return ok
+
+    def to_compact(self, i):
+        # Game i as a pair of compact.CompactPlayer, for inspection and checks
+        players = []
+        for p in range(2):
+            face = int(self.faces[i, p])
+            character = CompactCharacter(FACES[face % 3], face // 3)
+            head, size = int(self.stack_head[i, p]), int(self.stack_len[i, p])
+            stack = [int(self.stack[i, p, (head + j) % ZONE]) for j in range(size)]
+            player = CompactPlayer(character, stack)
+            player.hand.extend(int(c) for c in self.hand[i, p, :self.hand_len[i, p]])
+            player.shields.extend(int(c) for c in self.shields[i, p, :self.shield_len[i, p]])
+            player.health = int(self.health[i, p])
+            player.turns_played = int(self.turns_played[i, p])
+            players.append(player)
+        return players
+
+# -----------------------------
+# Vectorized random policy
+# -----------------------------
+def random_pre_shield(games, rng):
+    g = np.arange(games.n)
+    p = games.current
+    slots = np.arange(MAX_HAND)
+    suit = SUIT_OF[games.hand[g, p]]
+    bastoni = (games.char_suit[g, p] == BASTONI)[:, None] & (suit == BASTONI)
+    option = (slots < games.hand_len[g, p][:, None]) & ((suit == DENARI) | bastoni)
+    key = np.where(option, rng.random((games.n, MAX_HAND)), 2.0)
+    pick = np.argmin(key, axis=1)
+    cards = np.where(option.any(axis=1) & (rng.random(games.n) >= 0.25), pick, EMPTY)
+    special = np.take_along_axis(bastoni, pick[:, None], axis=1)[:, 0]
+    return cards, special
+
+def random_actions(games, rng):
+    # Character-suit cards in random order, optionally closed by any other card
+    n = games.n
+    g = np.arange(n)
+    p = games.current
+    slots = np.arange(MAX_HAND)
+    hand_len = games.hand_len[g, p]
+    in_hand = slots < hand_len[:, None]
+    suit = SUIT_OF[games.hand[g, p]]
+    char_suit = games.char_suit[g, p][:, None]
+    is_suit = in_hand & (suit == char_suit)
+    noise = rng.random((n, MAX_HAND))
+    order = np.argsort(np.where(is_suit, noise, np.where(in_hand, 1 + noise, 3)), axis=1)
+    n_suit = is_suit.sum(axis=1)
+    take = np.floor(rng.random(n) * (n_suit + 1)).astype(np.int64)
+    closer = (take < hand_len) & ((take == 0) | (rng.random(n) < 0.5))
+    n_play = take + closer
+    n_play[(hand_len == 0) | (rng.random(n) < 0.1)] = 0
+    cards = np.where(slots < n_play[:, None], order, EMPTY)
+    played_suit = np.take_along_axis(suit, order, axis=1)
+    special_ok = (((char_suit == SPADE) & (played_suit == COPPE)) |
+                  ((char_suit == COPPE) & (played_suit == SPADE)) |
+                  ((char_suit == BASTONI) & (played_suit == BASTONI)))
+    special = special_ok & (rng.random((n, MAX_HAND)) < 0.5) & (cards >= 0)
+    as_shield = special & (char_suit == BASTONI) & (rng.random((n, MAX_HAND)) < 0.5)
+    return cards, special, as_shield
+
+def run_games(n, rng, p1_faces=None, p2_faces=None):
+    games = VectorGames(n, rng, p1_faces, p2_faces)
+    games.pre_shield(*random_pre_shield(games, rng))
+    games.pre_shield(*random_pre_shield(games, rng))
+    while not games.done.all():
+        games.step(*random_actions(games, rng))
+    return games
+
+def pairing_sweep(games_per_pair, seed=None):
+    # Random-policy win rates for every ordered character pairing
+    rng = np.random.default_rng(seed)
+    p1_faces, p2_faces = np.nonzero(~np.eye(12, dtype=bool))
+    p1_faces = np.repeat(p1_faces, games_per_pair)
+    p2_faces = np.repeat(p2_faces, games_per_pair)
+    games = run_games(len(p1_faces), rng, p1_faces, p2_faces)
+    results = {}
+    for a in range(12):
+        for b in range(12):
+            if a == b:
+                continue
+            mask = (games.faces[:, 0] == a) & (games.faces[:, 1] == b)
+            winners = games.winner[mask]
+            key = (f"{FACES[a % 3]} of {SUITS[a // 3]}", f"{FACES[b % 3]} of {SUITS[b // 3]}")
+            results[key] = {
+                "p1": int((winners == 0).sum()),
+                "p2": int((winners == 1).sum()),
+                "tie": int((winners == 2).sum()),
+            }
+    return results
+
+def main():
+    parser = argparse.ArgumentParser(description="Run Disfida games in NumPy lockstep")
+    parser.add_argument("-n", "--games", type=int, default=100000)
+    parser.add_argument("--seed", type=int, default=None)
+    parser.add_argument("--sweep", type=int, default=0, help="games per character pairing")
+    args = parser.parse_args()
+    start = time.perf_counter()
+    if args.sweep:
+        results = pairing_sweep(args.sweep, args.seed)
+        total = args.sweep * len(results)
+        for (p1, p2), r in sorted(results.items()):
+            print(f"{p1:>18} vs {p2:<18} P1 {r['p1'] / args.sweep:6.1%}  P2 {r['p2'] / args.sweep:6.1%}  tie {r['tie'] / args.sweep:6.1%}")
+    else:
+        games = run_games(args.games, np.random.default_rng(args.seed))
+        total = args.games
+        print(f"Player 1 wins: {(games.winner == 0).sum()}, Player 2 wins: {(games.winner == 1).sum()}, "
+              f"ties: {(games.winner == 2).sum()}, knockouts: {games.knockout.sum()}")
+    elapsed = time.perf_counter() - start
+    print(f"{total} games in {elapsed:.2f}s ({total / elapsed:.0f} games/sec)")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,171 @@
+# zobrist.py
+# Incremental position hashing and a bounded transposition table.
+# Hands and shields are hashed as sets (XOR of per-card keys). Stacks are
+# order-sensitive, so each one is a polynomial hash mod 2**61 - 1 that can
+# drop its top card and append at the bottom in O(1).
+import random
+from collections import OrderedDict
+from search_state import make_move
+
+MASK64 = (1 << 64) - 1
+PRIME = (1 << 61) - 1
+BASE = 1000003
+BASE_INV = pow(BASE, PRIME - 2, PRIME)
+BASE_POW = [pow(BASE, i, PRIME) for i in range(41)]
+HEALTH_OFFSET = 64  # health can drop below zero on the killing blow
+MAX_TURNS = 254  # largest rules.max_player_turns the turn keys cover
+
+_rng = random.Random(0x5EED)
+def _keys(n):
+    return [_rng.getrandbits(64) for _ in range(n)]
+
+HAND_KEYS = [_keys(40), _keys(40)]
+SHIELD_KEYS = [_keys(40), _keys(40)]
+STACK_KEYS = [[k % PRIME for k in _keys(40)], [k % PRIME for k in _keys(40)]]
+HEALTH_KEYS = [_keys(128), _keys(128)]
+TURN_KEYS = [_keys(MAX_TURNS + 2), _keys(MAX_TURNS + 2)]
+STACK_MIX = [_rng.getrandbits(64) | 1, _rng.getrandbits(64) | 1]
+
+class PositionHash:
+    __slots__ = ("zob", "stacks", "key")
+
+    def __init__(self, zob, stacks):
+        self.zob = zob
+        self.stacks = stacks
+        self.key = zob ^ ((stacks[0] * STACK_MIX[0]) & MASK64) ^ ((stacks[1] * STACK_MIX[1]) & MASK64)
+
+def stack_hash(side, stack):
+    keys = STACK_KEYS[side]
+    return sum(keys[card.id] * BASE_POW[i] for i, card in enumerate(stack)) % PRIME
+
+def _push_bottom(h, side, card, length):
+    return (h + STACK_KEYS[side][card.id] * BASE_POW[length]) % PRIME
+
+def _pop_top(h, side, card):
+    return ((h - STACK_KEYS[side][card.id]) * BASE_INV) % PRIME
+
+def _zone_xor(keys, cards):
+    h = 0
+    for card in cards:
+        h ^= keys[card.id]
+    return h
+
+class ZobristHasher:
+    def __init__(self, p1, p2):
+        self.players = (p1, p2)
+
+    def side(self, player):
+        return 0 if player is self.players[0] else 1
+
+    def full(self):
+        zob = 0
+        stacks = []
+        for side, player in enumerate(self.players):
+            zob ^= _zone_xor(HAND_KEYS[side], player.hand)
+            zob ^= _zone_xor(SHIELD_KEYS[side], player.shields)
+            zob ^= HEALTH_KEYS[side][player.health + HEALTH_OFFSET]
+            zob ^= TURN_KEYS[side][player.turns_played]
+            stacks.append(stack_hash(side, player.stack))
+        return PositionHash(zob, tuple(stacks))
+
+    def make(self, position, player, opponent, action):
+        # Plays the move and returns (delta, new position hash); undo with
+        # search_state.unmake_move(delta) and keep using the old hash.
+        delta = make_move(player, opponent, action)
+        side = self.side(player)
+        other = 1 - side
+        zob = position.zob
+        zob ^= _zone_xor(HAND_KEYS[side], delta.hand) ^ _zone_xor(HAND_KEYS[side], player.hand)
+        zob ^= _zone_xor(SHIELD_KEYS[side], delta.shields) ^ _zone_xor(SHIELD_KEYS[side], player.shields)
+        zob ^= _zone_xor(SHIELD_KEYS[other], delta.opp_shields) ^ _zone_xor(SHIELD_KEYS[other], opponent.shields)
+        zob ^= HEALTH_KEYS[side][delta.health + HEALTH_OFFSET] ^ HEALTH_KEYS[side][player.health + HEALTH_OFFSET]
+        zob ^= HEALTH_KEYS[other][delta.opp_health + HEALTH_OFFSET] ^ HEALTH_KEYS[other][opponent.health + HEALTH_OFFSET]
+        if delta.valid:
+            zob ^= TURN_KEYS[side][player.turns_played - 1] ^ TURN_KEYS[side][player.turns_played]
+        stacks = list(position.stacks)
+        # Own stack: cycled cards went to the bottom, then the refill drew from the top
+        h = stacks[side]
+        length = delta.stack_len
+        for card in (delta.drawn + list(player.stack))[delta.stack_len:]:
+            h = _push_bottom(h, side, card, length)
+            length += 1
+        for card in delta.drawn:
+            h = _pop_top(h, side, card)
+        stacks[side] = h
+        h = stacks[other]
+        for length in range(delta.opp_stack_len, len(opponent.stack)):
+            h = _push_bottom(h, other, opponent.stack[length], length)
+        stacks[other] = h
+        return delta, PositionHash(zob, tuple(stacks))
+
+# -----------------------------
+# Transposition table
+# -----------------------------
+EXACT, LOWER, UPPER = range(3)
+
+class TTEntry:
+    __slots__ = ("key", "depth", "value", "best", "flag")
+
+    def __init__(self, key, depth, value, best, flag):
+        self.key = key
+        self.depth = depth
+        self.value = value
+        self.best = best
+        self.flag = flag
+
+class TranspositionTable:
+    # policy "lru": evict the least recently used entry when full.
+    # policy "depth": fixed slots indexed by key; a deeper or equal search
+    # replaces the stored entry, a shallower one is dropped.
+    def __init__(self, capacity=1 << 20, policy="lru"):
+        if policy not in ("lru", "depth"):
+            raise ValueError(f"Unknown replacement policy: {policy}")
+        self.capacity = capacity
+        self.policy = policy
+        self.hits = 0
+        self.misses = 0
+        if policy == "lru":
+            self.entries = OrderedDict()
+        else:
+            self.slots = [None] * capacity
+
+    def get(self, key):
+        if self.policy == "lru":
+            entry = self.entries.get(key)
+            if entry is not None:
+                self.entries.move_to_end(key)
+        else:
+            entry = self.slots[key % self.capacity]
+            if entry is not None and entry.key != key:
+                entry = None
+        if entry is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        return entry
+
+    def put(self, key, depth, value, best=None, flag=EXACT):
+        entry = TTEntry(key, depth, value, best, flag)
+        if self.policy == "lru":
+            self.entries[key] = entry
+            self.entries.move_to_end(key)
+            if len(self.entries) > self.capacity:
+                self.entries.popitem(last=False)
+        else:
+            index = key % self.capacity
+            old = self.slots[index]
+            if old is None or old.key == key or depth >= old.depth:
+                self.slots[index] = entry
+
+    def __len__(self):
+        if self.policy == "lru":
+            return len(self.entries)
+        return sum(1 for entry in self.slots if entry is not None)
+
+    def clear(self):
+        self.hits = 0
+        self.misses = 0
+        if self.policy == "lru":
+            self.entries.clear()
+        else:
+            self.slots = [None] * self.capacity
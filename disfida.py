@@ -1,10 +1,37 @@
+import argparse
+import os
 import random
 import math
+import sys
+import time
+
+# -----------------------------
+# Rules (rules.py is shared with disfida-gui)
+# -----------------------------
+def use_gui_modules():
+    """Make the disfida-gui modules importable"""
+    gui_dir = os.path.join(os.path.dirname(os.path.abspath(__file__)), "disfida-gui")
+    if gui_dir not in sys.path:
+        sys.path.insert(0, gui_dir)
+
+use_gui_modules()
+from rules import Rules, load_rules
+from card_game_logic import game_rng
+
+RULES = Rules()  # this game has no turn limit, so max_player_turns and resolution are unused
+
+def set_rules(rules):
+    """Play under these rules, here and in the disfida-gui engine the bots search with"""
+    global RULES
+    import card_game_logic
+    RULES = card_game_logic.RULES = rules
 
 # -----------------------------
 # Data structures
 # -----------------------------
 class Card:
+    __slots__ = ("suit", "rank", "value")
+
     def __init__(self, suit, rank):
         self.suit = suit
         self.rank = rank
@@ -19,25 +46,26 @@ class Card:
         return f"{self.rank} of {self.suit}"
 
 class Character:
+    __slots__ = ("face", "suit", "attack_bonus", "defense_bonus", "heal_bonus", "stack_size", "hand_size")
+
     def __init__(self, face, suit):
         self.face = face
         self.suit = suit
         # Set bonuses
-        self.attack_bonus = 1 if face == "Cavallo" else 0
-        self.defense_bonus = 2 if face == "Re" else 0
-        self.heal_bonus = 2 if face == "Fante" else 0
+        self.attack_bonus, self.defense_bonus, self.heal_bonus = RULES.bonuses(face)
         # Coin character gets extra cards
-        self.stack_size = 13 if suit == "Denari" else 12
-        self.hand_size = 5 if suit == "Denari" else 4
+        self.stack_size, self.hand_size = RULES.sizes(suit == "Denari")
 
 class Player:
+    __slots__ = ("name", "character", "stack", "hand", "shields", "health")
+
     def __init__(self, name, character, stack):
         self.name = name
         self.character = character
         self.stack = stack
         self.hand = []
         self.shields = []  # List of active Card objects
-        self.health = 40
+        self.health = RULES.health
 
 # -----------------------------
 # Helper functions
@@ -55,29 +83,29 @@ def create_face_cards():
     faces = ["Fante", "Cavallo", "Re"]
     return [Card(s, f) for s in suits for f in faces]
 
-def print_rules_summary():
+def print_rules_summary(read=input, write=print):
     """Print concise rules at game start"""
-    print("=" * 50)
-    print("ITALIAN CARD COMBAT - RULES SUMMARY")
-    print("=" * 50)
-    print("OBJECTIVE: Reduce opponent's HP to 0 or less")
-    print("DECK: 40-card Italian deck (A=11, 2-7, Fante/Cavallo/Re=10)")
-    print("START: 40 HP each, 4-card hand (5 for Coins char)")
-    print("\nCHARACTERS & BONUSES:")
-    print("• Re (King): +2 defense per shield")
-    print("• Cavallo (Knight): +1 attack per attack card")
-    print("• Fante (Page): +2 healing per healing card")
-    print("\nSUIT SPECIALS:")
-    print("• Coins: Wealth of Choice - +1 card in stack/hand (passive)")
-    print("• Swords: Blood Price - Use Cups as attacks (ignore shields, self-damage)")
-    print("• Cups: Charity's Burden - Use Swords as healing (opponent gains half)")
-    print("• Clubs: Iron Versatility - Clubs can be attack OR shield")
-    print("\nCOMBOS: Sequence of character-suit cards + optional 1 non-suit card")
-    print("TURNS: Skip, play 1 card, or play combo. Draw to hand size at turn end")
-    print("SHIELDS: Visible on table, destroyed smallest→largest, cycle to deck bottom")
-    print("WIN: Opponent HP ≤ 0 (ties possible)")
-    print("=" * 50)
-    input("\nPress Enter to continue...")
+    write("=" * 50)
+    write("ITALIAN CARD COMBAT - RULES SUMMARY")
+    write("=" * 50)
+    write("OBJECTIVE: Reduce opponent's HP to 0 or less")
+    write("DECK: 40-card Italian deck (A=11, 2-7, Fante/Cavallo/Re=10)")
+    write(f"START: {RULES.health} HP each, {RULES.hand_size}-card hand ({RULES.denari_hand_size} for Coins char)")
+    write("\nCHARACTERS & BONUSES:")
+    write(f"• Re (King): +{RULES.re_defense_bonus} defense per shield")
+    write(f"• Cavallo (Knight): +{RULES.cavallo_attack_bonus} attack per attack card")
+    write(f"• Fante (Page): +{RULES.fante_heal_bonus} healing per healing card")
+    write("\nSUIT SPECIALS:")
+    write(f"• Coins: Wealth of Choice - {RULES.wealth_of_choice()} (passive)")
+    write("• Swords: Blood Price - Use Cups as attacks (ignore shields, self-damage)")
+    write("• Cups: Charity's Burden - Use Swords as healing (opponent gains half)")
+    write("• Clubs: Iron Versatility - Clubs can be attack OR shield")
+    write("\nCOMBOS: Sequence of character-suit cards + optional 1 non-suit card")
+    write("TURNS: Skip, play 1 card, or play combo. Draw to hand size at turn end")
+    write("SHIELDS: Visible on table, destroyed smallest→largest, cycle to deck bottom")
+    write("WIN: Opponent HP ≤ 0 (ties possible)")
+    write("=" * 50)
+    read("\nPress Enter to continue...")
 
 def draw_cards(player, n):
     """Draw n cards from stack to hand"""
@@ -91,78 +119,78 @@ def draw_cards(player, n):
             break
     return drawn
 
-def print_game_state(p1, p2, active_player):
+def print_game_state(p1, p2, active_player, write=print):
     """Display current game state - side by side layout"""
     # Clear screen (works on most terminals)
-    print("\033[H\033[J", end="")
+    write("\033[H\033[J", end="")
     
-    print("="*80)
-    print("ITALIAN CARD COMBAT" + " " * 28 + "TURN")
-    print("="*80)
+    write("="*80)
+    write("ITALIAN CARD COMBAT" + " " * 28 + "TURN")
+    write("="*80)
     
     # Player 0 info (left side)
     p1_info = f"{p1.name}: {p1.character.face} of {p1.character.suit} | HP: {p1.health}"
-    print(f"{p1_info:<38}", end="")
+    write(f"{p1_info:<38}", end="")
     
     # Turn indicator (center)
     active_name = "Player 0" if active_player == p1 else "Player 1"
     turn_marker = f"ACTIVE: {active_name}" if active_player == p1 else f"ACTIVE: {active_name}"
-    print(f"{turn_marker:>40}")
+    write(f"{turn_marker:>40}")
     
     # Player 0 bonuses and shields
     bonus_str = f"Bonuses: +{p1.character.attack_bonus} atk, +{p1.character.heal_bonus} heal, +{p1.character.defense_bonus} def/shield"
-    print(f"{bonus_str:<38}", end="")
-    print(" " * 40)
+    write(f"{bonus_str:<38}", end="")
+    write(" " * 40)
     
     if p1.shields:
         shields_str = ", ".join([str(c) for c in p1.shields])
-        print(f"Shields: {shields_str:<30}", end="")
+        write(f"Shields: {shields_str:<30}", end="")
     else:
-        print("Shields: None              ", end="")
-    print(" " * 40)
+        write("Shields: None              ", end="")
+    write(" " * 40)
     
-    print("-" * 38 + " " * 40 + "-" * 40)
+    write("-" * 38 + " " * 40 + "-" * 40)
     
     # Player 1 info (right side)
     p2_info = f"{p2.name}: {p2.character.face} of {p2.character.suit} | HP: {p2.health}"
-    print(" " * 38, end="")
-    print(f"{p2_info:>40}")
+    write(" " * 38, end="")
+    write(f"{p2_info:>40}")
     
     # Player 1 bonuses and shields
     bonus_str = f"Bonuses: +{p2.character.attack_bonus} atk, +{p2.character.heal_bonus} heal, +{p2.character.defense_bonus} def/shield"
-    print(" " * 38, end="")
-    print(f"{bonus_str:>40}")
+    write(" " * 38, end="")
+    write(f"{bonus_str:>40}")
     
     if p2.shields:
         shields_str = ", ".join([str(c) for c in p2.shields])
-        print(" " * 38, end="")
-        print(f"Shields: {shields_str:>40}")
+        write(" " * 38, end="")
+        write(f"Shields: {shields_str:>40}")
     else:
-        print(" " * 38, end="")
-        print("Shields: None              ", end="")
-    print()
+        write(" " * 38, end="")
+        write("Shields: None              ", end="")
+    write()
     
-    print("-" * 80)
+    write("-" * 80)
     
     # Active player's hand (bottom)
     hand_size = active_player.character.hand_size
-    print(f"\n{active_player.name}'s Hand ({len(active_player.hand)}/{hand_size}):")
-    print("-" * 80)
+    write(f"\n{active_player.name}'s Hand ({len(active_player.hand)}/{hand_size}):")
+    write("-" * 80)
     for idx, card in enumerate(active_player.hand):
-        print(f"  {idx+1:2d}: {card}")
+        write(f"  {idx+1:2d}: {card}")
     
     # Inactive player's hand (if not active player)
     if active_player != p1:
-        print(f"\n{p1.name}'s Hand ({len(p1.hand)}/{p1.character.hand_size}):")
+        write(f"\n{p1.name}'s Hand ({len(p1.hand)}/{p1.character.hand_size}):")
         for idx, card in enumerate(p1.hand):
-            print(f"  {idx+1:2d}: {card}")
+            write(f"  {idx+1:2d}: {card}")
     else:
-        print(f"\n{p2.name}'s Hand ({len(p2.hand)}/{p2.character.hand_size}):")
+        write(f"\n{p2.name}'s Hand ({len(p2.hand)}/{p2.character.hand_size}):")
         for idx, card in enumerate(p2.hand):
-            print(f"  {idx+1:2d}: {card}")
+            write(f"  {idx+1:2d}: {card}")
     
-    print("="*80)
-    print("Commands: '1' (single card), '1,2,3' (combo), '3s' (special), '0' (skip)")
+    write("="*80)
+    write("Commands: '1' (single card), '1,2,3' (combo), '3s' (special), '0' (skip)")
 
 def validate_combo(actions, player):
     """Validate combo rules: same-suit cards matching character suit + optional 1 non-suit"""
@@ -194,7 +222,7 @@ def move_card_to_bottom(player, card):
     """Move any played/removed card to bottom of stack"""
     player.stack.append(card)
 
-def remove_shields_for_attack(opponent, attack_value):
+def remove_shields_for_attack(opponent, attack_value, write=print):
     """Remove shields smallest→largest until cumulative >= attack"""
     if not opponent.shields:
         return attack_value
@@ -220,33 +248,33 @@ def remove_shields_for_attack(opponent, attack_value):
     # Log shield removal
     if removed_shields:
         shields_str = ", ".join([str(s) for s in removed_shields])
-        print(f"  Shields {shields_str} absorbed attack, sent to bottom of deck")
+        write(f"  Shields {shields_str} absorbed attack, sent to bottom of deck")
     
     return max(0, remaining)
 
-def apply_heal(player, card, opponent, turn_summary):
+def apply_heal(player, card, opponent, turn_summary, write=print):
     """Apply healing with character bonus and suit specials"""
     heal_amount = card.value + player.character.heal_bonus
     old_health = player.health
-    player.health = min(40, player.health + heal_amount)
+    player.health = min(RULES.health, player.health + heal_amount)
     
     # Cups special: Charity's Burden - opponent gains floor(value/2)
     opponent_bonus = 0
     if player.character.suit == "Coppe" and card.suit == "Spade":
-        opponent_bonus = card.value // 2
+        opponent_bonus = card.value // RULES.charity_divisor
         old_opp_health = opponent.health
-        opponent.health = min(40, opponent.health + opponent_bonus)
+        opponent.health = min(RULES.health, opponent.health + opponent_bonus)
         turn_summary.append(f"Heal {card}: +{heal_amount} HP ({player.health-old_health}), +{opponent_bonus} to opponent ({opponent.health-old_opp_health})")
     else:
         turn_summary.append(f"Heal {card}: +{heal_amount} HP ({player.health-old_health})")
     
-    print(f"  {player.name} heals {heal_amount}, health now {player.health}")
+    write(f"  {player.name} heals {heal_amount}, health now {player.health}")
     if opponent_bonus > 0:
-        print(f"  Charity's Burden: {opponent.name} gains {opponent_bonus} HP")
+        write(f"  Charity's Burden: {opponent.name} gains {opponent_bonus} HP")
     
     return heal_amount, opponent_bonus
 
-def apply_attack(player, card, opponent, ignore_shields=False, turn_summary=None):
+def apply_attack(player, card, opponent, ignore_shields=False, turn_summary=None, write=print):
     """Apply attack with character bonus and suit specials"""
     attack_value = card.value + player.character.attack_bonus
     
@@ -256,42 +284,42 @@ def apply_attack(player, card, opponent, ignore_shields=False, turn_summary=None
         opponent.health -= attack_value
         if turn_summary:
             turn_summary.append(f"Blood Price attack {card}: {attack_value} damage (ignores shields)")
-        print(f"  {player.name} attacks for {attack_value} (ignores shields)")
+        write(f"  {player.name} attacks for {attack_value} (ignores shields)")
     else:
         # Normal attack vs shields
-        remaining_damage = remove_shields_for_attack(opponent, attack_value)
+        remaining_damage = remove_shields_for_attack(opponent, attack_value, write)
         if remaining_damage > 0:
             old_health = opponent.health
             opponent.health -= remaining_damage
             if turn_summary:
                 turn_summary.append(f"Attack {card}: {attack_value} total, {remaining_damage} damage after shields")
-            print(f"  {player.name} attacks for {attack_value}, {remaining_damage} damage after shields")
+            write(f"  {player.name} attacks for {attack_value}, {remaining_damage} damage after shields")
         else:
             if turn_summary:
                 turn_summary.append(f"Attack {card}: {attack_value} total, 0 damage (blocked by shields)")
-            print(f"  {player.name} attacks for {attack_value}, all blocked by shields")
+            write(f"  {player.name} attacks for {attack_value}, all blocked by shields")
     
     # Swords special self-damage (Blood Price)
     self_damage = 0
     if player.character.suit == "Spade" and card.suit == "Coppe":
-        self_damage = card.value // 2
+        self_damage = card.value // RULES.blood_price_divisor
         old_self_health = player.health
         player.health -= self_damage
         if turn_summary:
             turn_summary.append(f"Blood Price self-damage: -{self_damage} HP ({player.health-old_self_health})")
-        print(f"  {player.name} suffers Blood Price self-damage {self_damage}, health now {player.health}")
+        write(f"  {player.name} suffers Blood Price self-damage {self_damage}, health now {player.health}")
     
     return attack_value, remaining_damage if not ignore_shields else attack_value, self_damage
 
-def apply_shield(player, card, turn_summary):
+def apply_shield(player, card, turn_summary, write=print):
     """Add shield to active shields"""
     effective_value = card.value + player.character.defense_bonus
     player.shields.append(card)
     if turn_summary:
         turn_summary.append(f"Shield {card}: +{effective_value} defense")
-    print(f"  {player.name} plays shield {card} (effective: {effective_value})")
+    write(f"  {player.name} plays shield {card} (effective: {effective_value})")
 
-def parse_input(inp, player):
+def parse_input(inp, player, write=print):
     """Parse input string into list of (index, special_flag) tuples"""
     if inp.strip() == "0":
         return []
@@ -312,11 +340,11 @@ def parse_input(inp, player):
         try:
             idx = int(part) - 1
             if idx < 0 or idx >= len(player.hand):
-                print(f"  Invalid card index {part}. Must be 1-{len(player.hand)}")
+                write(f"  Invalid card index {part}. Must be 1-{len(player.hand)}")
                 return None
             actions.append((idx, special))
         except ValueError:
-            print(f"  Invalid input: '{part}'")
+            write(f"  Invalid input: '{part}'")
             return None
     
     return actions
@@ -334,37 +362,37 @@ def can_use_special(player, card, special_flag):
         return True  # Iron Versatility
     return False
 
-def print_turn_summary(player, turn_summary):
+def print_turn_summary(player, turn_summary, write=print):
     """Print summary of turn effects"""
     if not turn_summary:
         return
     
-    print(f"\n--- {player.name}'s Turn Summary ---")
+    write(f"\n--- {player.name}'s Turn Summary ---")
     for effect in turn_summary:
-        print(f"  {effect}")
-    print("--------------------------------")
+        write(f"  {effect}")
+    write("--------------------------------")
 
-def resolve_turn(player, opponent):
+def resolve_turn(player, opponent, read=input, write=print):
     """Handle complete turn resolution"""
-    print(f"\n{player.name}'s turn. Enter cards to play (e.g., '1' or '1,2,3' or '3s'). '0' to skip.")
+    write(f"\n{player.name}'s turn. Enter cards to play (e.g., '1' or '1,2,3' or '3s'). '0' to skip.")
     turn_summary = []
     
     while True:
-        inp = input("> ").strip()
-        actions = parse_input(inp, player)
+        inp = read("> ").strip()
+        actions = parse_input(inp, player, write)
         
         if actions is None:
             continue  # Invalid input, try again
         
         if not actions:
             # Skip turn
-            print(f"{player.name} skips turn")
-            print_turn_summary(player, turn_summary)
+            write(f"{player.name} skips turn")
+            print_turn_summary(player, turn_summary, write)
             return
         
         # Validate combo rules
         if not validate_combo(actions, player):
-            print("  Invalid combo! Must be character-suit cards + optional 1 non-suit card.")
+            write("  Invalid combo! Must be character-suit cards + optional 1 non-suit card.")
             continue
         
         # Check special plays validity
@@ -372,14 +400,14 @@ def resolve_turn(player, opponent):
         for idx, special in actions:
             card = player.hand[idx]
             if special and not can_use_special(player, card, special):
-                print(f"  Error: {card} has no special play for {player.character.face} of {player.character.suit}")
+                write(f"  Error: {card} has no special play for {player.character.face} of {player.character.suit}")
                 special_error = True
                 break
         if special_error:
             continue
         
         # FIXED: Extract all cards FIRST, then remove from hand, then process
-        print(f"{player.name} plays combo:")
+        write(f"{player.name} plays combo:")
         cards_to_play = []
         for idx, special in actions:
             card = player.hand[idx]
@@ -395,31 +423,31 @@ def resolve_turn(player, opponent):
             if special:
                 if player.character.suit == "Bastoni" and card.suit == "Bastoni":
                     # Clubs special: choose attack or shield
-                    choice = input(f"  Play {card} as attack (a) or shield (s)? ").strip().lower()
+                    choice = read(f"  Play {card} as attack (a) or shield (s)? ").strip().lower()
                     if choice == 'a':
-                        apply_attack(player, card, opponent, turn_summary=turn_summary)
+                        apply_attack(player, card, opponent, turn_summary=turn_summary, write=write)
                     elif choice == 's':
-                        apply_shield(player, card, turn_summary)
+                        apply_shield(player, card, turn_summary, write)
                     else:
-                        print("  Invalid choice, treated as attack")
-                        apply_attack(player, card, opponent, turn_summary=turn_summary)
+                        write("  Invalid choice, treated as attack")
+                        apply_attack(player, card, opponent, turn_summary=turn_summary, write=write)
                 
                 elif player.character.suit == "Spade" and card.suit == "Coppe":
                     # Swords special: Blood Price (Cups as attack)
-                    apply_attack(player, card, opponent, ignore_shields=True, turn_summary=turn_summary)
+                    apply_attack(player, card, opponent, ignore_shields=True, turn_summary=turn_summary, write=write)
                 
                 elif player.character.suit == "Coppe" and card.suit == "Spade":
                     # Cups special: Charity's Burden (Swords as heal)
-                    apply_heal(player, card, opponent, turn_summary)
+                    apply_heal(player, card, opponent, turn_summary, write)
             
             else:
                 # Default roles
                 if card.suit == "Denari":
-                    apply_shield(player, card, turn_summary)
+                    apply_shield(player, card, turn_summary, write)
                 elif card.suit == "Coppe":
-                    apply_heal(player, card, opponent, turn_summary)
+                    apply_heal(player, card, opponent, turn_summary, write)
                 else:  # Spade or Bastoni
-                    apply_attack(player, card, opponent, turn_summary=turn_summary)
+                    apply_attack(player, card, opponent, turn_summary=turn_summary, write=write)
         
         # Cycle only non-shield cards to bottom of deck
         # (Shields remain in shields list until destroyed by attacks)
@@ -429,35 +457,35 @@ def resolve_turn(player, opponent):
         
         # Check for immediate victory
         if opponent.health <= 0:
-            print(f"\n{player.name}'s combo defeats {opponent.name}!")
+            write(f"\n{player.name}'s combo defeats {opponent.name}!")
         
         # Print turn summary
-        print_turn_summary(player, turn_summary)
+        print_turn_summary(player, turn_summary, write)
         
         break  # Successfully resolved turn
 
-def player_zero_pre_shield(player, opponent):
+def player_zero_pre_shield(player, opponent, read=input, write=print):
     """Player 0's special starting shield play - single card only, Clubs can use special"""
-    print(f"\n{player.name} may play one shield before game begins.")
-    print_game_state(player, opponent, player)
+    write(f"\n{player.name} may play one shield before game begins.")
+    print_game_state(player, opponent, player, write)
     
     while True:
-        print("Enter ONE card number (1-5) for shield or '0' to skip:")
-        inp = input("> ").strip()
+        write("Enter ONE card number (1-5) for shield or '0' to skip:")
+        inp = read("> ").strip()
         
         if inp == "0":
-            print(f"{player.name} skips pre-shield")
+            write(f"{player.name} skips pre-shield")
             # Refill hand to proper size after skipping
             needed = player.character.hand_size - len(player.hand)
             if needed > 0:
                 drawn = draw_cards(player, needed)
                 if drawn > 0:
-                    print(f"{player.name} draws {drawn} card(s) to hand")
+                    write(f"{player.name} draws {drawn} card(s) to hand")
             return
         
-        actions = parse_input(inp, player)
+        actions = parse_input(inp, player, write)
         if actions is None or len(actions) != 1:
-            print("  Invalid: must be exactly ONE card (e.g., '1' or '3s')")
+            write("  Invalid: must be exactly ONE card (e.g., '1' or '3s')")
             continue
         
         idx, special = actions[0]
@@ -469,20 +497,20 @@ def player_zero_pre_shield(player, opponent):
         # Check if this card can be played as a shield
         if card.suit == "Denari":
             # Coins can always be shields
-            apply_shield(player, card, None)  # No turn summary for pre-shield
-            print(f"{player.name} plays starting shield!")
+            apply_shield(player, card, None, write)  # No turn summary for pre-shield
+            write(f"{player.name} plays starting shield!")
             break
         elif special and player.character.suit == "Bastoni" and card.suit == "Bastoni":
             # Clubs special: allow Club as shield
-            apply_shield(player, card, None)  # No turn summary for pre-shield
-            print(f"{player.name} plays starting shield {card} (Club special)!")
+            apply_shield(player, card, None, write)  # No turn summary for pre-shield
+            write(f"{player.name} plays starting shield {card} (Club special)!")
             break
         else:
-            print(f"  Invalid: {card} cannot be played as a shield")
+            write(f"  Invalid: {card} cannot be played as a shield")
             # Put card back in hand
             player.hand.insert(idx, card)
             if special and not can_use_special(player, card, special):
-                print(f"  (Special play also invalid for {player.character.face} of {player.character.suit})")
+                write(f"  (Special play also invalid for {player.character.face} of {player.character.suit})")
             continue
     
     # After playing shield, refill hand to proper size
@@ -490,49 +518,50 @@ def player_zero_pre_shield(player, opponent):
     if needed > 0:
         drawn = draw_cards(player, needed)
         if drawn > 0:
-            print(f"{player.name} draws {drawn} card(s) to reach full hand size")
+            write(f"{player.name} draws {drawn} card(s) to reach full hand size")
 
-def check_victory(p1, p2):
+def check_victory(p1, p2, write=print):
     """Check for victory conditions including ties"""
     if p1.health <= 0 and p2.health <= 0:
-        print("\n*** DOUBLE KNOCKOUT - IT'S A TIE! ***")
+        write("\n*** DOUBLE KNOCKOUT - IT'S A TIE! ***")
         return True
     elif p1.health <= 0:
-        print(f"\n*** {p2.name} WINS! ***")
+        write(f"\n*** {p2.name} WINS! ***")
         return True
     elif p2.health <= 0:
-        print(f"\n*** {p1.name} WINS! ***")
+        write(f"\n*** {p1.name} WINS! ***")
         return True
     return False
 
-def refill_hand(player):
+def refill_hand(player, write=print):
     """Draw cards to refill hand to proper size"""
     needed = player.character.hand_size - len(player.hand)
     if needed > 0:
         drawn = draw_cards(player, needed)
         if drawn > 0:
-            print(f"{player.name} draws {drawn} card(s) at end of turn")
+            write(f"{player.name} draws {drawn} card(s) at end of turn")
 
-def end_of_turn(player):
+def end_of_turn(player, write=print):
     """Handle end-of-turn drawing"""
-    refill_hand(player)
+    refill_hand(player, write)
 
 # -----------------------------
 # Game initialization
 # -----------------------------
-def init_game():
-    """Initialize complete game state"""
-    print_rules_summary()
+def init_game(ai=None, rng=None, read=input, write=print):
+    """Initialize complete game state; rng defaults to the global random module"""
+    rng = rng or random
+    print_rules_summary(read, write)
     
     # Create face cards and assign characters
     face_cards = create_face_cards()
     numeric_deck = build_numeric_deck()
-    random.shuffle(numeric_deck)
+    rng.shuffle(numeric_deck)
     
     # Randomly assign characters (or could be chosen)
-    p1_char_card = random.choice(face_cards)
+    p1_char_card = rng.choice(face_cards)
     remaining_faces = [c for c in face_cards if c != p1_char_card]
-    p2_char_card = random.choice(remaining_faces)
+    p2_char_card = rng.choice(remaining_faces)
     
     p1_character = Character(p1_char_card.rank, p1_char_card.suit)
     p2_character = Character(p2_char_card.rank, p2_char_card.suit)
@@ -544,9 +573,9 @@ def init_game():
     # If not enough cards, shuffle and take more
     if len(available_cards) < total_needed:
         extra_needed = total_needed - len(available_cards)
-        extra_cards = random.sample(numeric_deck, min(extra_needed, len(numeric_deck)))
+        extra_cards = rng.sample(numeric_deck, min(extra_needed, len(numeric_deck)))
         available_cards.extend(extra_cards)
-        random.shuffle(available_cards)
+        rng.shuffle(available_cards)
         available_cards = available_cards[:total_needed]
     
     p1_stack = available_cards[:p1_character.stack_size]
@@ -558,19 +587,170 @@ def init_game():
     # Initial hands - Coins gets 5, others get 4
     initial_draw = p1_character.hand_size
     draw_cards(player0, initial_draw)
-    print(f"{player0.name} draws {initial_draw} cards (Coins bonus)")
+    write(f"{player0.name} draws {initial_draw} cards (Coins bonus)")
     
     draw_cards(player1, p2_character.hand_size)
-    print(f"{player1.name} draws {p2_character.hand_size} cards")
+    write(f"{player1.name} draws {p2_character.hand_size} cards")
     
     # Player 0 pre-shield (this is NOT a normal turn)
-    player_zero_pre_shield(player0, player1)
+    if ai is not None and ai[0] == 0:
+        read = ai_reader(ai[1], player0, player1, 0, "pre_shield", write, rng)
+    player_zero_pre_shield(player0, player1, read, write)
     
     return player0, player1
 
+# -----------------------------
+# AI opponent (MCTS bot from disfida-gui)
+# -----------------------------
+def load_ai(think_time, bot=None, deadline=1.0):
+    """Import the MCTS bot (or a bot_pool plugin) from disfida-gui; only needed with --ai"""
+    use_gui_modules()
+    if bot is not None:
+        from bot_pool import BotPool
+        return BotPool(bot, deadline=deadline)
+    from mcts_bot import MCTSBot
+    # This engine has no turn limit, so the bot plays to a knockout
+    return MCTSBot(time_limit=think_time, turn_limit=False)
+
+LOGIC_CARDS = {}  # (suit, rank) -> card_game_logic card, filled on first use
+
+def to_logic_players(active, opponent, turn):
+    """Copy CLI players into card_game_logic players for the bot"""
+    import card_game_logic as logic
+    if not LOGIC_CARDS:
+        from compact import CARDS
+        LOGIC_CARDS.update(((c.suit, c.rank), c) for c in CARDS)
+    
+    def convert(player, turns_played):
+        cards = lambda zone: [LOGIC_CARDS[c.suit, c.rank] for c in zone]
+        converted = logic.Player(player.name, logic.Character(player.character.face, player.character.suit), cards(player.stack))
+        converted.hand = logic.CardZone(cards(player.hand))
+        converted.shields.reset(cards(player.shields))
+        converted.health = player.health
+        converted.turns_played = turns_played
+        return converted
+    
+    # Player 1 moves on even turns, so the active player has had turn // 2 turns
+    return convert(active, turn // 2), convert(opponent, (turn + 1) // 2)
+
+def ai_reader(bot, active, opponent, turn, phase="turn", write=print, rng=None):
+    """Answer resolve_turn's prompts with the bot's chosen action"""
+    from card_game_logic import action_to_input
+    player, opp = to_logic_players(active, opponent, turn)
+    action = bot(player, opp, phase, rng)
+    answers = [action_to_input(action)]
+    for idx, special, as_shield in action:
+        if special and active.character.suit == "Bastoni" and active.hand[idx].suit == "Bastoni":
+            answers.append("s" if as_shield else "a")
+    
+    def read(prompt=""):
+        answer = answers.pop(0) if answers else "0"
+        write(f"{prompt}{answer}")
+        return answer
+    return read
+
+# -----------------------------
+# Headless play (bots only, no terminal I/O)
+# -----------------------------
+def null_write(*args, **kwargs):
+    """Output sink with print's signature that discards everything"""
+
+def load_policy(name, think_time=1.0):
+    """A simulation policy name, "mcts", or "bot:<module:Class>" as a bot callable"""
+    if name == "mcts":
+        return load_ai(think_time)
+    if name.startswith("bot:"):
+        return load_ai(think_time, name[4:], think_time)
+    use_gui_modules()
+    from simulation import POLICIES
+    return POLICIES[name]
+
+def play_headless(bot0, bot1, rng=None, max_turns=1000, write=null_write):
+    """Play one game under these CLI rules (Player 0 pre-shield, no turn limit) between two bots"""
+    rng = rng or random.Random()
+    never_asked = lambda prompt="": "0"  # only the rules pause reads without a bot
+    player0, player1 = init_game((0, bot0), rng, never_asked, write)
+    bots = {id(player0): bot0, id(player1): bot1}
+    turn = 0
+    # max_turns only stops games that would never end (e.g. two skipping bots)
+    while max_turns is None or turn < max_turns:
+        active = player1 if turn % 2 == 0 else player0
+        opponent = player0 if turn % 2 == 0 else player1
+        read = ai_reader(bots[id(active)], active, opponent, turn, "turn", write, rng)
+        resolve_turn(active, opponent, read, write)
+        end_of_turn(active, write)
+        turn += 1
+        if check_victory(player0, player1, write):
+            break
+    if player0.health <= 0 and player1.health <= 0:
+        winner = "tie"
+    elif player1.health <= 0:
+        winner = "p0"
+    elif player0.health <= 0:
+        winner = "p1"
+    else:
+        winner = None
+    return {
+        "winner": winner,
+        "ending": "knockout" if winner else "max_turns",
+        "turns": turn,
+        "p0_health": player0.health,
+        "p1_health": player1.health,
+    }
+
+def run_headless(n_games, bot0, bot1, seed=None, max_turns=1000):
+    """Play n_games headless games; game k is dealt from (seed, k)"""
+    if seed is None:
+        seed = random.randrange(2 ** 32)
+    totals = {"games": 0, "p0": 0, "p1": 0, "tie": 0, None: 0, "turns": 0}
+    for k in range(n_games):
+        result = play_headless(bot0, bot1, game_rng(seed, k), max_turns)
+        totals["games"] += 1
+        totals[result["winner"]] += 1
+        totals["turns"] += result["turns"]
+    totals["seed"] = seed
+    return totals
+
 def main():
     """Main game loop"""
-    player0, player1 = init_game()
+    parser = argparse.ArgumentParser(description="Disfida terminal game")
+    parser.add_argument("--ai", type=int, choices=[0, 1], default=None, help="player controlled by the MCTS bot")
+    parser.add_argument("--think-time", type=float, default=1.0, help="bot seconds per move")
+    parser.add_argument("--bot", default=None, help="bot plugin (module:Class) instead of MCTS for --ai")
+    parser.add_argument("--seed", type=int, default=None, help="seed the deal for a reproducible game")
+    parser.add_argument("--headless", type=int, metavar="N", default=None,
+                        help="play N bot-vs-bot games without terminal I/O and print the tally")
+    parser.add_argument("--p0", default="random", help="--headless Player 0: policy name, mcts or bot:<module:Class>")
+    parser.add_argument("--p1", default="random", help="--headless Player 1")
+    parser.add_argument("--rules", metavar="PATH", default=None, help="JSON file of rule overrides (see rules.py)")
+    parser.add_argument("--set", action="append", default=[], metavar="NAME=VALUE",
+                        help="override one rule, e.g. --set health=30 (repeatable)")
+    args = parser.parse_args()
+    if args.rules or args.set:
+        try:
+            set_rules(load_rules(args.rules, args.set))
+        except ValueError as e:
+            parser.error(str(e))
+    if args.headless is not None:
+        bots = [load_policy(name, args.think_time) for name in (args.p0, args.p1)]
+        start = time.perf_counter()
+        try:
+            totals = run_headless(args.headless, bots[0], bots[1], args.seed)
+        finally:
+            for bot in bots:
+                if hasattr(bot, "close"):
+                    bot.close()
+        elapsed = time.perf_counter() - start
+        games = max(totals["games"], 1)
+        print(f"Games: {totals['games']} (seed {totals['seed']})")
+        for key, label in (("p0", "Player 0 wins"), ("p1", "Player 1 wins"), ("tie", "Ties"), (None, "Unfinished")):
+            print(f"{label}: {totals[key]} ({100 * totals[key] / games:.1f}%)")
+        print(f"Average turns: {totals['turns'] / games:.1f}")
+        print(f"Elapsed: {elapsed:.2f}s ({totals['games'] / elapsed:.0f} games/sec)")
+        return
+    ai = (args.ai, load_ai(args.think_time, args.bot, args.think_time)) if args.ai is not None else None
+    
+    player0, player1 = init_game(ai, random.Random(args.seed) if args.seed is not None else None)
     turn = 0
     
     print(f"\nGame begins! Player 0: {player0.character.face} of {player0.character.suit}")
@@ -584,7 +764,10 @@ def main():
         
         print_game_state(player0, player1, active)
         
-        resolve_turn(active, opponent)
+        read = input
+        if ai is not None and active is (player0, player1)[ai[0]]:
+            read = ai_reader(ai[1], active, opponent, turn)
+        resolve_turn(active, opponent, read)
         end_of_turn(active)
         
         if check_victory(player0, player1):